@@ -10,7 +10,7 @@ from alembic import context
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
-from app.database import Base, SQLALCHEMY_DATABASE_URL  # type: ignore
+from app.database import Base, SYNC_DATABASE_URL  # type: ignore
 from app import models  # noqa: F401  # ensures Goal, Task are imported
 
 # ------------------------------------------------------------------------------
@@ -20,7 +20,7 @@ from app import models  # noqa: F401  # ensures Goal, Task are imported
 config = context.config
 
 # Use our application's DB URL
-config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+config.set_main_option("sqlalchemy.url", SYNC_DATABASE_URL)
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
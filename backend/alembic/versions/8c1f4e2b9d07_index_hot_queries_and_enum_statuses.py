@@ -0,0 +1,87 @@
+"""index hot queries and enum statuses
+
+Revision ID: 8c1f4e2b9d07
+Revises: 3a795f2a230d
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2b9d07'
+down_revision: Union[str, Sequence[str], None] = '3a795f2a230d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+goal_status = sa.Enum('in_progress', 'completed', 'abandoned', name='goal_status')
+task_status = sa.Enum('pending', 'in_progress', 'completed', 'missed', name='task_status')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The primary keys are already indexed; these duplicated them.
+    op.drop_index('ix_tasks_id', table_name='tasks')
+    op.drop_index('ix_goals_id', table_name='goals')
+
+    bind = op.get_bind()
+    goal_status.create(bind, checkfirst=True)
+    task_status.create(bind, checkfirst=True)
+
+    # Unknown status values make the casts below fail rather than being
+    # silently rewritten; only NULLs get the model default.
+    op.execute("UPDATE goals SET status = 'in_progress' WHERE status IS NULL")
+    op.execute("UPDATE tasks SET status = 'pending' WHERE status IS NULL")
+    op.alter_column(
+        'goals', 'status',
+        type_=goal_status,
+        existing_type=sa.String(),
+        nullable=False,
+        postgresql_using='status::goal_status',
+    )
+    op.alter_column(
+        'tasks', 'status',
+        type_=task_status,
+        existing_type=sa.String(),
+        nullable=False,
+        postgresql_using='status::task_status',
+    )
+
+    op.create_index(
+        'ix_goals_created_at_id',
+        'goals',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index('ix_tasks_goal_id_status', 'tasks', ['goal_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_goal_id_status', table_name='tasks')
+    op.drop_index('ix_goals_created_at_id', table_name='goals')
+
+    op.alter_column(
+        'tasks', 'status',
+        type_=sa.String(),
+        existing_type=task_status,
+        nullable=True,
+        postgresql_using='status::text',
+    )
+    op.alter_column(
+        'goals', 'status',
+        type_=sa.String(),
+        existing_type=goal_status,
+        nullable=True,
+        postgresql_using='status::text',
+    )
+
+    bind = op.get_bind()
+    task_status.drop(bind, checkfirst=True)
+    goal_status.drop(bind, checkfirst=True)
+
+    op.create_index(op.f('ix_goals_id'), 'goals', ['id'], unique=False)
+    op.create_index(op.f('ix_tasks_id'), 'tasks', ['id'], unique=False)
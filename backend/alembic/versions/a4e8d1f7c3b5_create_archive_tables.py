@@ -0,0 +1,83 @@
+"""create archive tables
+
+Revision ID: a4e8d1f7c3b5
+Revises: f1d6b2c8a390
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e8d1f7c3b5'
+down_revision: Union[str, Sequence[str], None] = 'f1d6b2c8a390'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Shared with the hot tables, which already created them.
+goal_status = postgresql.ENUM(name='goal_status', create_type=False)
+task_status = postgresql.ENUM(name='task_status', create_type=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('goals_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('goal', sa.String(), nullable=False),
+    sa.Column('status', goal_status, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('pending_tasks', sa.Integer(), nullable=False),
+    sa.Column('in_progress_tasks', sa.Integer(), nullable=False),
+    sa.Column('completed_tasks', sa.Integer(), nullable=False),
+    sa.Column('missed_tasks', sa.Integer(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_goals_archive_created_at_id',
+        'goals_archive',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_table('tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('status', task_status, nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['goal_id'], ['goals_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_tasks_archive_goal_id', 'tasks_archive', ['goal_id'], unique=False)
+    op.create_table('task_dependencies_archive',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('depends_on_id', sa.Integer(), nullable=False),
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['goal_id'], ['goals_archive.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'depends_on_id')
+    )
+    op.create_index('ix_task_dependencies_archive_goal_id', 'task_dependencies_archive', ['goal_id'], unique=False)
+    # Only finished goals are candidates, so the index stays small.
+    op.create_index(
+        'ix_goals_finished_updated_at',
+        'goals',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('completed', 'abandoned')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_goals_finished_updated_at', table_name='goals')
+    op.drop_index('ix_task_dependencies_archive_goal_id', table_name='task_dependencies_archive')
+    op.drop_table('task_dependencies_archive')
+    op.drop_index('ix_tasks_archive_goal_id', table_name='tasks_archive')
+    op.drop_table('tasks_archive')
+    op.drop_index('ix_goals_archive_created_at_id', table_name='goals_archive')
+    op.drop_table('goals_archive')
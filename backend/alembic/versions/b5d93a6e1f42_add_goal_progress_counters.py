@@ -0,0 +1,52 @@
+"""add goal progress counters
+
+Revision ID: b5d93a6e1f42
+Revises: 8c1f4e2b9d07
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d93a6e1f42'
+down_revision: Union[str, Sequence[str], None] = '8c1f4e2b9d07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = {
+    'pending_tasks': 'pending',
+    'in_progress_tasks': 'in_progress',
+    'completed_tasks': 'completed',
+    'missed_tasks': 'missed',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COUNTERS:
+        op.add_column(
+            'goals',
+            sa.Column(column, sa.Integer(), nullable=False, server_default='0'),
+        )
+
+    # Backfill from the existing tasks.
+    assignments = ', '.join(f'{column} = c.{column}' for column in COUNTERS)
+    aggregates = ', '.join(
+        f"count(*) FILTER (WHERE status = '{status}') AS {column}"
+        for column, status in COUNTERS.items()
+    )
+    op.execute(
+        f'UPDATE goals SET {assignments} '
+        f'FROM (SELECT goal_id, {aggregates} FROM tasks GROUP BY goal_id) AS c '
+        f'WHERE c.goal_id = goals.id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in reversed(list(COUNTERS)):
+        op.drop_column('goals', column)
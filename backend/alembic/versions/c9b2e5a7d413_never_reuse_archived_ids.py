@@ -0,0 +1,58 @@
+"""never reuse archived ids
+
+Revision ID: c9b2e5a7d413
+Revises: a4e8d1f7c3b5
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9b2e5a7d413'
+down_revision: Union[str, Sequence[str], None] = 'a4e8d1f7c3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Hot tables whose ids move to (and back from) an archive table.
+ARCHIVED = ('goals', 'tasks')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        # AUTOINCREMENT can only be set by rebuilding the table.
+        for table in ARCHIVED:
+            with op.batch_alter_table(
+                table, recreate='always', table_kwargs={'sqlite_autoincrement': True}
+            ):
+                pass
+            # The rebuild starts counting at the highest id still in the
+            # table; ids already archived must stay taken.
+            op.execute(
+                f"UPDATE sqlite_sequence SET seq = max(seq, "
+                f"(SELECT coalesce(max(id), 0) FROM {table}_archive)) "
+                f"WHERE name = '{table}'"
+            )
+    elif bind.dialect.name == 'postgresql':
+        # Sequences never go back on their own; this only repairs one
+        # that was reset by hand.
+        for table in ARCHIVED:
+            op.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"greatest((SELECT max(id) FROM {table}), "
+                f"(SELECT max(id) FROM {table}_archive), 1))"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in reversed(ARCHIVED):
+            with op.batch_alter_table(
+                table, recreate='always', table_kwargs={'sqlite_autoincrement': False}
+            ):
+                pass
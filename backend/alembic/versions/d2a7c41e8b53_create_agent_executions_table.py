@@ -0,0 +1,43 @@
+"""create agent executions table
+
+Revision ID: d2a7c41e8b53
+Revises: b5d93a6e1f42
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a7c41e8b53'
+down_revision: Union[str, Sequence[str], None] = 'b5d93a6e1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+execution_state = sa.Enum('queued', 'running', 'succeeded', 'failed', name='execution_state')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('agent_executions',
+    sa.Column('id', sa.String(length=40), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=True),
+    sa.Column('goal_id', sa.Integer(), nullable=True),
+    sa.Column('instruction', sa.String(), nullable=False),
+    sa.Column('state', execution_state, nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('agent_executions')
+    execution_state.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,40 @@
+"""add task dependencies and durations
+
+Revision ID: e7c3f9a1b264
+Revises: d2a7c41e8b53
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3f9a1b264'
+down_revision: Union[str, Sequence[str], None] = 'd2a7c41e8b53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('duration_minutes', sa.Integer(), nullable=True))
+    op.create_table('task_dependencies',
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('depends_on_id', sa.Integer(), nullable=False),
+    sa.Column('goal_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['depends_on_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['goal_id'], ['goals.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id', 'depends_on_id')
+    )
+    op.create_index('ix_task_dependencies_goal_id', 'task_dependencies', ['goal_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_dependencies_goal_id', table_name='task_dependencies')
+    op.drop_table('task_dependencies')
+    op.drop_column('tasks', 'duration_minutes')
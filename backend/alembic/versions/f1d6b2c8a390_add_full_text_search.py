@@ -0,0 +1,56 @@
+"""add full-text search vectors
+
+Revision ID: f1d6b2c8a390
+Revises: e7c3f9a1b264
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6b2c8a390'
+down_revision: Union[str, Sequence[str], None] = 'e7c3f9a1b264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> column the vector is generated from. Must match the config in
+# app.services.search, or queries won't use the index.
+SEARCHABLE = {
+    'goals': 'goal',
+    'tasks': 'title',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # STORED generated columns: Postgres fills them on every insert and
+    # update. Adding one rewrites the table once.
+    for table, source in SEARCHABLE.items():
+        op.add_column(
+            table,
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(f"to_tsvector('english', {source})", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f'ix_{table}_search_vector',
+            table,
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(list(SEARCHABLE)):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -1,115 +1,390 @@
+import base64
+from datetime import datetime
+from typing import AsyncIterator, List
+
+from app import responses
 from app.api.v1.schemas.agent import (
     GoalStatusSchema,
     MilestoneSchema,
     PlanRequest,
     PlanResponse,
+    PlanTaskSchema,
     StatusResponse,
     TaskSchema,
 )
-from app.database import get_db
+from app.database import AsyncSessionLocal, get_async_db
+from app.responses import FastJSONResponse
 from app.models.agent import Goal, Task
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from app.models.archive import GoalArchive
+from app.schemas.planning import PlanSummaryResponse
+from app.services import progress
+from app.services.archive import RestoreConflict, restore_goal
+from app.services.events import event_bus
+from app.services.plan_cache import plan_cache, plan_key
+from app.services.scheduler import DEFAULT_MINUTES_PER_DAY, schedule_tasks
+from app.services.versions import make_etag, versions
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 router = APIRouter(tags=["agent"])
 
+STATUS_MAX_PAGE_SIZE = 1000
+STATUS_STREAM_BATCH_SIZE = 500
+
+_MILESTONES_ADAPTER = TypeAdapter(List[MilestoneSchema])
+
+
+async def persist_plan(
+    db: AsyncSession, goal_text: str, milestones: list[MilestoneSchema]
+) -> int:
+    """
+    Insert a goal and all of its tasks in a single transaction.
+
+    The tasks go in as one multi-row INSERT ... RETURNING with rows sorted
+    by parameter order, so the returned ids map onto the milestone tasks
+    positionally without reloading the relationship. Sets `id` on every
+    task in `milestones` and returns the new goal id.
+    """
+    plan_tasks = [t for m in milestones for t in m.tasks]
+
+    # The goal row is born with its progress counters already filled in.
+    counters = progress.counter_values(t.status for t in plan_tasks)
+    status = progress.goal_status(counters)
+    goal_id = (
+        await db.execute(
+            insert(Goal)
+            .values(goal=goal_text, status=status, **counters)
+            .returning(Goal.id)
+        )
+    ).scalar_one()
+
+    if plan_tasks:
+        rows = [
+            {"goal_id": goal_id, "title": t.title, "status": t.status}
+            for t in plan_tasks
+        ]
+        task_ids = (
+            await db.scalars(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+            )
+        ).all()
+        for t, task_id in zip(plan_tasks, task_ids):
+            t.id = task_id
+
+    await db.commit()
+    versions.goal_changed([goal_id])
+    event_bus.publish(
+        "goal.created",
+        {"goal_id": goal_id, "goal": goal_text, "status": status},
+    )
+    event_bus.publish_items(
+        "tasks.created",
+        "tasks",
+        [{"id": t.id, "title": t.title, "status": t.status} for t in plan_tasks],
+        goal_id=goal_id,
+    )
+    return goal_id
+
 
 @router.post("/plan", response_model=PlanResponse)
-def generate_plan(payload: PlanRequest, db: Session = Depends(get_db)) -> PlanResponse:
+async def generate_plan(
+    payload: PlanRequest, db: AsyncSession = Depends(get_async_db)
+) -> PlanResponse:
     goal_text = payload.goal
 
-    # 1) Create Goal row in DB
-    db_goal = Goal(goal=goal_text, status="in_progress")
-    db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    # 1) Build (or reuse from the plan cache) the milestones + tasks. Cached
+    #    values are deserialized per call, so filling in ids below is safe.
+    milestones = await plan_cache.get_or_build(
+        plan_key("milestones", goal_text), _MILESTONES_ADAPTER, _build_milestones
+    )
+
+    # 2) Spread the tasks over days. No time budget (or 0) falls back to
+    #    the default rather than producing a plan nobody can start.
+    tasks = [(i, t) for i, m in enumerate(milestones) for t in m.tasks]
+    schedule = schedule_tasks(
+        [None] * len(tasks),
+        [i for i, _ in tasks],
+        payload.time_available_per_day or DEFAULT_MINUTES_PER_DAY,
+        deadline=payload.deadline,
+    )
+    for (_, task), day in zip(tasks, schedule.days):
+        task.recommended_day = day
+
+    # 3) Save the goal and its tasks in one transaction; task ids are filled in
+    goal_id = await persist_plan(db, goal_text, milestones)
+
+    plan = PlanResponse(
+        goal_id=goal_id,
+        goal=goal_text,
+        milestones=milestones,
+        deadline=payload.deadline,
+        deadline_met=schedule.deadline_met,
+        schedule_summary=schedule.summary(),
+    )
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(plan)
+    return plan
 
-    # 2) Define milestones + tasks (static for now)
-    milestones = [
+
+def _build_milestones() -> List[MilestoneSchema]:
+    # Static for now.
+    return [
         MilestoneSchema(
             title="Clarify and scope your goal",
             description="Define what 'success' means for this goal and set a realistic timeline.",
             tasks=[
-                TaskSchema(title="Write a clear one-sentence goal statement"),
-                TaskSchema(title="Define 2-3 success metrics"),
+                PlanTaskSchema(title="Write a clear one-sentence goal statement"),
+                PlanTaskSchema(title="Define 2-3 success metrics"),
             ],
         ),
         MilestoneSchema(
             title="Break goal into weekly tasks",
             description="Create a breakdown of tasks and group them into weekly batches.",
             tasks=[
-                TaskSchema(title="List all sub-tasks needed to reach your goal"),
-                TaskSchema(title="Group tasks by week and priority"),
+                PlanTaskSchema(title="List all sub-tasks needed to reach your goal"),
+                PlanTaskSchema(title="Group tasks by week and priority"),
             ],
         ),
         MilestoneSchema(
             title="Set up a tracking system",
             description="Choose how you will track progress (TaskPilot, Notion, spreadsheet, etc.).",
             tasks=[
-                TaskSchema(title="Pick a tracking tool and create a project board"),
-                TaskSchema(title="Set aside weekly review time in your calendar"),
+                PlanTaskSchema(title="Pick a tracking tool and create a project board"),
+                PlanTaskSchema(title="Set aside weekly review time in your calendar"),
             ],
         ),
     ]
 
-    # 3) Save each task in DB for this goal
-    for m in milestones:
-        for t in m.tasks:
-            db_task = Task(goal_id=db_goal.id, title=t.title, status=t.status)
-            db.add(db_task)
-    db.commit()
 
-    # 4) Reload tasks from DB and assign IDs in creation order
-    db.refresh(db_goal)
-    db_tasks = list(db_goal.tasks)
+def _encode_cursor(goal: Goal) -> str:
+    raw = f"{goal.created_at.isoformat()}|{goal.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, goal_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(goal_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+async def _goal_page(
+    db: AsyncSession,
+    goal_id: int | None,
+    after: tuple[datetime, int] | None,
+    limit: int | None,
+    include_archived: bool = False,
+) -> list[Goal | GoalArchive]:
+    """
+    Load one page of goals, newest first, with their tasks.
+
+    Tasks come in through a single `selectinload` query, so a page always
+    costs two round trips no matter how many goals it holds. With
+    `include_archived`, the archive tables are paged the same way and
+    the two pages are merged (four round trips).
+    """
+    models = [Goal, GoalArchive] if include_archived else [Goal]
+    goals: list[Goal | GoalArchive] = []
+    for model in models:
+        query = select(model).options(selectinload(model.tasks))
+
+        if goal_id is not None:
+            query = query.where(model.id == goal_id)
+        if after is not None:
+            query = query.where(tuple_(model.created_at, model.id) < after)
+
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+        if limit is not None:
+            query = query.limit(limit)
+
+        goals.extend((await db.scalars(query)).all())
+
+    if include_archived:
+        goals.sort(key=lambda g: (g.created_at, g.id), reverse=True)
+        goals = goals[:limit]
+    return goals
+
 
-    db_tasks.sort(key=lambda t: t.id)
+def _goal_to_dict(g: Goal | GoalArchive) -> dict:
+    """`GoalStatusSchema`-shaped dict, for the paths that skip pydantic entirely."""
+    return {
+        "id": g.id,
+        "goal": g.goal,
+        "status": g.status,
+        "archived": isinstance(g, GoalArchive),
+        "tasks": [{"id": t.id, "title": t.title, "status": t.status} for t in g.tasks],
+    }
 
-    task_idx = 0
 
-    for m in milestones:
-        for t in m.tasks:
-            if task_idx < len(db_tasks):
-                t.id = db_tasks[task_idx].id
-                task_idx += 1
+def _goal_to_schema(g: Goal | GoalArchive) -> GoalStatusSchema:
+    return GoalStatusSchema(
+        id=g.id,
+        goal=g.goal,
+        status=g.status,
+        archived=isinstance(g, GoalArchive),
+        tasks=[TaskSchema(id=t.id, title=t.title, status=t.status) for t in g.tasks],
+    )
 
-    return PlanResponse(goal_id=db_goal.id, goal=db_goal.goal, milestones=milestones)
+
+async def _stream_status(
+    goal_id: int | None,
+    after: tuple[datetime, int] | None,
+    limit: int | None,
+    include_archived: bool,
+) -> AsyncIterator[bytes]:
+    """
+    Yield goals as NDJSON lines, fetching them in keyset batches.
+
+    Runs with its own session because the body is produced after the
+    request-scoped session from `get_async_db` has been handed back.
+    """
+    remaining = limit
+    async with AsyncSessionLocal() as db:
+        while remaining is None or remaining > 0:
+            batch = STATUS_STREAM_BATCH_SIZE
+            if remaining is not None:
+                batch = min(batch, remaining)
+
+            goals = await _goal_page(db, goal_id, after, batch, include_archived)
+            for g in goals:
+                yield responses.encode(_goal_to_dict(g)) + b"\n"
+
+            if len(goals) < batch:
+                break
+            after = (goals[-1].created_at, goals[-1].id)
+            if remaining is not None:
+                remaining -= len(goals)
+            # Drop the batch from the identity map so memory stays flat.
+            db.expunge_all()
 
 
 @router.get("/status", response_model=StatusResponse)
-def get_status(
+async def get_status(
+    request: Request,
+    response: Response,
     goal_id: int | None = Query(None, description="Optional goal id to filter by"),
-    db: Session = Depends(get_db),
+    limit: int | None = Query(
+        None,
+        ge=1,
+        le=STATUS_MAX_PAGE_SIZE,
+        description="Maximum number of goals to return; omit to return all goals.",
+    ),
+    cursor: str | None = Query(
+        None,
+        description="`next_cursor` from a previous page, to continue after it.",
+    ),
+    stream: bool = Query(
+        False,
+        description="Stream goals as NDJSON (one goal per line) instead of one JSON body.",
+    ),
+    include_archived: bool = Query(
+        False,
+        description="Also return archived (finished and inactive) goals.",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Return the current status of goals + tasks from the database.
+
+    Goals are ordered newest first and paginated with a keyset cursor on
+    `(created_at, id)`, so deep pages cost the same as the first one.
+
+    Only live goals are returned by default; finished goals move to the
+    archive after a while (app/services/archive.py).
+
+    Responses carry a strong ETag; a matching If-None-Match gets a 304
+    before the database is touched.
     """
-    query = db.query(Goal)
+    after = _decode_cursor(cursor) if cursor else None
 
-    if goal_id is not None:
-        query = query.filter(Goal.id == goal_id)
+    etag = make_etag(
+        "status",
+        versions.goal_version(goal_id),
+        goal_id,
+        limit,
+        cursor,
+        stream,
+        include_archived,
+    )
+    cached = responses.not_modified(request, etag)
+    if cached is not None:
+        return cached
+    headers = responses.etag_headers(etag)
 
-    goals = query.order_by(Goal.created_at.desc()).all()
+    if stream:
+        return StreamingResponse(
+            _stream_status(goal_id, after, limit, include_archived),
+            media_type="application/x-ndjson",
+            headers=headers,
+        )
 
-    result_goals: list[GoalStatusSchema] = []
+    # Fetch one extra row to learn whether another page exists.
+    goals = await _goal_page(
+        db, goal_id, after, limit + 1 if limit is not None else None, include_archived
+    )
 
-    for g in goals:
-        tasks = [
-            TaskSchema(
-                id=t.id,
-                title=t.title,
-                status=t.status,
-            )
-            for t in g.tasks
-        ]
+    next_cursor = None
+    if limit is not None and len(goals) > limit:
+        goals = goals[:limit]
+        next_cursor = _encode_cursor(goals[-1])
 
-        result_goals.append(
-            GoalStatusSchema(
-                id=g.id,
-                goal=g.goal,
-                status=g.status,
-                tasks=tasks,
-            )
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(
+            {"goals": [_goal_to_dict(g) for g in goals], "next_cursor": next_cursor},
+            headers=headers,
         )
 
-    return StatusResponse(goals=result_goals)
+    response.headers.update(headers)
+    return StatusResponse(
+        goals=[_goal_to_schema(g) for g in goals],
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/goals/{goal_id}/summary", response_model=PlanSummaryResponse)
+async def get_goal_summary(
+    goal_id: int, db: AsyncSession = Depends(get_async_db)
+) -> PlanSummaryResponse:
+    """
+    Return task progress for one goal from its stored counters.
+
+    A single primary-key read, however many tasks the goal has. An archived
+    goal is answered from its archived counters, at the cost of a second.
+    """
+    goal = await db.get(Goal, goal_id) or await db.get(GoalArchive, goal_id)
+    if goal is None:
+        raise HTTPException(status_code=404, detail="Goal not found")
+
+    return PlanSummaryResponse(
+        milestones=[],
+        total_tasks=(
+            goal.pending_tasks
+            + goal.in_progress_tasks
+            + goal.completed_tasks
+            + goal.missed_tasks
+        ),
+        completed_tasks=goal.completed_tasks,
+        pending_tasks=goal.pending_tasks,
+        missed_tasks=goal.missed_tasks,
+    )
+
+
+@router.post("/goals/{goal_id}/restore", response_model=GoalStatusSchema)
+async def restore_archived_goal(
+    goal_id: int, db: AsyncSession = Depends(get_async_db)
+) -> GoalStatusSchema:
+    """Move an archived goal, with its tasks, back into the live set."""
+    try:
+        restored = await restore_goal(db, goal_id)
+    except RestoreConflict as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    if not restored:
+        raise HTTPException(status_code=404, detail="Archived goal not found")
+    goals = await _goal_page(db, goal_id, None, None)
+    return _goal_to_schema(goals[0])
@@ -0,0 +1,221 @@
+from typing import Callable
+
+from app import responses
+from app.api.v1.schemas.graph import (
+    DependencyCreate,
+    GoalGraphResponse,
+    GraphChangeResponse,
+    GraphTaskDetail,
+    GraphTaskSchema,
+    TaskDurationUpdate,
+)
+from app.database import get_async_db
+from app.models.agent import Task, TaskDependency
+from app.responses import FastJSONResponse
+from app.services.events import event_bus
+from app.services.task_graph import CycleError, TaskGraph, graph_cache
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(prefix="/goals/{goal_id}/graph", tags=["graph"])
+
+
+async def _load(db: AsyncSession, goal_id: int) -> TaskGraph:
+    graph = await graph_cache.get(db, goal_id)
+    if graph is None:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return graph
+
+
+def _require_tasks(graph: TaskGraph, *task_ids: int) -> None:
+    for task_id in task_ids:
+        if task_id not in graph:
+            raise HTTPException(
+                status_code=404, detail=f"Task {task_id} not found in this goal"
+            )
+
+
+def _task_schema(graph: TaskGraph, task_id: int) -> GraphTaskSchema:
+    timing = graph.timing(task_id)
+    return GraphTaskSchema(
+        task_id=task_id,
+        duration_minutes=graph.duration[task_id],
+        depends_on=sorted(graph.predecessors[task_id]),
+        earliest_start=timing.earliest_start,
+        earliest_finish=timing.earliest_finish,
+        latest_start=timing.latest_start,
+        latest_finish=timing.latest_finish,
+        slack=timing.slack,
+        critical=timing.critical,
+    )
+
+
+async def _apply(
+    db: AsyncSession,
+    graph: TaskGraph,
+    goal_id: int,
+    task_id: int,
+    change: Callable[[], bool],
+    undo: Callable[[], object],
+    statement,
+) -> GraphChangeResponse:
+    """
+    Apply `change` to the in-memory graph, then persist it with
+    `statement`. The graph goes first because it is what detects cycles;
+    `undo` reverts it if the write fails.
+    """
+    try:
+        changed = change()
+    except CycleError as e:
+        raise HTTPException(
+            status_code=409, detail={"message": str(e), "cycle": e.cycle}
+        ) from e
+    if changed:
+        try:
+            await db.execute(statement)
+            await db.commit()
+        except BaseException:
+            undo()
+            raise
+        event_bus.publish(
+            "goal.graph.changed",
+            {"goal_id": goal_id, "task_id": task_id, "makespan_minutes": graph.makespan},
+        )
+    return GraphChangeResponse(
+        goal_id=goal_id,
+        makespan_minutes=graph.makespan,
+        task=_task_schema(graph, task_id),
+    )
+
+
+@router.get("", response_model=GoalGraphResponse)
+async def get_goal_graph(
+    goal_id: int, db: AsyncSession = Depends(get_async_db)
+) -> GoalGraphResponse:
+    """
+    Return the goal's tasks in dependency order, with the critical path
+    and every task's earliest/latest start and slack (in minutes).
+
+    Served from the in-memory graph; only the first request for a goal
+    reads the database.
+    """
+    async with graph_cache.lock(goal_id):
+        graph = await _load(db, goal_id)
+        body = GoalGraphResponse(
+            goal_id=goal_id,
+            makespan_minutes=graph.makespan,
+            critical_path=graph.critical_path(),
+            tasks=[_task_schema(graph, task_id) for task_id in graph.order()],
+        )
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(body)
+    return body
+
+
+@router.get("/tasks/{task_id}", response_model=GraphTaskDetail)
+async def get_task_node(
+    goal_id: int, task_id: int, db: AsyncSession = Depends(get_async_db)
+) -> GraphTaskDetail:
+    """Return one task's place in the graph, and what is still blocking it."""
+    async with graph_cache.lock(goal_id):
+        graph = await _load(db, goal_id)
+        _require_tasks(graph, task_id)
+        node = _task_schema(graph, task_id)
+        dependents = sorted(graph.successors[task_id])
+
+    blocked_by = []
+    if node.depends_on:
+        blocked_by = sorted(
+            (
+                await db.scalars(
+                    select(Task.id).where(
+                        Task.id.in_(node.depends_on), Task.status != "completed"
+                    )
+                )
+            ).all()
+        )
+    return GraphTaskDetail(
+        **node.model_dump(), dependents=dependents, blocked_by=blocked_by
+    )
+
+
+@router.post(
+    "/edges", response_model=GraphChangeResponse, status_code=status.HTTP_201_CREATED
+)
+async def add_dependency(
+    goal_id: int,
+    payload: DependencyCreate,
+    db: AsyncSession = Depends(get_async_db),
+) -> GraphChangeResponse:
+    """
+    Make `task_id` wait for `depends_on_id`; adding an existing dependency
+    is a no-op. 409 with the offending `cycle` if the new edge would
+    close one. Returns the dependent task's new timing.
+    """
+    before, after = payload.depends_on_id, payload.task_id
+    async with graph_cache.lock(goal_id):
+        graph = await _load(db, goal_id)
+        _require_tasks(graph, after, before)
+        return await _apply(
+            db,
+            graph,
+            goal_id,
+            after,
+            lambda: graph.add_edge(before, after),
+            lambda: graph.remove_edge(before, after),
+            insert(TaskDependency).values(
+                task_id=after, depends_on_id=before, goal_id=goal_id
+            ),
+        )
+
+
+@router.delete("/edges/{task_id}/{depends_on_id}", response_model=GraphChangeResponse)
+async def remove_dependency(
+    goal_id: int,
+    task_id: int,
+    depends_on_id: int,
+    db: AsyncSession = Depends(get_async_db),
+) -> GraphChangeResponse:
+    """Stop `task_id` waiting for `depends_on_id`."""
+    async with graph_cache.lock(goal_id):
+        graph = await _load(db, goal_id)
+        _require_tasks(graph, task_id, depends_on_id)
+        if not graph.has_edge(depends_on_id, task_id):
+            raise HTTPException(status_code=404, detail="Dependency not found")
+        return await _apply(
+            db,
+            graph,
+            goal_id,
+            task_id,
+            lambda: graph.remove_edge(depends_on_id, task_id),
+            lambda: graph.add_edge(depends_on_id, task_id),
+            delete(TaskDependency).where(
+                TaskDependency.task_id == task_id,
+                TaskDependency.depends_on_id == depends_on_id,
+            ),
+        )
+
+
+@router.patch("/tasks/{task_id}", response_model=GraphChangeResponse)
+async def update_task_duration(
+    goal_id: int,
+    task_id: int,
+    payload: TaskDurationUpdate,
+    db: AsyncSession = Depends(get_async_db),
+) -> GraphChangeResponse:
+    """Change a task's duration; only the timings it affects are recomputed."""
+    minutes = payload.duration_minutes
+    async with graph_cache.lock(goal_id):
+        graph = await _load(db, goal_id)
+        _require_tasks(graph, task_id)
+        previous = graph.duration[task_id]
+        return await _apply(
+            db,
+            graph,
+            goal_id,
+            task_id,
+            lambda: graph.set_duration(task_id, minutes),
+            lambda: graph.set_duration(task_id, previous),
+            update(Task).where(Task.id == task_id).values(duration_minutes=minutes),
+        )
@@ -0,0 +1,51 @@
+from app import responses
+from app.api.v1.schemas.search import SearchHit, SearchResponse
+from app.database import get_async_db
+from app.responses import FastJSONResponse
+from app.services import search as search_service
+from app.services.search import SEARCH_MAX_CANDIDATES
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+router = APIRouter(tags=["search"])
+
+SEARCH_MAX_PAGE_SIZE = 100
+
+_HIT_FIELDS = ("kind", "id", "goal_id", "text", "status", "rank")
+
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms"),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=SEARCH_MAX_CANDIDATES),
+    db: AsyncSession = Depends(get_async_db),
+) -> SearchResponse:
+    """
+    Search goal statements and task titles, best match first.
+
+    Every term has to match. On Postgres the query accepts web-search
+    syntax ("exact phrase", -excluded, or); see app/services/search.py
+    for the SQLite fallback.
+    """
+    # Fetch one extra hit to learn whether another page exists.
+    hits = await search_service.search(db, q, limit + 1, offset)
+
+    next_offset = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_offset = offset + limit
+
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(
+            {
+                "query": q,
+                "results": [dict(zip(_HIT_FIELDS, hit)) for hit in hits],
+                "next_offset": next_offset,
+            }
+        )
+    return SearchResponse(
+        query=q,
+        results=[SearchHit(**dict(zip(_HIT_FIELDS, hit))) for hit in hits],
+        next_offset=next_offset,
+    )
@@ -1,3 +1,4 @@
+from datetime import date
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -12,10 +13,14 @@ class TaskSchema(BaseModel):
         from_attributes = True
 
 
+class PlanTaskSchema(TaskSchema):
+    recommended_day: Optional[date] = None
+
+
 class MilestoneSchema(BaseModel):
     title: str
     description: Optional[str] = None
-    tasks: List[TaskSchema] = Field(default_factory=list)
+    tasks: List[PlanTaskSchema] = Field(default_factory=list)
 
 
 class PlanRequest(BaseModel):
@@ -24,18 +29,31 @@ class PlanRequest(BaseModel):
         min_length=1,
         description="The user's goal statement",
     )
+    deadline: Optional[date] = None
+    time_available_per_day: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Minutes per day the user can commit (must be non-negative).",
+    )
 
 
 class PlanResponse(BaseModel):
     goal_id: int
     goal: str
     milestones: List[MilestoneSchema]
+    deadline: Optional[date] = None
+    deadline_met: Optional[bool] = Field(
+        default=None,
+        description="Whether every task fits by the deadline (null without one).",
+    )
+    schedule_summary: Optional[str] = None
 
 
 class GoalStatusSchema(BaseModel):
     id: int
     goal: str
     status: str
+    archived: bool = False
     tasks: List[TaskSchema]
 
     class Config:
@@ -44,3 +62,7 @@ class GoalStatusSchema(BaseModel):
 
 class StatusResponse(BaseModel):
     goals: List[GoalStatusSchema]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
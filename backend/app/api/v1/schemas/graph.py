@@ -0,0 +1,47 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class DependencyCreate(BaseModel):
+    task_id: int = Field(..., description="The task that has to wait")
+    depends_on_id: int = Field(..., description="The task it waits for")
+
+
+class TaskDurationUpdate(BaseModel):
+    duration_minutes: int = Field(..., ge=0, le=100_000)
+
+
+class GraphTaskSchema(BaseModel):
+    task_id: int
+    duration_minutes: int
+    depends_on: List[int]
+    # Minutes from the start of the goal.
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+    slack: int
+    critical: bool
+
+
+class GraphTaskDetail(GraphTaskSchema):
+    dependents: List[int]
+    blocked_by: List[int] = Field(
+        ..., description="Dependencies that are not completed yet."
+    )
+
+
+class GoalGraphResponse(BaseModel):
+    goal_id: int
+    makespan_minutes: int
+    critical_path: List[int]
+    tasks: List[GraphTaskSchema] = Field(
+        ..., description="Every task, each after the tasks it depends on."
+    )
+
+
+class GraphChangeResponse(BaseModel):
+    goal_id: int
+    makespan_minutes: int
+    task: GraphTaskSchema
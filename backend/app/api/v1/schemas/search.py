@@ -0,0 +1,21 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchHit(BaseModel):
+    kind: Literal["goal", "task"]
+    id: int
+    goal_id: int
+    text: str = Field(..., description="The goal statement or task title.")
+    status: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    results: List[SearchHit]
+    next_offset: Optional[int] = Field(
+        default=None,
+        description="Pass as `offset` to fetch the next page; null on the last page.",
+    )
@@ -1,8 +1,17 @@
+import logging
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterator, List, Tuple
 
+from app.metrics import db_pool_wait, registry
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -14,14 +23,110 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5433")
 DB_NAME = os.getenv("DB_NAME", "taskpilot_db")
 
-SQLALCHEMY_DATABASE_URL = (
+# Connection pool tuning, shared by the sync and async engines.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true") == "true"
+
+# Per-request query accounting (see QueryStatsMiddleware). Queries slower
+# than DB_SLOW_QUERY_MS are logged whether or not the headers are on;
+# 0 turns the log off.
+DB_QUERY_HEADERS = os.getenv("DB_QUERY_HEADERS", "false") == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+logger = logging.getLogger(__name__)
+
+# psycopg 3 serves both engines; SQLAlchemy picks its async driver for
+# create_async_engine from the same URL. DATABASE_URL overrides the DB_*
+# settings, e.g. sqlite+aiosqlite:///taskpilot.sqlite3 for benchmarks.
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL") or (
     f"postgresql+psycopg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 )
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=False)
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout took in /metrics."""
+
+    engine_label = ""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started, self.engine_label)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+
+# SQLite has no server to pool connections to; keep its default pool.
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+ENGINE_OPTIONS = {} if IS_SQLITE else POOL_OPTIONS
+
+# The sync engine needs the sync flavour of an async-only driver.
+SYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("+aiosqlite", "", 1)
+
+engine = create_engine(
+    SYNC_DATABASE_URL,
+    echo=False,
+    **ENGINE_OPTIONS,
+    **({} if IS_SQLITE else {"poolclass": TimedQueuePool}),
+)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    echo=False,
+    **ENGINE_OPTIONS,
+    **({} if IS_SQLITE else {"poolclass": TimedAsyncAdaptedQueuePool}),
+)
+
+db_pool_size = registry.gauge(
+    "taskpilot_db_pool_size", "Connections the pool keeps open.", ("engine",)
+)
+db_pool_checked_out = registry.gauge(
+    "taskpilot_db_pool_checked_out", "Connections currently in use.", ("engine",)
+)
+db_pool_overflow = registry.gauge(
+    "taskpilot_db_pool_overflow",
+    "Connections open beyond the pool size (negative while below it).",
+    ("engine",),
+)
+
+
+@registry.collector
+def _collect_pool_stats() -> None:
+    for label, pool in (("sync", engine.pool), ("async", async_engine.pool)):
+        # SQLite's default pools don't count connections.
+        if isinstance(pool, QueuePool):
+            db_pool_size.set(pool.size(), label)
+            db_pool_checked_out.set(pool.checkedout(), label)
+            db_pool_overflow.set(pool.overflow(), label)
+
+
+# expire_on_commit=False so rows stay readable after commit without an
+# implicit (and, under asyncio, illegal) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -31,3 +136,115 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    record_statements: bool = False
+    statements: List[str] = field(default_factory=list)
+    # Tasks spawned inside a tracked block inherit its context and may
+    # outlive it; they must stop counting once the block has exited.
+    active: bool = True
+
+
+# Every QueryStats being collected in the current context. A tuple, so
+# nested `track_queries` blocks each see all queries run inside them.
+_active_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar(
+    "taskpilot_query_stats", default=()
+)
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count the queries (and their time) run in this context until exit."""
+    stats = QueryStats(record_statements=record_statements)
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        stats.active = False
+        _active_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError if the block runs more than `limit` queries.
+
+    Meant for tests and benchmarks: an N+1 loop shows up as a query count
+    that grows with the data instead of staying flat.
+    """
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.count > limit:
+        listing = "\n".join(f"  {sql}" for sql in stats.statements)
+        raise AssertionError(
+            f"{stats.count} queries ran, expected at most {limit}:\n{listing}"
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_started
+    for stats in _active_stats.get():
+        if not stats.active:
+            continue
+        stats.count += 1
+        stats.seconds += elapsed
+        if stats.record_statements:
+            stats.statements.append(" ".join(statement.split()))
+    if DB_SLOW_QUERY_MS and elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        # Statement only: parameters can hold user data.
+        logger.warning("Slow query (%.0f ms): %s", elapsed * 1000, statement)
+
+
+# The async engine runs its queries through its sync core, so both are
+# hooked the same way. The contextvar follows async calls into
+# SQLAlchemy's greenlets and sync routes into the threadpool.
+for _engine in (engine, async_engine.sync_engine):
+    event.listen(_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Report each request's query count and DB time in the X-Query-Count and
+    Server-Timing headers.
+
+    Headers go out with the response start, so a streaming response only
+    reports the queries run before its first byte.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message) -> None:
+                if message["type"] == "http.response.start":
+                    timing = (
+                        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+                    )
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-query-count", str(stats.count).encode()),
+                        (b"server-timing", timing.encode()),
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
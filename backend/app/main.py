@@ -1,12 +1,24 @@
+import logging
+
 import psycopg
 from app.api.v1.routes.agent import router as agent_router
+from app.api.v1.routes.graph import router as graph_router
+from app.api.v1.routes.search import router as search_router
 from app.api.v1 import api_router
-from app.database import Base, engine
+from app.database import DB_QUERY_HEADERS, Base, QueryStatsMiddleware, async_engine
 from app.routes import goals, planning, tasks
 from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from sqlalchemy import text
+from app.metrics import MetricsMiddleware, registry
 from app.routes import automation
+from app.services.archive import archive_worker
+from app.services.events import event_bus
+from app.services.executions import execution_engine
+from app.services.kestra import kestra_client
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="TaskPilot Backend",
@@ -29,18 +41,64 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+if DB_QUERY_HEADERS:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Added last so it wraps everything, CORS included.
+app.add_middleware(MetricsMiddleware)
+
 
 @app.on_event("startup")
 async def verify_db_connection():
     try:
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
-        print("Database connection successful!")
-    except Exception as e:
-        print(f"Database connection failed: {e}")
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        logger.info("Database connection successful")
+    except Exception:
+        logger.exception("Database connection failed")
         raise
 
 
+@app.on_event("startup")
+async def start_execution_engine():
+    await execution_engine.start()
+
+
+@app.on_event("startup")
+async def start_event_bus():
+    await event_bus.start()
+
+
+@app.on_event("startup")
+async def start_archive_worker():
+    archive_worker.start()
+
+
+@app.on_event("shutdown")
+async def stop_archive_worker():
+    await archive_worker.stop()
+
+
+@app.on_event("shutdown")
+async def stop_execution_engine():
+    await execution_engine.stop()
+
+
+@app.on_event("shutdown")
+async def stop_event_bus():
+    await event_bus.stop()
+
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    await async_engine.dispose()
+
+
+@app.on_event("shutdown")
+async def close_kestra_client():
+    await kestra_client.close()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to TaskPilot API"}
@@ -51,6 +109,16 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    # On the event loop, so no observation mutates the registry mid-render.
+    return Response(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(automation.router, prefix="/api/v1")
+# Ahead of api_router, so POST /api/v1/plan is the agent's persisted (and
+# scheduled) plan; planning.router's in-memory /plan is shadowed there.
 app.include_router(agent_router, prefix="/api/v1")
+app.include_router(graph_router, prefix="/api/v1")
+app.include_router(search_router, prefix="/api/v1")
 app.include_router(api_router)
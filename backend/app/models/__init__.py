@@ -1 +1,2 @@
-from .agent import Goal, Task  # noqa: F401
+from .agent import AgentExecution, Goal, Task, TaskDependency  # noqa: F401
+from .archive import GoalArchive, TaskArchive, TaskDependencyArchive  # noqa: F401
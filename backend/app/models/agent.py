@@ -1,32 +1,116 @@
 from datetime import datetime
 
 from app.database import Base
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
+GOAL_STATUSES = ("in_progress", "completed", "abandoned")
+# Goals in these states move to the archive tables once they go quiet.
+FINISHED_GOAL_STATUSES = ("completed", "abandoned")
+TASK_STATUSES = ("pending", "in_progress", "completed", "missed")
+EXECUTION_STATES = ("queued", "running", "succeeded", "failed")
+
+# Native enums on Postgres (4 bytes per row, validated by the database);
+# VARCHAR + CHECK on backends without enum support.
+GoalStatus = Enum(*GOAL_STATUSES, name="goal_status")
+TaskStatus = Enum(*TASK_STATUSES, name="task_status")
+ExecutionState = Enum(*EXECUTION_STATES, name="execution_state")
+
 
 class Goal(Base):
     __tablename__ = "goals"
+    # Archiving deletes rows, and a plain SQLite rowid would hand the
+    # highest archived id out again. Postgres sequences never go back.
+    __table_args__ = {"sqlite_autoincrement": True}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     goal = Column(String, nullable=False)
-    status = Column(String, default="in_progress")
+    status = Column(GoalStatus, nullable=False, default="in_progress")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Per-status task counters, maintained by app.services.progress in the
+    # same transaction as every task write.
+    pending_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    in_progress_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+    missed_tasks = Column(Integer, nullable=False, default=0, server_default="0")
+
     tasks = relationship(
         "Task",
         back_populates="goal",
         cascade="all, delete-orphan",
+        order_by="Task.id",
     )
 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = {"sqlite_autoincrement": True}
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     goal_id = Column(Integer, ForeignKey("goals.id"), nullable=False)
     title = Column(String, nullable=False)
-    status = Column(String, default="pending")
+    status = Column(TaskStatus, nullable=False, default="pending")
+    # Estimated effort; NULL means the planner default.
+    duration_minutes = Column(Integer, nullable=True)
 
     goal = relationship("Goal", back_populates="tasks")
+
+
+class TaskDependency(Base):
+    """`task_id` can't start until `depends_on_id` is done."""
+
+    __tablename__ = "task_dependencies"
+
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    depends_on_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Denormalized from the tasks so a goal's whole graph loads in one
+    # indexed read. Both ends always belong to this goal.
+    goal_id = Column(
+        Integer, ForeignKey("goals.id", ondelete="CASCADE"), nullable=False
+    )
+
+
+class AgentExecution(Base):
+    __tablename__ = "agent_executions"
+
+    id = Column(String(40), primary_key=True)
+    # Plain ids rather than foreign keys: the execution log outlives the
+    # goals and tasks it ran against.
+    task_id = Column(Integer, nullable=True)
+    goal_id = Column(Integer, nullable=True)
+    instruction = Column(String, nullable=False)
+    state = Column(ExecutionState, nullable=False, default="queued")
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Matches the newest-first keyset ORDER BY of GET /api/v1/status.
+Index("ix_goals_created_at_id", Goal.created_at.desc(), Goal.id.desc())
+
+# Serves the tasks-of-goal join and per-goal status counts.
+Index("ix_tasks_goal_id_status", Task.goal_id, Task.status)
+
+# Finds the goals due for archiving (app.services.archive) without
+# touching the live ones.
+Index(
+    "ix_goals_finished_updated_at",
+    Goal.updated_at,
+    postgresql_where=Goal.status.in_(FINISHED_GOAL_STATUSES),
+    sqlite_where=Goal.status.in_(FINISHED_GOAL_STATUSES),
+)
+
+# Loads one goal's dependency graph.
+Index("ix_task_dependencies_goal_id", TaskDependency.goal_id)
+
+# goals.search_vector and tasks.search_vector (tsvector + GIN) exist only on
+# Postgres. They come from migration f1d6b2c8a390, are read by
+# app.services.search, and are deliberately left unmapped.
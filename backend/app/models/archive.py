@@ -0,0 +1,69 @@
+"""
+Cold copies of finished goals, written and read by app.services.archive.
+
+Each table mirrors its hot counterpart column for column (ids included),
+so rows move between the two with INSERT ... SELECT and come back
+unchanged on restore.
+"""
+from datetime import datetime
+
+from app.database import Base
+from app.models.agent import GoalStatus, TaskStatus
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import relationship
+
+
+class GoalArchive(Base):
+    __tablename__ = "goals_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    goal = Column(String, nullable=False)
+    status = Column(GoalStatus, nullable=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    pending_tasks = Column(Integer, nullable=False, default=0)
+    in_progress_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    missed_tasks = Column(Integer, nullable=False, default=0)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    tasks = relationship(
+        "TaskArchive",
+        back_populates="goal",
+        cascade="all, delete-orphan",
+        order_by="TaskArchive.id",
+    )
+
+
+class TaskArchive(Base):
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    goal_id = Column(
+        Integer, ForeignKey("goals_archive.id", ondelete="CASCADE"), nullable=False
+    )
+    title = Column(String, nullable=False)
+    status = Column(TaskStatus, nullable=False)
+    duration_minutes = Column(Integer, nullable=True)
+
+    goal = relationship("GoalArchive", back_populates="tasks")
+
+
+class TaskDependencyArchive(Base):
+    __tablename__ = "task_dependencies_archive"
+
+    task_id = Column(Integer, primary_key=True)
+    depends_on_id = Column(Integer, primary_key=True)
+    goal_id = Column(
+        Integer, ForeignKey("goals_archive.id", ondelete="CASCADE"), nullable=False
+    )
+
+
+# Same keyset ORDER BY as the hot table, for /status?include_archived=true.
+Index(
+    "ix_goals_archive_created_at_id",
+    GoalArchive.created_at.desc(),
+    GoalArchive.id.desc(),
+)
+Index("ix_tasks_archive_goal_id", TaskArchive.goal_id)
+Index("ix_task_dependencies_archive_goal_id", TaskDependencyArchive.goal_id)
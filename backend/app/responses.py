@@ -0,0 +1,59 @@
+"""
+Opt-in fast JSON responses for the hot endpoints.
+
+With TASKPILOT_FAST_RESPONSES=true, routes that support it return a
+`FastJSONResponse` instead of a model. FastAPI then sends the body as is:
+no second validation pass through `response_model`, no `jsonable_encoder`
+and no stdlib `json`. The response models stay declared on the routes, so
+the OpenAPI docs are unchanged.
+
+`FastJSONResponse` accepts pre-encoded bytes, an already validated
+pydantic model (serialized by pydantic-core without re-validation), or
+plain dicts/lists (serialized with orjson).
+
+`not_modified` and `etag_headers` implement conditional GETs for the
+routes that version their data (see app/services/versions.py).
+"""
+import os
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+FAST_RESPONSES = os.getenv("TASKPILOT_FAST_RESPONSES", "false") == "true"
+
+
+def encode(content: Any) -> bytes:
+    if isinstance(content, bytes):
+        return content
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    return orjson.dumps(content)
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode(content)
+
+
+def etag_headers(etag: Optional[str]) -> Dict[str, str]:
+    if etag is None:
+        return {}
+    # no-cache: clients may store the body but must revalidate every time.
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match matches `etag`, else None."""
+    header = request.headers.get("if-none-match")
+    if etag is None or header is None:
+        return None
+    # If-None-Match uses weak comparison, so W/"x" matches "x".
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag in tags:
+        return Response(status_code=304, headers=etag_headers(etag))
+    return None
@@ -1,11 +1,13 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app import models
+from app.services.executions import QueueFull, execution_engine
 
 router = APIRouter(
     prefix="/agent",  
@@ -21,13 +23,27 @@ class AgentExecuteRequest(BaseModel):
 
 class AgentExecuteResponse(BaseModel):
     execution_id: str
+    state: str
     message: str
 
 
+class AgentExecutionResponse(BaseModel):
+    execution_id: str
+    state: str
+    task_id: Optional[int] = None
+    goal_id: Optional[int] = None
+    instruction: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 @router.post("/execute", response_model=AgentExecuteResponse)
-def execute_agent(
+async def execute_agent(
     payload: AgentExecuteRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Central endpoint for triggering the 'agent' (Cline / automation).
@@ -35,6 +51,10 @@ def execute_agent(
     - If task_id is provided: work on that specific task.
     - Else if goal_id is provided: work on the goal in general.
     - Else: 400.
+
+    The run is queued and happens in the background; poll
+    GET /agent/executions/{execution_id} for its state. Answers 429 when
+    the execution queue is full.
     """
     if payload.task_id is not None and payload.goal_id is not None:
         raise HTTPException(
@@ -45,7 +65,7 @@ def execute_agent(
     instruction: str
 
     if payload.task_id is not None:
-        task = db.query(models.Task).get(payload.task_id)
+        task = await db.get(models.Task, payload.task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
 
@@ -54,7 +74,7 @@ def execute_agent(
 
 
     elif payload.goal_id is not None:
-        goal = db.query(models.Goal).get(payload.goal_id)
+        goal = await db.get(models.Goal, payload.goal_id)
         if not goal:
             raise HTTPException(status_code=404, detail="Goal not found")
 
@@ -67,11 +87,45 @@ def execute_agent(
             detail="Either task_id or goal_id must be provided.",
         )
 
-    # TODO: here is where you actually integrate with Cline / automation.
-    # For Day 4, we just return a fake execution_id.
-    execution_id = f"exec_{payload.task_id or payload.goal_id}"
+    try:
+        job = await execution_engine.submit(
+            instruction, task_id=payload.task_id, goal_id=payload.goal_id
+        )
+    except QueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Agent execution queue is full, try again later.",
+            headers={"Retry-After": "5"},
+        ) from e
 
     return AgentExecuteResponse(
-        execution_id=execution_id,
-        message=f"Agent started with instruction: {instruction}",
+        execution_id=job.id,
+        state="queued",
+        message=f"Agent queued with instruction: {instruction}",
+    )
+
+
+@router.get("/executions/{execution_id}", response_model=AgentExecutionResponse)
+async def get_execution(
+    execution_id: str,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Return the current state of an agent execution started via /agent/execute.
+    """
+    execution = await db.get(models.AgentExecution, execution_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail="Execution not found")
+
+    return AgentExecutionResponse(
+        execution_id=execution.id,
+        state=execution.state,
+        task_id=execution.task_id,
+        goal_id=execution.goal_id,
+        instruction=execution.instruction,
+        result=execution.result,
+        error=execution.error,
+        created_at=execution.created_at,
+        started_at=execution.started_at,
+        finished_at=execution.finished_at,
     )
@@ -0,0 +1,61 @@
+from typing import AsyncIterator, Optional
+
+from app.services.events import EVENTS_HEARTBEAT, Subscription, event_bus
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+router = APIRouter(tags=["Events"])
+
+
+def _wanted(event, types: Optional[list[str]], goal_id: Optional[int]) -> bool:
+    if event.type == "reset":
+        return True
+    if types and not any(event.type.startswith(t) for t in types):
+        return False
+    if goal_id is not None and event.data.get("goal_id") != goal_id:
+        return False
+    return True
+
+
+async def _sse(
+    sub: Subscription, types: Optional[list[str]], goal_id: Optional[int]
+) -> AsyncIterator[bytes]:
+    # Tell EventSource how soon to reconnect after the stream ends.
+    yield b"retry: 2000\n\n"
+    try:
+        async for event in sub.events(EVENTS_HEARTBEAT):
+            if event is None:
+                # Comment line: keeps proxies from timing out idle streams.
+                yield b": keep-alive\n\n"
+            elif _wanted(event, types, goal_id):
+                yield event.encode()
+    finally:
+        event_bus.unsubscribe(sub)
+
+
+@router.get("/events")
+async def stream_events(
+    types: Optional[str] = Query(
+        None,
+        description="Comma-separated event type prefixes to receive, e.g. `tasks.,goal.`",
+    ),
+    goal_id: Optional[int] = Query(None, description="Only events for this goal"),
+    last_event_id: Optional[str] = Query(
+        None, description="Resume after this event id (same as Last-Event-ID)"
+    ),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-Sent Events stream of goal, task and execution changes.
+
+    Reconnect with Last-Event-ID (EventSource does this automatically) to
+    replay what was missed. A `reset` event means the gap could not be
+    replayed and the client should refetch /api/v1/status.
+    """
+    wanted_types = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    sub = event_bus.subscribe(last_event_id_header or last_event_id)
+    return StreamingResponse(
+        _sse(sub, wanted_types, goal_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,13 @@
 from app.schemas.planning import GoalRequest, Milestone, PlanResponse, Task
+from app.services.plan_cache import plan_cache, plan_key
+from app.services.scheduler import DEFAULT_MINUTES_PER_DAY, schedule_tasks
 from fastapi import APIRouter, status
+from pydantic import TypeAdapter
 
 router = APIRouter(prefix="/goals", tags=["Goals"])
 
+_PLAN_ADAPTER = TypeAdapter(PlanResponse)
+
 
 @router.post("/plan", response_model=PlanResponse, status_code=status.HTTP_201_CREATED)
 async def create_plan(payload: GoalRequest) -> PlanResponse:
@@ -12,8 +17,17 @@ async def create_plan(payload: GoalRequest) -> PlanResponse:
     For now, this returns dummy data so that the frontend
     and overall architecture can be wired up.
     Later, this will call Kestra + Oumi.
+    Identical requests are served from the plan cache.
     """
+    key = plan_key(
+        "goals", payload.goal, payload.deadline, payload.time_available_per_day
+    )
+    return await plan_cache.get_or_build(
+        key, _PLAN_ADAPTER, lambda: _build_plan(payload)
+    )
 
+
+def _build_plan(payload: GoalRequest) -> PlanResponse:
     # TODO: Replace this with a call to Kestra workflow + Oumi agent.
     dummy_milestones = [
         Milestone(
@@ -41,12 +55,26 @@ async def create_plan(payload: GoalRequest) -> PlanResponse:
         ),
     ]
 
+    # No time budget (or 0) falls back to the default rather than
+    # producing a plan nobody can start.
+    order = {m.title: i for i, m in enumerate(dummy_milestones)}
+    schedule = schedule_tasks(
+        [t.duration_minutes for t in dummy_tasks],
+        [order[t.milestone] for t in dummy_tasks],
+        payload.time_available_per_day or DEFAULT_MINUTES_PER_DAY,
+        deadline=payload.deadline,
+    )
+    for task, day in zip(dummy_tasks, schedule.days):
+        task.recommended_day = day
+
     return PlanResponse(
         goal=payload.goal,
         milestones=dummy_milestones,
         tasks=dummy_tasks,
         schedule_summary=(
-            f"Placeholder plan for goal: {payload.goal}. "
+            f"Placeholder plan for goal: {payload.goal}. {schedule.summary()} "
             "In the full version, this will be generated by the TaskPilot planning agent."
         ),
+        deadline=payload.deadline,
+        deadline_met=schedule.deadline_met,
     )
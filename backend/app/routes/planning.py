@@ -1,43 +1,56 @@
-from datetime import date, timedelta
-from typing import List
+from typing import Any, Dict, List
 
 from app.schemas.planning import (
     PlanGenerationMilestone,
     PlanGenerationResponse,
     PlanGenerationRequest,
 )
+from app.services.plan_cache import plan_cache, plan_key
+from app.services.scheduler import DEFAULT_MINUTES_PER_DAY, schedule_tasks
 from fastapi import APIRouter
+from pydantic import TypeAdapter
 
 router = APIRouter(tags=["Planning"])
 
+_PLAN_ADAPTER = TypeAdapter(PlanGenerationResponse)
+
 
 @router.post("/plan", response_model=PlanGenerationResponse)
 async def generate_plan(payload: PlanGenerationRequest) -> PlanGenerationResponse:
     """
-    Simple dummy planner that turns a goal + deadline into 2 milestones.
+    Simple dummy planner that turns a goal + deadline into 2 milestones,
+    each due on the day its last task is scheduled.
+    Identical requests are served from the plan cache.
     """
+    key = plan_key(
+        "planning", payload.goal, payload.deadline, payload.time_available_per_day
+    )
+    return await plan_cache.get_or_build(
+        key, _PLAN_ADAPTER, lambda: _build_plan(payload)
+    )
 
-    mid_deadline = None
-    if payload.deadline:
-        days_diff = (payload.deadline - date.today()).days
-        mid_deadline = date.today() + timedelta(days=days_diff // 2)
 
-    milestones: List[PlanGenerationMilestone] = [
-        PlanGenerationMilestone(
-            id=1,
-            title="Understand & scope the goal",
-            due=mid_deadline,
-            tasks=[
+@router.get("/plan/cache-stats")
+async def get_plan_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters and size of the plan cache (this worker's view).
+    """
+    return plan_cache.stats()
+
+
+def _build_plan(payload: PlanGenerationRequest) -> PlanGenerationResponse:
+    steps = [
+        (
+            "Understand & scope the goal",
+            [
                 f"Clarify requirements for: {payload.goal}",
                 "Agree on success criteria with the team",
                 "Define constraints, tools and target users",
             ],
         ),
-        PlanGenerationMilestone(
-            id=2,
-            title="Execute and ship MVP",
-            due=payload.deadline,
-            tasks=[
+        (
+            "Execute and ship MVP",
+            [
                 "Design backend routes & data flow",
                 "Build frontend UI + connect to backend",
                 "Test end-to-end and prepare demo pitch",
@@ -45,8 +58,26 @@ async def generate_plan(payload: PlanGenerationRequest) -> PlanGenerationRespons
         ),
     ]
 
+    # Tasks carry no estimates here, so each gets the scheduler's default.
+    milestone_of = [i for i, (_, tasks) in enumerate(steps) for _ in tasks]
+    schedule = schedule_tasks(
+        [None] * len(milestone_of),
+        milestone_of,
+        payload.time_available_per_day or DEFAULT_MINUTES_PER_DAY,
+        deadline=payload.deadline,
+    )
+    due = {}
+    for milestone, day in zip(milestone_of, schedule.days):
+        due[milestone] = max(day, due.get(milestone, day))
+
+    milestones: List[PlanGenerationMilestone] = [
+        PlanGenerationMilestone(id=i + 1, title=title, due=due.get(i), tasks=tasks)
+        for i, (title, tasks) in enumerate(steps)
+    ]
+
     return PlanGenerationResponse(
         goal=payload.goal,
         deadline=payload.deadline,
         milestones=milestones,
+        deadline_met=schedule.deadline_met,
     )
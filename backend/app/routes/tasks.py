@@ -1,139 +1,247 @@
 import os
 from datetime import date
-from typing import Dict, List
+from typing import Any, Dict, List
 
+from app import responses
+from app.database import get_async_db
+from app.responses import FastJSONResponse
+from app.services.versions import make_etag
 from app.schemas.planning import (
+    Milestone,
     PlanSummaryResponse,
     Task,
+    TaskMove,
+    TaskStatusBatchResponse,
+    TaskStatusBatchUpdate,
     TaskStatusUpdate,
+    TaskStatusUpdateResult,
     TodayTasksResponse,
 )
-from fastapi import APIRouter, HTTPException, status
+from app.services.events import event_bus
+from app.services.scheduler import DEFAULT_MINUTES_PER_DAY
+from app.services.task_store import TaskStore
+from app.services.task_updates import apply_status_updates
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
-# Simple in-memory storage for now (MVP).
-FAKE_TASKS_DB: Dict[str, Task] = {}
+# In-memory storage for the demo / edge tier.
+TASK_STORE = TaskStore()
 
 @router.post("/debug-seed", status_code=status.HTTP_201_CREATED)
 async def debug_seed_tasks() -> Dict[str, str]:
     """
-    Debug-only endpoint to seed some example tasks into the in-memory FAKE_TASKS_DB.
+    Debug-only endpoint to seed some example tasks into the in-memory TASK_STORE.
     This is just for testing Kestra & the AI agent.
     """
     if os.getenv("TASKPILOT_ENABLE_DEBUG_SEED") != "true":
         raise HTTPException(status_code=404, detail="Not found")
 
-    FAKE_TASKS_DB.clear()
-
-    FAKE_TASKS_DB["1"] = Task(
-        id="1",
-        title="Draft TaskPilot README",
-        milestone="Project Setup",
-        duration_minutes=45,
-        status="pending",
-    )
-    FAKE_TASKS_DB["2"] = Task(
-        id="2",
-        title="Wire up Kestra AI Agent flow",
-        milestone="Automation",
-        duration_minutes=60,
-        status="pending",
-    )
-    FAKE_TASKS_DB["3"] = Task(
-        id="3",
-        title="Record demo video for AI Agents Assemble",
-        milestone="Demo",
-        duration_minutes=30,
-        status="pending",
+    TASK_STORE.clear()
+
+    TASK_STORE.put_many(
+        [
+            Task(
+                id="1",
+                title="Draft TaskPilot README",
+                milestone="Project Setup",
+                duration_minutes=45,
+                status="pending",
+            ),
+            Task(
+                id="2",
+                title="Wire up Kestra AI Agent flow",
+                milestone="Automation",
+                duration_minutes=60,
+                status="pending",
+            ),
+            Task(
+                id="3",
+                title="Record demo video for AI Agents Assemble",
+                milestone="Demo",
+                duration_minutes=30,
+                status="pending",
+            ),
+        ]
     )
 
-    return {"message": "Seeded 3 demo tasks into FAKE_TASKS_DB"}
+    event_bus.publish("store.tasks.reset", {"count": len(TASK_STORE)})
+    return {"message": "Seeded 3 demo tasks into TASK_STORE"}
 
 
 
 @router.get("/today", response_model=TodayTasksResponse)
-async def get_today_tasks() -> TodayTasksResponse:
+async def get_today_tasks(request: Request, response: Response) -> TodayTasksResponse:
     """
     Return tasks whose recommended_day is today or not set.
     """
     today = date.today()
 
-    tasks = []
-    for task in FAKE_TASKS_DB.values():
-        if task.recommended_day is None or task.recommended_day == today:
-            tasks.append(task)
+    etag = make_etag("tasks-today", TASK_STORE.version, today)
+    cached = responses.not_modified(request, etag)
+    if cached is not None:
+        return cached
+    headers = responses.etag_headers(etag)
 
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(
+            {"date": today, "tasks": TASK_STORE.for_days(today, None, as_dict=True)},
+            headers=headers,
+        )
+
+    response.headers.update(headers)
     return TodayTasksResponse(
         date=today,
-        tasks=tasks,
+        tasks=TASK_STORE.for_days(today, None),
     )
 
 
 @router.patch("/update-status", status_code=status.HTTP_200_OK)
-async def update_task_status(payload: TaskStatusUpdate) -> Dict[str, str]:
+async def update_task_status(payload: TaskStatusUpdate) -> Dict[str, Any]:
     """
     Update the status of a given task.
-    For now, this operates on the in-memory FAKE_TASKS_DB.
+    For now, this operates on the in-memory TASK_STORE.
+    A task that becomes missed is rescheduled; `moved` lists every task
+    whose recommended_day changed as a result.
     """
-    task = FAKE_TASKS_DB.get(payload.task_id)
-    if task is None:
+    pairs = [(payload.task_id, payload.status)]
+    previous = TASK_STORE.update_statuses(pairs)
+    if previous[0] is None:
         raise HTTPException(status_code=404, detail="Task not found")
-
-    updated_task = task.model_copy(update={"status": payload.status})
-    FAKE_TASKS_DB[payload.task_id] = updated_task
+    _publish_store_changes(pairs, previous)
 
     return {
         "message": "Task status updated",
-        "task_id": payload.task_id,
+        "task_id": str(payload.task_id),
         "status": payload.status,
+        "moved": _replan_missed(pairs, previous),
     }
 
 
-@router.get("/plan-summary", response_model=PlanSummaryResponse)
-async def get_plan_summary() -> PlanSummaryResponse:
+def _publish_store_changes(pairs, previous) -> None:
+    changes = [
+        {"task_id": str(task_id), "status": new, "previous_status": old}
+        for (task_id, new), old in zip(pairs, previous)
+        if old is not None and old != new
+    ]
+    event_bus.publish_items("store.tasks.status", "changes", changes)
+
+
+def _replan_missed(pairs, previous) -> List[TaskMove]:
+    """Reschedule tasks that just became missed, keeping the rest of the plan."""
+    moves = [
+        TaskMove(task_id=moved_id, from_day=old_day, to_day=new_day)
+        for (task_id, new), old in zip(pairs, previous)
+        if new == "missed" and old not in (None, "missed")
+        for moved_id, old_day, new_day in TASK_STORE.replan_missed(
+            task_id, DEFAULT_MINUTES_PER_DAY
+        )
+    ]
+    event_bus.publish_items(
+        "store.tasks.rescheduled", "moves", [m.model_dump(mode="json") for m in moves]
+    )
+    return moves
+
+
+@router.patch(
+    "/update-status/batch",
+    response_model=TaskStatusBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def update_task_statuses(
+    payload: TaskStatusBatchUpdate, db: AsyncSession = Depends(get_async_db)
+) -> TaskStatusBatchResponse:
     """
-    Return a simple summary of the current plan based on FAKE_TASKS_DB.
+    Update many task statuses in one request.
+
+    `target` picks where the ids live: the `tasks` table (applied in one
+    transaction) or the in-memory TASK_STORE. Their ids overlap, so a
+    batch never updates both. Updates are applied in order, and every item
+    gets a result, so unknown ids don't fail the batch.
     """
+    pairs = [(u.task_id, u.status) for u in payload.updates]
+    moved: List[TaskMove] = []
+    if payload.target == "store":
+        previous = TASK_STORE.update_statuses(pairs)
+        _publish_store_changes(pairs, previous)
+        moved = _replan_missed(pairs, previous)
+    else:
+        # Walk the batch again to report each item against the status it
+        # actually replaced, including earlier items for the same task.
+        current = await apply_status_updates(db, pairs)
+        previous = []
+        for task_id, new_status in pairs:
+            previous.append(current.get(task_id))
+            if task_id in current:
+                current[task_id] = new_status
+
+    results = []
+    counts = {"updated": 0, "unchanged": 0, "not_found": 0}
+    for (task_id, new_status), old in zip(pairs, previous):
+        if old is None:
+            result = "not_found"
+        elif old == new_status:
+            result = "unchanged"
+        else:
+            result = "updated"
+        counts[result] += 1
+        results.append(
+            TaskStatusUpdateResult(
+                task_id=task_id,
+                status=new_status,
+                previous_status=old,
+                result=result,
+            )
+        )
+
+    return TaskStatusBatchResponse(results=results, moved=moved, **counts)
 
-    tasks = list(FAKE_TASKS_DB.values())
-    total = len(tasks)
-    completed = missed = pending = 0
 
-    for t in tasks:
-        if t.status == "completed":
-            completed += 1
-        elif t.status == "missed":
-            missed += 1
-        elif t.status == "pending":
-            pending += 1
+@router.get("/plan-summary", response_model=PlanSummaryResponse)
+async def get_plan_summary() -> PlanSummaryResponse:
+    """
+    Return a simple summary of the current plan based on TASK_STORE.
+    Counts come straight from the store's status index.
+    """
+    counts = TASK_STORE.status_counts()
 
-    # Milestones aren't tracked in this fake DB yet; we return an empty list for now.
     return PlanSummaryResponse(
-        milestones=[],
-        total_tasks=total,
-        completed_tasks=completed,
-        pending_tasks=pending,
-        missed_tasks=missed,
+        milestones=[Milestone(title=m) for m in TASK_STORE.milestones()],
+        total_tasks=len(TASK_STORE),
+        completed_tasks=counts.get("completed", 0),
+        pending_tasks=counts.get("pending", 0),
+        missed_tasks=counts.get("missed", 0),
     )
     
 @router.get("/", response_model=List[Task])
-async def list_all_tasks() -> List[Task]:
+async def list_all_tasks(request: Request, response: Response) -> List[Task]:
     """
-    Return ALL tasks currently in the FAKE_TASKS_DB.
+    Return ALL tasks currently in the TASK_STORE.
     This will be useful for:
     - CLI: `taskpilot tasks`
     - Kestra: AI agent summarising the whole plan
+
+    Polling clients should send If-None-Match with the last ETag.
     """
-    return list(FAKE_TASKS_DB.values())
+    etag = make_etag("tasks", TASK_STORE.version)
+    cached = responses.not_modified(request, etag)
+    if cached is not None:
+        return cached
+    headers = responses.etag_headers(etag)
+
+    if responses.FAST_RESPONSES:
+        return FastJSONResponse(TASK_STORE.all(as_dict=True), headers=headers)
+    response.headers.update(headers)
+    return TASK_STORE.all()
 
 
 @router.get("/{task_id}", response_model=Task)
 async def get_task(task_id: str) -> Task:
     """
-    Return a single task by its ID from the FAKE_TASKS_DB.
+    Return a single task by its ID from the TASK_STORE.
     """
-    task = FAKE_TASKS_DB.get(task_id)
+    task = TASK_STORE.get(task_id)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
\ No newline at end of file
@@ -37,6 +37,11 @@ class PlanResponse(BaseModel):
     milestones: List[Milestone]
     tasks: List[Task]
     schedule_summary: str
+    deadline: Optional[date] = None
+    deadline_met: Optional[bool] = Field(
+        default=None,
+        description="Whether every task fits by the deadline (null without one).",
+    )
 
 
 class TaskStatusUpdate(BaseModel):
@@ -44,6 +49,50 @@ class TaskStatusUpdate(BaseModel):
     status: Literal["pending", "completed", "missed"]
 
 
+TASK_STATUS_BATCH_MAX = 10_000
+
+
+class TaskStatusBatchUpdate(BaseModel):
+    updates: List[TaskStatusUpdate] = Field(
+        ...,
+        min_length=1,
+        max_length=TASK_STATUS_BATCH_MAX,
+        description="Updates to apply in order; a later update to the same task wins.",
+    )
+    target: Literal["database", "store"] = Field(
+        "database",
+        description=(
+            "Which task ids the batch refers to: rows of the `tasks` table, "
+            "or the in-memory task store. The two number their tasks "
+            "independently, so a batch only ever touches one of them."
+        ),
+    )
+
+
+class TaskStatusUpdateResult(BaseModel):
+    task_id: int
+    status: Literal["pending", "completed", "missed"]
+    previous_status: Optional[str] = None
+    result: Literal["updated", "unchanged", "not_found"]
+
+
+class TaskMove(BaseModel):
+    task_id: str
+    from_day: Optional[date] = None
+    to_day: date
+
+
+class TaskStatusBatchResponse(BaseModel):
+    results: List[TaskStatusUpdateResult]
+    updated: int
+    unchanged: int
+    not_found: int
+    moved: List[TaskMove] = Field(
+        default_factory=list,
+        description="Tasks rescheduled to make room for newly missed ones.",
+    )
+
+
 class TodayTasksResponse(BaseModel):
     date: date
     tasks: List[Task]
@@ -60,6 +109,11 @@ class PlanSummaryResponse(BaseModel):
 class PlanGenerationRequest(BaseModel):
     goal: str = Field(..., min_length=1, description="The user's goal statement")
     deadline: Optional[date] = None
+    time_available_per_day: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Minutes per day the user can commit (must be non-negative).",
+    )
 
 
 class PlanGenerationMilestone(BaseModel):
@@ -73,3 +127,7 @@ class PlanGenerationResponse(BaseModel):
     goal: str
     deadline: Optional[date] = None
     milestones: List[PlanGenerationMilestone]
+    deadline_met: Optional[bool] = Field(
+        default=None,
+        description="Whether every task fits by the deadline (null without one).",
+    )
@@ -0,0 +1,221 @@
+"""
+Archival of finished goals out of the hot tables.
+
+Left alone, `goals`, `tasks` and `task_dependencies` only grow, and an
+unpaginated /status reads the whole history. A goal that is completed
+(all of its tasks are, see app.services.progress) or abandoned and hasn't
+been touched for ARCHIVE_AFTER_DAYS moves, together with its tasks and
+dependencies, into the matching *_archive tables (see app.models.archive). /status reads only the hot tables unless the caller
+passes include_archived=true.
+
+`archive_batch` moves up to ARCHIVE_BATCH_SIZE goals in one transaction,
+using the same number of statements for any batch size:
+
+- one INSERT ... SELECT into each archive table, parents first;
+- one DELETE from each hot table, children first.
+
+The goals are picked FOR UPDATE SKIP LOCKED, so two archivers never take
+the same goal. Ids are kept, so `restore_goal` can move a goal back
+unchanged. The hot tables never reuse an id (AUTOINCREMENT on SQLite,
+sequences on Postgres), but rows archived before that was true may
+collide, and the restore then raises RestoreConflict instead. A restore
+also stamps `updated_at`, so the goal isn't archived again on the next
+pass.
+
+`ArchiveWorker` runs in the background every ARCHIVE_INTERVAL seconds.
+When a batch comes back full it runs another one right away, after a
+short pause so the archiver never holds the database for long. Set
+ARCHIVE_INTERVAL=0 to turn it off.
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.database import AsyncSessionLocal
+from app.models.agent import FINISHED_GOAL_STATUSES, Goal, Task, TaskDependency
+from app.models.archive import GoalArchive, TaskArchive, TaskDependencyArchive
+from app.services.search import search_index
+from app.services.task_graph import graph_cache
+from app.services.versions import versions
+from sqlalchemy import Table, delete, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+# Seconds between back-to-back batches while a backlog drains.
+ARCHIVE_BATCH_PAUSE = 0.1
+
+# (hot, archive) table pairs, parents first.
+_TABLES = [
+    (Goal.__table__, GoalArchive.__table__),
+    (Task.__table__, TaskArchive.__table__),
+    (TaskDependency.__table__, TaskDependencyArchive.__table__),
+]
+
+_GOAL_TABLES = {"goals", "goals_archive"}
+
+
+class RestoreConflict(ValueError):
+    """An archived goal's id, or one of its tasks' ids, is in use again."""
+
+
+def _goal_key(table: Table):
+    return table.c.id if table.name in _GOAL_TABLES else table.c.goal_id
+
+
+async def _move(
+    db: AsyncSession,
+    goal_ids: Sequence[int],
+    pairs: List[tuple],
+    overrides: Dict[str, Any],
+) -> None:
+    """
+    Copy the goals' rows from each pair's first table into its second,
+    then delete them from the first. `overrides` sets goal columns to
+    fixed values on the way.
+    """
+    for source, target in pairs:
+        columns = [c.name for c in target.c if c.name in source.c]
+        values = [source.c[name] for name in columns]
+        if source.name in _GOAL_TABLES:
+            for name, value in overrides.items():
+                if name in columns:
+                    values[columns.index(name)] = literal(value)
+                else:
+                    columns.append(name)
+                    values.append(literal(value))
+        await db.execute(
+            insert(target).from_select(
+                columns, select(*values).where(_goal_key(source).in_(goal_ids))
+            )
+        )
+    for source, _ in reversed(pairs):
+        await db.execute(delete(source).where(_goal_key(source).in_(goal_ids)))
+
+
+async def archive_batch(
+    db: AsyncSession, older_than: datetime, limit: int = ARCHIVE_BATCH_SIZE
+) -> List[int]:
+    """
+    Archive up to `limit` finished goals last updated before
+    `older_than`, oldest first, and commit. Returns the archived ids.
+    """
+    goal_ids = (
+        await db.scalars(
+            select(Goal.id)
+            .where(
+                Goal.status.in_(FINISHED_GOAL_STATUSES),
+                Goal.updated_at < older_than,
+            )
+            .order_by(Goal.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not goal_ids:
+        return []
+
+    await _move(db, goal_ids, _TABLES, {"archived_at": datetime.utcnow()})
+    await db.commit()
+    versions.goal_changed(goal_ids)
+    for goal_id in goal_ids:
+        graph_cache.discard(goal_id)
+    return list(goal_ids)
+
+
+async def restore_goal(db: AsyncSession, goal_id: int) -> bool:
+    """
+    Move an archived goal back to the hot tables; False if it isn't
+    archived. Raises RestoreConflict, and changes nothing, if a live goal
+    or task already holds one of its ids.
+    """
+    goal_text = await db.scalar(
+        select(GoalArchive.goal).where(GoalArchive.id == goal_id).with_for_update()
+    )
+    if goal_text is None:
+        return False
+    tasks = (
+        await db.execute(
+            select(TaskArchive.id, TaskArchive.title).where(
+                TaskArchive.goal_id == goal_id
+            )
+        )
+    ).all()
+    task_ids = [task_id for task_id, _ in tasks]
+    taken = await db.scalar(
+        select(Goal.id)
+        .where(Goal.id == goal_id)
+        .union_all(select(Task.id).where(Task.id.in_(task_ids)))
+        .limit(1)
+    )
+    if taken is not None:
+        await db.rollback()
+        raise RestoreConflict(f"goal {goal_id} has ids that are in use again")
+
+    pairs = [(archive, hot) for hot, archive in _TABLES]
+    await _move(db, [goal_id], pairs, {"updated_at": datetime.utcnow()})
+    await db.commit()
+    versions.goal_changed([goal_id])
+    search_index.revive([(goal_id, goal_text)], tasks)
+    return True
+
+
+class ArchiveWorker:
+    def __init__(
+        self,
+        interval: float = ARCHIVE_INTERVAL,
+        batch_size: int = ARCHIVE_BATCH_SIZE,
+        after_days: float = ARCHIVE_AFTER_DAYS,
+    ) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self.after_days = after_days
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self.started or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._run(), name="archive-worker")
+
+    async def stop(self) -> None:
+        if not self.started:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def run_once(self) -> int:
+        """Archive everything that is due now, batch by batch; returns the goal count."""
+        older_than = datetime.utcnow() - timedelta(days=self.after_days)
+        total = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                moved = await archive_batch(db, older_than, self.batch_size)
+            total += len(moved)
+            if len(moved) < self.batch_size:
+                return total
+            await asyncio.sleep(ARCHIVE_BATCH_PAUSE)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                moved = await self.run_once()
+                if moved:
+                    logger.info("Archived %d finished goals", moved)
+            except Exception:
+                logger.exception("Archiving failed")
+            await asyncio.sleep(self.interval)
+
+
+# The app-wide archiver.
+archive_worker = ArchiveWorker()
@@ -0,0 +1,259 @@
+"""
+In-process change feed behind GET /api/v1/events.
+
+Write paths call `event_bus.publish(event_type, data)` after they commit. The
+bus numbers each event and keeps the last EVENTS_HISTORY of them in a
+ring buffer. It then hands the event to every subscriber's bounded queue.
+
+- A subscriber that falls EVENTS_SUBSCRIBER_BUFFER events behind is
+  disconnected rather than slowing everyone else down. Its client
+  reconnects with Last-Event-ID and the missed events are replayed from
+  the ring buffer.
+- If the client's last id is older than the ring buffer, or was issued
+  before a restart, the gap cannot be replayed. The client gets a `reset`
+  event instead and should refetch /status before trusting the feed.
+
+With EVENTS_BACKEND=postgres, events are also sent through Postgres
+NOTIFY on EVENTS_CHANNEL. Events from other workers are then delivered to
+this worker's subscribers too. Event ids are assigned by the process
+that delivers them, so resuming on a different worker gets a `reset`.
+
+`publish` must be called from the event loop thread.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Set
+
+import orjson
+import psycopg
+
+from app.services.versions import BOOT_EPOCH
+
+logger = logging.getLogger(__name__)
+
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "taskpilot_events")
+EVENTS_HISTORY = int(os.getenv("EVENTS_HISTORY", "10000"))
+EVENTS_SUBSCRIBER_BUFFER = int(os.getenv("EVENTS_SUBSCRIBER_BUFFER", "1000"))
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+
+# Bulk changes are split into events of at most this many items, and of
+# at most this many bytes once encoded for NOTIFY, whose payloads must be
+# shorter than 8000 bytes.
+EVENT_MAX_ITEMS = 100
+EVENT_MAX_BYTES = 7900
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int
+    type: str
+    data: Dict[str, Any]
+
+    @property
+    def id(self) -> str:
+        return f"{BOOT_EPOCH}:{self.seq}"
+
+    def encode(self) -> bytes:
+        """The event as one Server-Sent Events message."""
+        return (
+            b"id: " + self.id.encode()
+            + b"\nevent: " + self.type.encode()
+            + b"\ndata: " + orjson.dumps(self.data)
+            + b"\n\n"
+        )
+
+
+class Subscription:
+    def __init__(self, replay: list, maxsize: int) -> None:
+        self.replay = replay
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.closed = False
+
+    def offer(self, event: Event) -> bool:
+        """Queue `event`; False (and the subscription closes) if the buffer is full."""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.close()
+            return False
+
+    def close(self) -> None:
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def events(self, heartbeat: float) -> AsyncIterator[Optional[Event]]:
+        """
+        Yield replayed events, then live ones. Yields None after `heartbeat`
+        idle seconds, and stops once the subscription is closed.
+        """
+        for event in self.replay:
+            yield event
+        self.replay = []
+        while True:
+            if not self.queue.empty():
+                # Skip wait_for (and the task it creates) while backlogged.
+                event = self.queue.get_nowait()
+            else:
+                try:
+                    event = await asyncio.wait_for(self.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+            if event is None:
+                return
+            yield event
+
+
+class EventBus:
+    def __init__(
+        self,
+        history: int = EVENTS_HISTORY,
+        subscriber_buffer: int = EVENTS_SUBSCRIBER_BUFFER,
+    ) -> None:
+        self.subscriber_buffer = subscriber_buffer
+        self._history: Deque[Event] = deque(maxlen=history)
+        self._subscribers: Set[Subscription] = set()
+        self._seq = 0
+        self._origin = uuid.uuid4().hex
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> Event:
+        event = self._deliver(event_type, data)
+        if self._outbox is not None:
+            self._outbox.put_nowait((event_type, data))
+        return event
+
+    def publish_items(
+        self, event_type: str, key: str, items: list, **data: Any
+    ) -> None:
+        """
+        Publish `items` under `data[key]`, split into events of at most
+        EVENT_MAX_ITEMS items whose NOTIFY payload fits in EVENT_MAX_BYTES.
+        An item too big to fit on its own still goes out alone.
+        """
+        empty = len(self._payload(event_type, {**data, key: []}))
+        chunk: list = []
+        size = empty
+        for item in items:
+            # The item plus the comma before it.
+            item_size = len(orjson.dumps(item)) + 1
+            if chunk and (
+                len(chunk) == EVENT_MAX_ITEMS or size + item_size > EVENT_MAX_BYTES
+            ):
+                self.publish(event_type, {**data, key: chunk})
+                chunk, size = [], empty
+            chunk.append(item)
+            size += item_size
+        if chunk:
+            self.publish(event_type, {**data, key: chunk})
+
+    def _payload(self, event_type: str, data: Dict[str, Any]) -> bytes:
+        """The NOTIFY payload that carries an event to other workers."""
+        return orjson.dumps({"origin": self._origin, "type": event_type, "data": data})
+
+    def _deliver(self, event_type: str, data: Dict[str, Any]) -> Event:
+        self._seq += 1
+        event = Event(self._seq, event_type, data)
+        self._history.append(event)
+        for sub in list(self._subscribers):
+            if not sub.offer(event):
+                self._subscribers.discard(sub)
+        return event
+
+    def _replay_after(self, last_event_id: Optional[str]) -> list:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.rpartition(":")
+        oldest = self._history[0].seq if self._history else self._seq + 1
+        if epoch != BOOT_EPOCH or not seq.isdigit() or int(seq) + 1 < oldest:
+            # The gap can't be replayed; the client has to refetch state.
+            return [Event(self._seq, "reset", {"reason": "events were missed"})]
+        return [e for e in self._history if e.seq > int(seq)]
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """
+        Subscribe to new events, after replaying the ones that followed
+        `last_event_id`.
+        """
+        sub = Subscription(self._replay_after(last_event_id), self.subscriber_buffer)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    async def start(self) -> None:
+        if EVENTS_BACKEND != "postgres" or self._tasks:
+            return
+        from app.database import async_engine
+
+        dsn = async_engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        listen = await psycopg.AsyncConnection.connect(dsn, autocommit=True)
+        notify = await psycopg.AsyncConnection.connect(dsn, autocommit=True)
+        await listen.execute(f'LISTEN "{EVENTS_CHANNEL}"')
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._listen(listen), name="events-listen"),
+            asyncio.create_task(self._notify(notify), name="events-notify"),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._outbox = None
+        for sub in list(self._subscribers):
+            sub.close()
+        self._subscribers.clear()
+
+    async def _notify(self, conn) -> None:
+        # One sender task, so other workers see events in publish order.
+        try:
+            while True:
+                event_type, data = await self._outbox.get()
+                payload = self._payload(event_type, data).decode()
+                try:
+                    await conn.execute(
+                        "SELECT pg_notify(%s, %s)", (EVENTS_CHANNEL, payload)
+                    )
+                except Exception:
+                    logger.exception(
+                        "Could not send %s event to other workers", event_type
+                    )
+        finally:
+            await conn.close()
+
+    async def _listen(self, conn) -> None:
+        try:
+            async for notify in conn.notifies():
+                try:
+                    message = orjson.loads(notify.payload)
+                except orjson.JSONDecodeError:
+                    logger.warning("Ignoring malformed event on %s", EVENTS_CHANNEL)
+                    continue
+                if message.get("origin") != self._origin:
+                    self._deliver(message["type"], message["data"])
+        finally:
+            await conn.close()
+
+
+# The app-wide bus; main.py starts and stops it with the app.
+event_bus = EventBus()
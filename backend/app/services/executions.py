@@ -0,0 +1,262 @@
+"""
+Asynchronous agent execution engine behind POST /api/v1/agent/execute.
+
+Requests only record an execution and enqueue it; a fixed pool of worker
+tasks runs the agent in the background and persists each state change
+(queued -> running -> succeeded | failed) to `agent_executions`, where
+GET /api/v1/agent/executions/{id} reads it back.
+
+Backpressure: at most AGENT_EXECUTION_QUEUE_SIZE executions may wait at
+once; past that `submit` raises QueueFull and the route answers 429.
+Runners are coroutines, so I/O-bound agents never block the event loop.
+
+Queued executions live only in process memory. `stop` marks the ones it
+abandons failed; after a crash, `start` does the same for every
+execution created before it that is still queued or running. Like the
+ETag counters (app.services.versions), this assumes one process runs all
+executions. A job another process is still running would show as failed
+until it finishes and records its real outcome.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.database import AsyncSessionLocal
+from app.models.agent import AgentExecution
+from app.services.events import event_bus
+from app.services.kestra import (
+    KESTRA_FLOW_ID,
+    KESTRA_NAMESPACE,
+    KestraError,
+    execution_ui_url,
+    kestra_client,
+)
+from sqlalchemy import update
+
+logger = logging.getLogger(__name__)
+
+AGENT_EXECUTION_WORKERS = int(os.getenv("AGENT_EXECUTION_WORKERS", "4"))
+AGENT_EXECUTION_QUEUE_SIZE = int(os.getenv("AGENT_EXECUTION_QUEUE_SIZE", "100"))
+
+
+class QueueFull(Exception):
+    """The execution queue is at capacity; the caller should retry later."""
+
+
+@dataclass(frozen=True)
+class ExecutionJob:
+    id: str
+    instruction: str
+    task_id: Optional[int] = None
+    goal_id: Optional[int] = None
+
+
+AgentRunner = Callable[[ExecutionJob], Awaitable[Dict[str, Any]]]
+
+
+async def kestra_runner(job: ExecutionJob) -> Dict[str, Any]:
+    """Default agent: hand the instruction to the TaskPilot AI agent flow in Kestra."""
+    if not kestra_client.configured:
+        raise KestraError("Kestra credentials not configured")
+
+    inputs = {"goal": job.instruction, "source": "agent", "reason": "agent-execute"}
+    data = await kestra_client.trigger_execution(KESTRA_NAMESPACE, KESTRA_FLOW_ID, inputs)
+    kestra_id = data.get("id")
+    if not kestra_id:
+        raise KestraError("Kestra returned no execution id")
+    return {
+        "kestra_execution_id": kestra_id,
+        "kestra_url": execution_ui_url(KESTRA_NAMESPACE, KESTRA_FLOW_ID, kestra_id),
+    }
+
+
+class ExecutionEngine:
+    def __init__(
+        self,
+        runner: AgentRunner = kestra_runner,
+        *,
+        workers: int = AGENT_EXECUTION_WORKERS,
+        queue_size: int = AGENT_EXECUTION_QUEUE_SIZE,
+        session_factory=AsyncSessionLocal,
+    ) -> None:
+        self.runner = runner
+        self.workers = workers
+        self.queue_size = queue_size
+        self.session_factory = session_factory
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, ExecutionJob] = {}
+        # Queued but not yet picked up. Counted separately from the queue so
+        # a slot is reserved before the record is written.
+        self._waiting = 0
+
+    @property
+    def started(self) -> bool:
+        return self._queue is not None
+
+    @property
+    def backlog(self) -> int:
+        return self._waiting
+
+    async def start(self) -> None:
+        """Start the workers, and fail executions a previous run left unfinished."""
+        if self.started:
+            return
+        started_at = datetime.utcnow()
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"agent-worker-{i}")
+            for i in range(self.workers)
+        ]
+        await self._fail_orphans(started_at)
+
+    async def stop(self) -> None:
+        """Stop the workers; executions that never finished are marked failed."""
+        if not self.started:
+            return
+        unfinished = list(self._running)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        while not self._queue.empty():
+            unfinished.append(self._queue.get_nowait().id)
+        self._running.clear()
+        self._waiting = 0
+        if unfinished:
+            await self._transition(
+                unfinished,
+                state="failed",
+                error="Interrupted by server shutdown",
+                finished_at=datetime.utcnow(),
+            )
+        self._queue = None
+
+    async def submit(
+        self,
+        instruction: str,
+        *,
+        task_id: Optional[int] = None,
+        goal_id: Optional[int] = None,
+    ) -> ExecutionJob:
+        """Record a queued execution and hand it to the workers."""
+        if not self.started:
+            await self.start()
+        if self._waiting >= self.queue_size:
+            raise QueueFull(f"{self._waiting} executions already waiting")
+
+        self._waiting += 1
+        job = ExecutionJob(
+            id=f"exec_{uuid.uuid4().hex}",
+            instruction=instruction,
+            task_id=task_id,
+            goal_id=goal_id,
+        )
+        try:
+            async with self.session_factory() as db:
+                db.add(
+                    AgentExecution(
+                        id=job.id,
+                        task_id=task_id,
+                        goal_id=goal_id,
+                        instruction=instruction,
+                        state="queued",
+                    )
+                )
+                await db.commit()
+        except BaseException:
+            self._waiting -= 1
+            raise
+
+        self._queue.put_nowait(job)
+        event_bus.publish(
+            "execution.state", {"execution_ids": [job.id], "state": "queued"}
+        )
+        return job
+
+    async def drain(self) -> None:
+        """Wait until every execution submitted so far has finished."""
+        if self.started:
+            await self._queue.join()
+
+    async def _fail_orphans(self, before: datetime) -> None:
+        """Mark failed the executions created before `before` that never finished."""
+        async with self.session_factory() as db:
+            orphans = (
+                await db.scalars(
+                    update(AgentExecution)
+                    .where(
+                        AgentExecution.state.in_(("queued", "running")),
+                        AgentExecution.created_at < before,
+                    )
+                    .values(
+                        state="failed",
+                        error="Interrupted by server restart",
+                        finished_at=datetime.utcnow(),
+                    )
+                    .returning(AgentExecution.id)
+                )
+            ).all()
+            await db.commit()
+        if orphans:
+            logger.warning("Marked %d interrupted executions failed", len(orphans))
+            event_bus.publish_items(
+                "execution.state", "execution_ids", list(orphans), state="failed"
+            )
+
+    async def _transition(self, execution_ids: List[str], **values: Any) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                update(AgentExecution)
+                .where(AgentExecution.id.in_(execution_ids))
+                .values(**values)
+            )
+            await db.commit()
+        event_bus.publish_items(
+            "execution.state", "execution_ids", execution_ids, state=values["state"]
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._waiting -= 1
+            self._running[job.id] = job
+            try:
+                await self._transition(
+                    [job.id], state="running", started_at=datetime.utcnow()
+                )
+                try:
+                    result = await self.runner(job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    await self._transition(
+                        [job.id],
+                        state="failed",
+                        error=str(e) or type(e).__name__,
+                        finished_at=datetime.utcnow(),
+                    )
+                else:
+                    await self._transition(
+                        [job.id],
+                        state="succeeded",
+                        result=result,
+                        finished_at=datetime.utcnow(),
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Persisting the transition failed; keep the worker alive.
+                logger.exception("Could not record state of execution %s", job.id)
+            finally:
+                self._running.pop(job.id, None)
+                self._queue.task_done()
+
+
+# The app-wide engine; main.py starts and stops it with the app.
+execution_engine = ExecutionEngine()
@@ -0,0 +1,345 @@
+"""
+Shared HTTP client for talking to Kestra.
+
+One pooled `httpx.AsyncClient` is reused for the life of the app (opened on
+first use, closed on shutdown), so calls keep their TCP/TLS connections
+alive instead of handshaking every time. Failures are retried a bounded
+number of times with jittered exponential backoff, but only when that
+cannot start a second execution:
+
+- connect failures never reached Kestra, so any request may be retried;
+- read timeouts and 502/503/504 are retried for idempotent methods only.
+
+A circuit breaker counts consecutive failures and, once open, fails calls
+immediately until a cool-down has passed and a probe call succeeds.
+
+`ExecutionDeduper` sits in front of `trigger_execution`: identical
+triggers that overlap share one upstream call, and repeats within
+KESTRA_DEDUP_WINDOW seconds get the execution that was already started.
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from app.metrics import kestra_latency, registry
+
+KESTRA_BASE_URL = os.getenv("KESTRA_BASE_URL", "http://localhost:8080").rstrip("/")
+KESTRA_UI_URL = os.getenv("KESTRA_UI_URL", KESTRA_BASE_URL).rstrip("/")
+
+KESTRA_TENANT = os.getenv("KESTRA_TENANT", "main")
+
+KESTRA_NAMESPACE = os.getenv("KESTRA_NAMESPACE", "main")
+KESTRA_FLOW_ID = os.getenv("KESTRA_FLOW_ID", "taskpilot_ai_agent")
+
+KESTRA_USERNAME = os.getenv("KESTRA_USERNAME")
+KESTRA_PASSWORD = os.getenv("KESTRA_PASSWORD")
+
+KESTRA_TIMEOUT = float(os.getenv("KESTRA_TIMEOUT", "20"))
+KESTRA_MAX_CONNECTIONS = int(os.getenv("KESTRA_MAX_CONNECTIONS", "20"))
+KESTRA_MAX_KEEPALIVE = int(os.getenv("KESTRA_MAX_KEEPALIVE", "10"))
+KESTRA_KEEPALIVE_EXPIRY = float(os.getenv("KESTRA_KEEPALIVE_EXPIRY", "30"))
+KESTRA_RETRIES = int(os.getenv("KESTRA_RETRIES", "3"))
+KESTRA_BACKOFF_BASE = float(os.getenv("KESTRA_BACKOFF_BASE", "0.2"))
+KESTRA_BACKOFF_MAX = float(os.getenv("KESTRA_BACKOFF_MAX", "2.0"))
+KESTRA_BREAKER_THRESHOLD = int(os.getenv("KESTRA_BREAKER_THRESHOLD", "5"))
+KESTRA_BREAKER_RESET = float(os.getenv("KESTRA_BREAKER_RESET", "30"))
+KESTRA_DEDUP_WINDOW = float(os.getenv("KESTRA_DEDUP_WINDOW", "60"))
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+
+class KestraError(Exception):
+    """A Kestra call failed after retries, or returned something unusable."""
+
+
+class KestraUnavailable(KestraError):
+    """The circuit breaker is open; Kestra was not called."""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def probing(self) -> bool:
+        return self._probing
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            # Let exactly one probe through; everyone else keeps failing fast.
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Give back the probe slot when the probe ended without an outcome."""
+        self._probing = False
+
+
+class KestraClient:
+    def __init__(
+        self,
+        base_url: str = KESTRA_BASE_URL,
+        *,
+        tenant: str = KESTRA_TENANT,
+        username: Optional[str] = KESTRA_USERNAME,
+        password: Optional[str] = KESTRA_PASSWORD,
+        timeout: float = KESTRA_TIMEOUT,
+        max_connections: int = KESTRA_MAX_CONNECTIONS,
+        max_keepalive: int = KESTRA_MAX_KEEPALIVE,
+        retries: int = KESTRA_RETRIES,
+        backoff_base: float = KESTRA_BACKOFF_BASE,
+        backoff_max: float = KESTRA_BACKOFF_MAX,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.tenant = tenant
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=KESTRA_KEEPALIVE_EXPIRY,
+        )
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker(
+            KESTRA_BREAKER_THRESHOLD, KESTRA_BREAKER_RESET
+        )
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.username and self.password)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            auth = (self.username, self.password) if self.configured else None
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=auth,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spread retries uniformly so callers don't stampede.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Send a request to Kestra with retries and the circuit breaker.
+
+        `idempotent` defaults from the HTTP method; pass True for calls that
+        are safe to repeat despite being POSTs. Returns the final response
+        (which may still be an error status) or raises KestraError.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+
+        client = self._get_client()
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                raise KestraUnavailable("Kestra circuit breaker is open")
+            # allow() just handed this call the half-open probe, if any.
+            probe = self.breaker.probing
+
+            started = time.perf_counter()
+            try:
+                resp = await client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                kestra_latency.observe(time.perf_counter() - started, method, "error")
+                self.breaker.record_failure()
+                error: Exception = e
+                retryable = True
+            except httpx.TransportError as e:
+                kestra_latency.observe(time.perf_counter() - started, method, "error")
+                self.breaker.record_failure()
+                error = e
+                retryable = idempotent
+            except BaseException:
+                # Cancelled (or failed outside httpx): no verdict on Kestra,
+                # but the next caller must be able to probe again.
+                if probe:
+                    self.breaker.release_probe()
+                raise
+            else:
+                kestra_latency.observe(
+                    time.perf_counter() - started, method, f"{resp.status_code // 100}xx"
+                )
+                if resp.status_code < 500:
+                    self.breaker.record_success()
+                    return resp
+                self.breaker.record_failure()
+                if not (idempotent and resp.status_code in RETRYABLE_STATUSES):
+                    return resp
+                if attempt >= self.retries:
+                    return resp
+                error = KestraError(f"Kestra returned {resp.status_code}")
+                retryable = True
+
+            if not retryable or attempt >= self.retries:
+                raise KestraError(f"Error calling Kestra: {error}") from error
+
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    async def trigger_execution(
+        self, namespace: str, flow_id: str, inputs: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """Start a flow execution and return Kestra's execution document."""
+        resp = await self.request(
+            "POST",
+            f"/api/v1/{self.tenant}/executions/{namespace}/{flow_id}",
+            files={key: (None, value) for key, value in inputs.items()},
+        )
+        if resp.status_code >= 300:
+            raise KestraError(f"Kestra call failed (status={resp.status_code}).")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise KestraError("Kestra returned a non-JSON response") from e
+
+    async def get_execution(self, execution_id: str) -> Dict[str, Any]:
+        resp = await self.request(
+            "GET", f"/api/v1/{self.tenant}/executions/{execution_id}"
+        )
+        if resp.status_code >= 300:
+            raise KestraError(f"Kestra call failed (status={resp.status_code}).")
+        try:
+            return resp.json()
+        except ValueError as e:
+            raise KestraError("Kestra returned a non-JSON response") from e
+
+
+class ExecutionDeduper:
+    """
+    Single-flight wrapper around `KestraClient.trigger_execution`.
+
+    Callers with the same (namespace, flow, inputs) that arrive while a
+    trigger is in flight wait on that call instead of starting their own.
+    Successful executions are remembered for `window` seconds and handed
+    to repeat triggers; failures are never remembered.
+    """
+
+    def __init__(self, client: KestraClient, window: float) -> None:
+        self.client = client
+        self.window = window
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._recent: Dict[tuple, Tuple[float, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _key(namespace: str, flow_id: str, inputs: Dict[str, str]) -> tuple:
+        return (namespace, flow_id, tuple(sorted(inputs.items())))
+
+    def _remember(self, key: tuple, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if self.window > 0 and not task.cancelled() and task.exception() is None:
+            self._recent[key] = (time.monotonic() + self.window, task.result())
+
+    def _lookup_recent(self, key: tuple) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        for stale in [k for k, (expires, _) in self._recent.items() if expires <= now]:
+            del self._recent[stale]
+        entry = self._recent.get(key)
+        return entry[1] if entry is not None else None
+
+    async def trigger(
+        self, namespace: str, flow_id: str, inputs: Dict[str, str]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Return `(execution, reused)`.
+
+        `reused` is False only for the caller whose trigger started the execution.
+        """
+        key = self._key(namespace, flow_id, inputs)
+
+        execution = self._lookup_recent(key)
+        if execution is not None:
+            return execution, True
+
+        task = self._inflight.get(key)
+        reused = task is not None
+        if task is None:
+            # The upstream call runs as its own task so a caller that goes
+            # away (client disconnect) doesn't cancel it for everyone else.
+            task = asyncio.ensure_future(
+                self.client.trigger_execution(namespace, flow_id, inputs)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._remember(key, t))
+
+        return await asyncio.shield(task), reused
+
+
+def execution_ui_url(namespace: str, flow_id: str, execution_id: str) -> str:
+    return f"{KESTRA_UI_URL}/ui/execution/{namespace}/{flow_id}/{execution_id}"
+
+
+# The app-wide client; main.py closes it on shutdown.
+kestra_client = KestraClient()
+
+kestra_breaker_open = registry.gauge(
+    "taskpilot_kestra_breaker_open",
+    "1 while the Kestra circuit breaker is failing calls fast, else 0.",
+)
+
+
+@registry.collector
+def _collect_breaker_state() -> None:
+    kestra_breaker_open.set(int(kestra_client.breaker.state == "open"))
+
+
+# The app-wide deduper, in front of kestra_client.
+execution_deduper = ExecutionDeduper(kestra_client, KESTRA_DEDUP_WINDOW)
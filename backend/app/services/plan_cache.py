@@ -0,0 +1,212 @@
+"""
+Cache for generated plans.
+
+Plans are cached as serialized JSON under a key built from the request
+(goal text, deadline, minutes per day) plus today's date, since
+the planners schedule relative to today. Entries expire after
+PLAN_CACHE_TTL seconds.
+
+Backends (PLAN_CACHE_BACKEND):
+
+- "memory" (default): per-process LRU capped at PLAN_CACHE_MAX_BYTES.
+- "redis": shared between workers. Needs the optional `redis` package;
+  configure the server with `maxmemory` + `allkeys-lru` for the size cap.
+- "none": disables caching.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Protocol, Tuple, TypeVar
+
+from pydantic import TypeAdapter
+
+PLAN_CACHE_BACKEND = os.getenv("PLAN_CACHE_BACKEND", "memory")
+PLAN_CACHE_TTL = float(os.getenv("PLAN_CACHE_TTL", "3600"))
+PLAN_CACHE_MAX_BYTES = int(os.getenv("PLAN_CACHE_MAX_BYTES", str(32 * 2**20)))
+PLAN_CACHE_REDIS_URL = os.getenv("PLAN_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+T = TypeVar("T")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class CacheBackend(Protocol):
+    stats: CacheStats
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    def size_bytes(self) -> Optional[int]: ...
+
+
+class MemoryBackend:
+    def __init__(self, max_bytes: int = PLAN_CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _drop(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._bytes += len(value)
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class RedisBackend:
+    def __init__(
+        self, url: str = PLAN_CACHE_REDIS_URL, prefix: str = "taskpilot:plan:"
+    ) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:  # optional dependency
+            raise RuntimeError(
+                "PLAN_CACHE_BACKEND=redis requires the 'redis' package"
+            ) from e
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._redis = redis.from_url(url)
+
+    def size_bytes(self) -> None:
+        # Owned by the Redis server (maxmemory); not tracked per process.
+        return None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await self._redis.get(self.prefix + key)
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(self.prefix + key, value, px=int(ttl * 1000))
+
+    async def clear(self) -> None:
+        async for key in self._redis.scan_iter(match=self.prefix + "*"):
+            await self._redis.delete(key)
+
+
+class NullBackend:
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def size_bytes(self) -> int:
+        return 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        return None
+
+    async def clear(self) -> None:
+        return None
+
+
+def plan_key(
+    kind: str,
+    goal: str,
+    deadline: Optional[date] = None,
+    time_available_per_day: Optional[int] = None,
+) -> str:
+    """
+    Cache key for a plan request.
+
+    Goal text is used exactly as given: plans quote it in task titles and
+    summaries, so two spellings must not share a cached body.
+    """
+    fields = {
+        "goal": goal,
+        "deadline": deadline.isoformat() if deadline else None,
+        "minutes": time_available_per_day,
+        "today": date.today().isoformat(),
+    }
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+    return f"{kind}:{digest}"
+
+
+class PlanCache:
+    def __init__(self, backend: CacheBackend, ttl: float = PLAN_CACHE_TTL) -> None:
+        self.backend = backend
+        self.ttl = ttl
+
+    async def get_or_build(
+        self, key: str, adapter: TypeAdapter, build: Callable[[], T]
+    ) -> T:
+        """Return the cached value for `key`, or build, store and return it."""
+        raw = await self.backend.get(key)
+        if raw is not None:
+            return adapter.validate_json(raw)
+        value = build()
+        await self.backend.set(key, adapter.dump_json(value), self.ttl)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        stats = asdict(self.backend.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size_bytes"] = self.backend.size_bytes()
+        stats["backend"] = type(self.backend).__name__
+        return stats
+
+
+def _backend_from_env() -> CacheBackend:
+    if PLAN_CACHE_BACKEND == "redis":
+        return RedisBackend()
+    if PLAN_CACHE_BACKEND == "none":
+        return NullBackend()
+    return MemoryBackend()
+
+
+plan_cache = PlanCache(_backend_from_env())
@@ -0,0 +1,182 @@
+"""
+Per-goal task progress counters.
+
+`goals` carries one counter column per task status so summaries are a
+single-row read. Every code path that inserts, deletes or re-statuses
+tasks must report the change here in the same transaction; the checker
+at the bottom finds and repairs drift if one ever doesn't.
+
+The counters also decide `goals.status`: a goal whose tasks are all
+completed is completed, and goes back to in_progress when that stops
+being true. Abandoned goals keep their status. This is what the
+archiver (app.services.archive) keys on.
+
+    python -m app.services.progress --check      # list drifted goals
+    python -m app.services.progress --rebuild    # recount every goal
+"""
+import argparse
+import asyncio
+import operator
+from collections import Counter, defaultdict
+from functools import reduce
+from typing import Iterable
+
+from app.models.agent import TASK_STATUSES, Goal, GoalStatus, Task
+from sqlalchemy import and_, bindparam, case, func, literal, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+COUNTER_COLUMNS = {status: f"{status}_tasks" for status in TASK_STATUSES}
+
+
+def counter_values(statuses: Iterable[str]) -> dict[str, int]:
+    """Counter column values for a goal whose tasks have `statuses`."""
+    counts = Counter(statuses)
+    return {column: counts[status] for status, column in COUNTER_COLUMNS.items()}
+
+
+def goal_status(counters: dict[str, int]) -> str:
+    """Status of a not-abandoned goal with these counter values."""
+    total = sum(counters.values())
+    if total and counters[COUNTER_COLUMNS["completed"]] == total:
+        return "completed"
+    return "in_progress"
+
+
+def _status_expr(counts: dict):
+    """SQL form of `goal_status` over per-status count expressions."""
+    goals = Goal.__table__
+    total = reduce(operator.add, counts.values())
+    return case(
+        (goals.c.status == "abandoned", goals.c.status),
+        (
+            and_(total > 0, counts["completed"] == total),
+            literal("completed", GoalStatus),
+        ),
+        else_=literal("in_progress", GoalStatus),
+    )
+
+
+async def apply_deltas(db: AsyncSession, deltas: dict[int, Counter]) -> None:
+    """
+    Add per-status `deltas` ({goal_id: Counter(status -> n)}) to the counters.
+
+    Issues a single executemany UPDATE no matter how many goals changed,
+    which also sets each goal's status from its new counters.
+    """
+    rows = []
+    for goal_id, delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        row = {"b_goal_id": goal_id}
+        row.update({f"d_{status}": delta.get(status, 0) for status in TASK_STATUSES})
+        rows.append(row)
+    if not rows:
+        return
+
+    goals = Goal.__table__
+    counts = {
+        status: goals.c[column] + bindparam(f"d_{status}")
+        for status, column in COUNTER_COLUMNS.items()
+    }
+    values = {COUNTER_COLUMNS[status]: count for status, count in counts.items()}
+    values["status"] = _status_expr(counts)
+    stmt = update(goals).where(goals.c.id == bindparam("b_goal_id")).values(values)
+    await db.execute(stmt, rows)
+
+
+async def record_status_changes(
+    db: AsyncSession, changes: Iterable[tuple[int, str, str]]
+) -> None:
+    """Apply `(goal_id, old_status, new_status)` transitions to the counters."""
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    for goal_id, old, new in changes:
+        if old == new:
+            continue
+        deltas[goal_id][old] -= 1
+        deltas[goal_id][new] += 1
+    await apply_deltas(db, deltas)
+
+
+def _actual_counts():
+    """Subquery of real per-goal, per-status task counts."""
+    return (
+        select(
+            Task.goal_id.label("goal_id"),
+            *(
+                func.count().filter(Task.status == status).label(status)
+                for status in TASK_STATUSES
+            ),
+        )
+        .group_by(Task.goal_id)
+        .subquery()
+    )
+
+
+async def find_drift(db: AsyncSession, limit: int | None = None) -> list[int]:
+    """Ids of goals whose stored counters disagree with their tasks."""
+    actual = _actual_counts()
+    mismatch = or_(
+        *(
+            getattr(Goal, column) != func.coalesce(actual.c[status], 0)
+            for status, column in COUNTER_COLUMNS.items()
+        )
+    )
+    query = (
+        select(Goal.id)
+        .outerjoin(actual, actual.c.goal_id == Goal.id)
+        .where(mismatch)
+        .order_by(Goal.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return list((await db.scalars(query)).all())
+
+
+async def rebuild(db: AsyncSession, goal_ids: Iterable[int] | None = None) -> int:
+    """
+    Recount counters from the tasks table, and re-derive goal status from
+    them; all goals when `goal_ids` is None.
+
+    Returns the number of goals rewritten. The caller commits.
+    """
+    values = {}
+    for status, column in COUNTER_COLUMNS.items():
+        values[column] = (
+            select(func.count())
+            .where(and_(Task.goal_id == Goal.id, Task.status == status))
+            .scalar_subquery()
+        )
+    stmt = update(Goal).values(values).execution_options(synchronize_session=False)
+    if goal_ids is not None:
+        stmt = stmt.where(Goal.id.in_(list(goal_ids)))
+    result = await db.execute(stmt)
+
+    goals = Goal.__table__
+    counts = {status: goals.c[column] for status, column in COUNTER_COLUMNS.items()}
+    stmt = update(goals).values(status=_status_expr(counts))
+    if goal_ids is not None:
+        stmt = stmt.where(goals.c.id.in_(list(goal_ids)))
+    await db.execute(stmt)
+    return result.rowcount
+
+
+async def _main(check_only: bool) -> None:
+    from app.database import AsyncSessionLocal, async_engine
+
+    async with AsyncSessionLocal() as db:
+        drifted = await find_drift(db)
+        print(f"{len(drifted)} goal(s) with drifted counters: {drifted[:20]}")
+        if not check_only:
+            rewritten = await rebuild(db)
+            await db.commit()
+            print(f"Rebuilt counters for {rewritten} goal(s)")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check or rebuild goal progress counters.")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--check", action="store_true", help="Only report drifted goals")
+    mode.add_argument("--rebuild", action="store_true", help="Recount every goal")
+    args = parser.parse_args()
+    asyncio.run(_main(check_only=args.check))
@@ -0,0 +1,352 @@
+"""
+Full-text search over goal statements and task titles.
+
+On Postgres, the search runs on `search_vector` columns. They are
+generated (STORED) `to_tsvector('english', ...)` columns with GIN indexes
+and are maintained by the database, so no write path has to remember
+them. The columns are created by migration f1d6b2c8a390 and are not
+mapped on the models, which lets SQLite's `create_all` keep working.
+A query goes through `websearch_to_tsquery` ("quoted phrases", -not,
+or), and the matches are ranked with `ts_rank_cd`.
+
+Other dialects (SQLite, file or in-memory) use `SearchIndex`, an
+in-process inverted index:
+
+- one posting list of ids per term, kept in arrays in increasing id
+  order, so a million task titles take tens of MB;
+- a query is the AND of its terms: walk the shortest list, newest first,
+  and test each id against the other terms in O(1);
+- matches are ranked by BM25 with binary term frequency.
+
+Tokens are lowercased words with stop words dropped and plurals folded
+("tasks" finds "task"). This is close to, but not the same as,
+Postgres' English stemming.
+
+Goal and task text never changes after insert, and ids only grow and
+are never reused (see app.models.agent). The index therefore catches up
+before each search by reading the rows past the last id it has seen.
+That is one primary-key range read per table, and it also picks up other
+processes' writes. This relies on ids committing in order, which holds
+for SQLite's single writer. The first search in a process indexes
+everything.
+
+Rows that have been deleted (or archived) are found when a page is
+loaded. They are marked dead in the index, which stops ranking them, and
+the page is ranked again until it is full, so deletions never leave
+short pages behind. A restored goal comes back through `revive`.
+
+Results are served at most SEARCH_MAX_CANDIDATES deep per table; pages
+past that depth are not served. On Postgres that is the best-ranked
+matches: every match is ranked, and each table keeps its top ones before
+they are merged. The in-process index instead ranks only the newest
+SEARCH_MAX_CANDIDATES matches, which bounds the latency of a query on a
+very common term no matter how much data there is.
+"""
+import asyncio
+import math
+import os
+import re
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from app.models.agent import Goal, Task
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+SEARCH_CONFIG = "english"
+
+# Rows read per round trip while the in-process index catches up.
+INDEX_REFRESH_CHUNK = 10_000
+
+# Terms in at least 1 of this many documents get a membership bitmap.
+BITMAP_MIN_DENSITY = 64
+
+# BM25 parameters.
+_K1 = 1.2
+_B = 0.75
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from how i in into is it my of on or "
+    "that the this to was what when with your".split()
+)
+
+# (kind, id, goal_id, text, status, rank) for one search result.
+Hit = Tuple[str, int, int, str, str, float]
+
+_POSTGRES_SEARCH = text(
+    f"""
+    WITH q AS (SELECT websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS query),
+    hits AS (
+        (SELECT 'goal' AS kind, g.id, g.id AS goal_id, g.goal AS text,
+                g.status::text AS status, ts_rank_cd(g.search_vector, q.query) AS rank
+         FROM goals g, q WHERE g.search_vector @@ q.query
+         ORDER BY rank DESC, g.id DESC LIMIT :candidates)
+        UNION ALL
+        (SELECT 'task', t.id, t.goal_id, t.title, t.status::text,
+                ts_rank_cd(t.search_vector, q.query) AS rank
+         FROM tasks t, q WHERE t.search_vector @@ q.query
+         ORDER BY rank DESC, t.id DESC LIMIT :candidates)
+    )
+    SELECT kind, id, goal_id, text, status, rank FROM hits
+    ORDER BY rank DESC, kind, id DESC
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+
+def tokenize(value: str) -> List[str]:
+    terms = []
+    for word in _WORD.findall(value.lower()):
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class InvertedIndex:
+    """
+    Posting lists for one table. Documents normally arrive in increasing
+    id order; a late one (see `revive`) is inserted in place.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, array] = {}
+        # term -> (postings covered, bitmap), see _membership.
+        self._bitmaps: Dict[str, Tuple[int, bytearray]] = {}
+        # Term count by document id; 0 for ids never added.
+        self.lengths = array("H")
+        # 1 for each id that has been added.
+        self._present = bytearray()
+        # Ids whose rows are gone; their postings stay but never match.
+        self.dead: set = set()
+        self.max_id = 0
+        self.doc_count = 0
+        self.total_length = 0
+
+    def has(self, doc_id: int) -> bool:
+        return doc_id < len(self._present) and bool(self._present[doc_id])
+
+    def add(self, doc_id: int, value: str) -> None:
+        if self.has(doc_id):
+            raise ValueError(f"document {doc_id} is already indexed")
+        terms = tokenize(value)
+        if doc_id >= len(self.lengths):
+            self.lengths.extend([0] * (doc_id + 1 - len(self.lengths)))
+            self._present.extend(bytes(doc_id + 1 - len(self._present)))
+        self.lengths[doc_id] = min(len(terms), 0xFFFF)
+        self._present[doc_id] = 1
+        for term in dict.fromkeys(terms):
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = array("I")
+            if doc_id > self.max_id:
+                postings.append(doc_id)
+            else:
+                self._insert(term, postings, doc_id)
+        self.max_id = max(self.max_id, doc_id)
+        self.doc_count += 1
+        self.total_length += len(terms)
+
+    def _insert(self, term: str, postings: array, doc_id: int) -> None:
+        """Insert an id below max_id, keeping `term`'s bitmap in step."""
+        i = bisect_left(postings, doc_id)
+        postings.insert(i, doc_id)
+        if term in self._bitmaps:
+            covered, bitmap = self._bitmaps[term]
+            # Ids past `covered` are picked up when the bitmap is extended.
+            if i < covered:
+                bitmap[doc_id >> 3] |= 1 << (doc_id & 7)
+                self._bitmaps[term] = (covered + 1, bitmap)
+
+    def discard(self, doc_id: int) -> None:
+        """
+        Stop matching `doc_id`, whose row no longer exists. Term and
+        length statistics keep counting it, like its postings do, so
+        scores stay consistent.
+        """
+        self.dead.add(doc_id)
+
+    def revive(self, doc_id: int, value: str) -> None:
+        """
+        Match `doc_id` again after its row came back. If its row was
+        already gone when the index caught up past it, index it now.
+        """
+        if doc_id in self.dead:
+            self.dead.discard(doc_id)
+        elif doc_id <= self.max_id and not self.has(doc_id):
+            self.add(doc_id, value)
+
+    def search(self, terms: Sequence[str], candidates: int) -> List[Tuple[float, int]]:
+        """`(score, id)` for up to `candidates` documents with every term, newest first."""
+        lists = [(self.postings.get(term), term) for term in dict.fromkeys(terms)]
+        if not lists or any(postings is None for postings, _ in lists):
+            return []
+        lists.sort(key=lambda entry: len(entry[0]))
+        shortest = lists[0][0]
+        tests = [self._membership(term, postings) for postings, term in lists[1:]]
+
+        dead = self.dead
+        matches = []
+        for doc_id in reversed(shortest):
+            if doc_id in dead:
+                continue
+            for test in tests:
+                if not test(doc_id):
+                    break
+            else:
+                matches.append(doc_id)
+                if len(matches) == candidates:
+                    break
+        if not matches:
+            return []
+
+        n = self.doc_count
+        idf = sum(
+            math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5)) for p, _ in lists
+        )
+        average = self.total_length / n
+        scale = idf * (_K1 + 1)
+        lengths = self.lengths
+        return [
+            (scale / (1 + _K1 * (1 - _B + _B * lengths[doc_id] / average)), doc_id)
+            for doc_id in matches
+        ]
+
+    def _membership(self, term: str, postings: array) -> Callable[[int], bool]:
+        """
+        An O(1) "is this id in `postings`" test. Short lists become a set
+        for the query. Long ones keep a bitmap over ids, which costs at
+        most twice the postings' memory. It is extended, never rebuilt,
+        as the list grows.
+        """
+        if len(postings) * BITMAP_MIN_DENSITY < self.max_id:
+            return set(postings).__contains__
+        covered, bitmap = self._bitmaps.get(term, (0, bytearray()))
+        if covered < len(postings):
+            size = (self.max_id >> 3) + 1
+            bitmap.extend(bytes(size - len(bitmap)))
+            for doc_id in postings[covered:]:
+                bitmap[doc_id >> 3] |= 1 << (doc_id & 7)
+            self._bitmaps[term] = (len(postings), bitmap)
+        return lambda doc_id: bitmap[doc_id >> 3] >> (doc_id & 7) & 1
+
+
+class SearchIndex:
+    def __init__(self) -> None:
+        self.goals = InvertedIndex()
+        self.tasks = InvertedIndex()
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Index the goals and tasks inserted since the last refresh."""
+        async with self._lock:
+            for index, id_column, text_column in (
+                (self.goals, Goal.id, Goal.goal),
+                (self.tasks, Task.id, Task.title),
+            ):
+                while True:
+                    rows = (
+                        await db.execute(
+                            select(id_column, text_column)
+                            .where(id_column > index.max_id)
+                            .order_by(id_column)
+                            .limit(INDEX_REFRESH_CHUNK)
+                        )
+                    ).all()
+                    for doc_id, value in rows:
+                        index.add(doc_id, value)
+                    if len(rows) < INDEX_REFRESH_CHUNK:
+                        break
+
+    def ranked(self, query: str) -> List[Tuple[str, int, float]]:
+        """`(kind, id, score)` for every candidate match, best first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        hits = [
+            (score, kind, doc_id)
+            for kind, index in (("goal", self.goals), ("task", self.tasks))
+            for score, doc_id in index.search(terms, SEARCH_MAX_CANDIDATES)
+        ]
+        hits.sort(key=lambda hit: (-hit[0], hit[1], -hit[2]))
+        return [(kind, doc_id, score) for score, kind, doc_id in hits]
+
+    def revive(
+        self, goals: Sequence[Tuple[int, str]], tasks: Sequence[Tuple[int, str]]
+    ) -> None:
+        """Make restored `(id, text)` goals and tasks searchable again."""
+        for goal_id, value in goals:
+            self.goals.revive(goal_id, value)
+        for task_id, value in tasks:
+            self.tasks.revive(task_id, value)
+
+    async def search(
+        self, db: AsyncSession, query: str, limit: int, offset: int
+    ) -> List[Hit]:
+        await self.refresh(db)
+        while True:
+            page = self.ranked(query)[offset : offset + limit]
+            rows = await self._load(db, page)
+            gone = [
+                (kind, doc_id)
+                for kind, doc_id, _ in page
+                if (kind, doc_id) not in rows
+            ]
+            if not gone:
+                return [
+                    (kind, doc_id, *rows[kind, doc_id], score)
+                    for kind, doc_id, score in page
+                ]
+            # Every round marks at least one id dead, so this ends.
+            for kind, doc_id in gone:
+                (self.goals if kind == "goal" else self.tasks).discard(doc_id)
+
+    async def _load(
+        self, db: AsyncSession, page: List[Tuple[str, int, float]]
+    ) -> Dict[Tuple[str, int], tuple]:
+        """(kind, id) -> (goal_id, text, status) for the page's rows that still exist."""
+        goal_ids = [doc_id for kind, doc_id, _ in page if kind == "goal"]
+        task_ids = [doc_id for kind, doc_id, _ in page if kind == "task"]
+        rows = {}
+        if goal_ids:
+            for goal_id, value, status in await db.execute(
+                select(Goal.id, Goal.goal, Goal.status).where(Goal.id.in_(goal_ids))
+            ):
+                rows["goal", goal_id] = (goal_id, value, status)
+        if task_ids:
+            for task_id, goal_id, value, status in await db.execute(
+                select(Task.id, Task.goal_id, Task.title, Task.status).where(
+                    Task.id.in_(task_ids)
+                )
+            ):
+                rows["task", task_id] = (goal_id, value, status)
+        return rows
+
+
+async def search(
+    db: AsyncSession, query: str, limit: int, offset: int
+) -> List[Hit]:
+    """Up to `limit` hits for `query`, best first, after skipping `offset`."""
+    if db.bind.dialect.name == "postgresql":
+        rows = await db.execute(
+            _POSTGRES_SEARCH,
+            {
+                "query": query,
+                "candidates": SEARCH_MAX_CANDIDATES,
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        return [tuple(row) for row in rows]
+    return await search_index.search(db, query, limit, offset)
+
+
+# The app-wide fallback index.
+search_index = SearchIndex()
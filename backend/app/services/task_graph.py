@@ -0,0 +1,445 @@
+"""
+Per-goal task dependency graphs, kept in memory and updated in place.
+
+A goal's tasks and its `task_dependencies` rows form a DAG, where an edge
+u -> v means v can't start until u is done. For every task, `TaskGraph`
+knows:
+
+- its place in a topological order;
+- its earliest start, which is the longest chain of work before it;
+- the latest start that doesn't delay the goal, and the slack between
+  the two;
+- whether it is on the critical path (zero slack).
+
+None of this is recomputed from scratch when an edge or a duration
+changes.
+
+The topological order is maintained with Pearce-Kelly. Every task holds
+a position. A new edge u -> v that already agrees with the order
+(pos[u] < pos[v]) costs nothing. Otherwise only the tasks positioned
+between v and u can be affected. A forward search from v and a backward
+search from u, both confined to that window, then do one of two things:
+
+- meet, in which case the edge would close a cycle and is rejected with
+  the cycle's path;
+- find the two sets of tasks that trade positions.
+
+The cost scales with that window, not with the graph.
+
+Timing is kept as two longest-path lengths per task:
+
+- `head` is the work that has to finish before the task starts;
+- `tail` is the task's own duration plus the longest chain after it.
+
+The goal's length (the makespan) is the largest head + tail, and a
+task's slack is makespan - (head + tail). A change can only move heads
+downstream of it and tails upstream of it. A worklist in topological
+order repairs them and stops wherever a value comes out unchanged. The
+makespan comes from a count of every head + tail value plus a lazy max
+heap, so reading it never rescans the graph.
+
+`GraphCache` holds the graphs per process and loads each from the
+database on first use. Like the plan cache's memory backend, it is only
+correct when one process serves every write (see app.services.versions).
+"""
+import asyncio
+import heapq
+import os
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from app.models.agent import Goal, Task, TaskDependency
+from app.services.scheduler import DEFAULT_TASK_MINUTES
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+GRAPH_CACHE_GOALS = int(os.getenv("GRAPH_CACHE_GOALS", "128"))
+
+# Writers to one goal's graph are serialized on one of this many locks.
+_LOCK_STRIPES = 64
+
+
+class CycleError(ValueError):
+    """The dependency would make a task (transitively) wait on itself."""
+
+    def __init__(self, cycle: List[Hashable]) -> None:
+        # First and last entries are the same task.
+        self.cycle = cycle
+        super().__init__(
+            "Dependency would create a cycle: " + " -> ".join(map(str, cycle))
+        )
+
+
+@dataclass
+class Timing:
+    earliest_start: int
+    earliest_finish: int
+    latest_start: int
+    latest_finish: int
+    slack: int
+
+    @property
+    def critical(self) -> bool:
+        return self.slack == 0
+
+
+class TaskGraph:
+    def __init__(self) -> None:
+        self.duration: Dict[Hashable, int] = {}
+        self.successors: Dict[Hashable, Set[Hashable]] = {}
+        self.predecessors: Dict[Hashable, Set[Hashable]] = {}
+        self._pos: Dict[Hashable, int] = {}
+        self._next_pos = 0
+        self._head: Dict[Hashable, int] = {}
+        self._tail: Dict[Hashable, int] = {}
+        # head + tail value -> number of tasks with it, and a max heap
+        # (negated) over the values that may have stale entries.
+        self._lengths: Counter = Counter()
+        self._length_heap: List[int] = []
+        # Heads and tails recomputed so far, for benchmarks.
+        self.touched = 0
+
+    @classmethod
+    def build(
+        cls,
+        durations: Dict[Hashable, Optional[int]],
+        edges: Iterable[Tuple[Hashable, Hashable]],
+    ) -> "TaskGraph":
+        """
+        Bulk-load a graph in O(V + E). `durations` maps every task to its
+        minutes (None means DEFAULT_TASK_MINUTES), and each edge is
+        `(before, after)`. Raises CycleError if the edges have a cycle.
+        """
+        graph = cls()
+        for node, minutes in durations.items():
+            graph.duration[node] = DEFAULT_TASK_MINUTES if minutes is None else minutes
+            graph.successors[node] = set()
+            graph.predecessors[node] = set()
+        for before, after in edges:
+            graph._require(before, after)
+            if before == after:
+                raise CycleError([before, after])
+            graph.successors[before].add(after)
+            graph.predecessors[after].add(before)
+
+        # Kahn's algorithm; FIFO keeps independent tasks in input order.
+        waiting = {node: len(preds) for node, preds in graph.predecessors.items()}
+        ready = deque(node for node, count in waiting.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for nxt in graph.successors[node]:
+                waiting[nxt] -= 1
+                if waiting[nxt] == 0:
+                    ready.append(nxt)
+        if len(order) < len(waiting):
+            stuck = {node for node, count in waiting.items() if count > 0}
+            raise CycleError(graph._find_cycle(stuck))
+
+        for node in order:
+            graph._pos[node] = graph._next_pos
+            graph._next_pos += 1
+            graph._head[node] = max(
+                (graph._head[p] + graph.duration[p] for p in graph.predecessors[node]),
+                default=0,
+            )
+        for node in reversed(order):
+            graph._tail[node] = graph.duration[node] + max(
+                (graph._tail[s] for s in graph.successors[node]), default=0
+            )
+            graph._add_length(graph._head[node] + graph._tail[node])
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.duration)
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self.duration
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(succ) for succ in self.successors.values())
+
+    def has_edge(self, before: Hashable, after: Hashable) -> bool:
+        return after in self.successors.get(before, ())
+
+    # Changes
+
+    def add_edge(self, before: Hashable, after: Hashable) -> bool:
+        """
+        Make `after` depend on `before`. Returns False if it already did;
+        raises CycleError, leaving the graph unchanged, if `before`
+        already depends on `after`.
+        """
+        self._require(before, after)
+        if self.has_edge(before, after):
+            return False
+        if before == after:
+            raise CycleError([before, after])
+        if self._pos[before] > self._pos[after]:
+            self._reorder(before, after)
+        self.successors[before].add(after)
+        self.predecessors[after].add(before)
+        self._update_heads([after])
+        self._update_tails([before])
+        return True
+
+    def remove_edge(self, before: Hashable, after: Hashable) -> bool:
+        """Drop the dependency; returns False if there was none."""
+        if not self.has_edge(before, after):
+            return False
+        self.successors[before].discard(after)
+        self.predecessors[after].discard(before)
+        # The order stays valid: removing an edge never creates a violation.
+        self._update_heads([after])
+        self._update_tails([before])
+        return True
+
+    def set_duration(self, node: Hashable, minutes: int) -> bool:
+        """Returns False if `node` already had that duration."""
+        self._require(node)
+        if minutes < 0:
+            raise ValueError("minutes must not be negative")
+        if self.duration[node] == minutes:
+            return False
+        self.duration[node] = minutes
+        self._update_tails([node])
+        self._update_heads(self.successors[node])
+        return True
+
+    # Queries
+
+    @property
+    def makespan(self) -> int:
+        """Minutes from the first task's start to the last task's finish."""
+        heap = self._length_heap
+        while heap and -heap[0] not in self._lengths:
+            heapq.heappop(heap)
+        return -heap[0] if heap else 0
+
+    def order(self) -> List[Hashable]:
+        """Every task, each after all the tasks it depends on."""
+        return sorted(self._pos, key=self._pos.__getitem__)
+
+    def timing(self, node: Hashable) -> Timing:
+        self._require(node)
+        makespan = self.makespan
+        head, tail, minutes = self._head[node], self._tail[node], self.duration[node]
+        latest_start = makespan - tail
+        return Timing(
+            earliest_start=head,
+            earliest_finish=head + minutes,
+            latest_start=latest_start,
+            latest_finish=latest_start + minutes,
+            slack=makespan - head - tail,
+        )
+
+    def critical_path(self) -> List[Hashable]:
+        """
+        One chain of zero-slack tasks from a start to the end of the goal.
+        Ties go to the task earliest in the order. Finding the first task
+        scans the graph; following the chain only touches its edges.
+        """
+        if not self.duration:
+            return []
+        makespan = self.makespan
+        pos = self._pos.__getitem__
+        node = min(
+            (
+                n
+                for n in self.duration
+                if self._head[n] == 0 and self._tail[n] == makespan
+            ),
+            key=pos,
+        )
+        path = [node]
+        while True:
+            finish = self._head[node] + self.duration[node]
+            following = [
+                s
+                for s in self.successors[node]
+                if self._head[s] == finish and finish + self._tail[s] == makespan
+            ]
+            if not following:
+                return path
+            node = min(following, key=pos)
+            path.append(node)
+
+    # Internals
+
+    def _require(self, *nodes: Hashable) -> None:
+        for node in nodes:
+            if node not in self.duration:
+                raise KeyError(node)
+
+    def _reorder(self, before: Hashable, after: Hashable) -> None:
+        """
+        Pearce-Kelly: restore pos[before] < pos[after] by reassigning the
+        positions of the tasks between them, or raise CycleError.
+        """
+        pos = self._pos
+        lower, upper = pos[after], pos[before]
+
+        # Everything reachable from `after` without leaving the window.
+        parent: Dict[Hashable, Optional[Hashable]] = {after: None}
+        stack = [after]
+        while stack:
+            node = stack.pop()
+            for nxt in self.successors[node]:
+                if nxt == before:
+                    chain = []
+                    while node is not None:
+                        chain.append(node)
+                        node = parent[node]
+                    raise CycleError([before, *reversed(chain), before])
+                if nxt not in parent and pos[nxt] < upper:
+                    parent[nxt] = node
+                    stack.append(nxt)
+
+        # Everything that reaches `before` without leaving the window.
+        backward = {before}
+        stack = [before]
+        while stack:
+            node = stack.pop()
+            for prev in self.predecessors[node]:
+                if prev not in backward and pos[prev] > lower:
+                    backward.add(prev)
+                    stack.append(prev)
+
+        # The backward set moves ahead of the forward set; each keeps its
+        # internal order, and together they reuse the same positions.
+        moved = sorted(backward, key=pos.__getitem__) + sorted(
+            parent, key=pos.__getitem__
+        )
+        for node, slot in zip(moved, sorted(pos[n] for n in moved)):
+            pos[node] = slot
+
+    def _update_heads(self, starts: Iterable[Hashable]) -> None:
+        """Recompute heads from `starts` downstream, in topological order."""
+        pos = self._pos
+        queued = set(starts)
+        heap = [(pos[n], n) for n in queued]
+        heapq.heapify(heap)
+        while heap:
+            _, node = heapq.heappop(heap)
+            self.touched += 1
+            head = max(
+                (self._head[p] + self.duration[p] for p in self.predecessors[node]),
+                default=0,
+            )
+            if head == self._head[node]:
+                continue
+            self._set_timing(node, head, self._tail[node])
+            for nxt in self.successors[node]:
+                if nxt not in queued:
+                    queued.add(nxt)
+                    heapq.heappush(heap, (pos[nxt], nxt))
+
+    def _update_tails(self, starts: Iterable[Hashable]) -> None:
+        """Recompute tails from `starts` upstream, in reverse topological order."""
+        pos = self._pos
+        queued = set(starts)
+        heap = [(-pos[n], n) for n in queued]
+        heapq.heapify(heap)
+        while heap:
+            _, node = heapq.heappop(heap)
+            self.touched += 1
+            tail = self.duration[node] + max(
+                (self._tail[s] for s in self.successors[node]), default=0
+            )
+            if tail == self._tail[node]:
+                continue
+            self._set_timing(node, self._head[node], tail)
+            for prev in self.predecessors[node]:
+                if prev not in queued:
+                    queued.add(prev)
+                    heapq.heappush(heap, (-pos[prev], prev))
+
+    def _set_timing(self, node: Hashable, head: int, tail: int) -> None:
+        old = self._head[node] + self._tail[node]
+        self._lengths[old] -= 1
+        if not self._lengths[old]:
+            del self._lengths[old]
+        self._head[node] = head
+        self._tail[node] = tail
+        self._add_length(head + tail)
+
+    def _add_length(self, length: int) -> None:
+        if not self._lengths[length]:
+            heapq.heappush(self._length_heap, -length)
+            # Stale entries only leave the heap from the top; rebuild it
+            # before they outnumber the live ones.
+            if len(self._length_heap) > 2 * len(self._lengths) + 64:
+                self._length_heap = [-value for value in self._lengths]
+                self._length_heap.append(-length)
+                heapq.heapify(self._length_heap)
+        self._lengths[length] += 1
+
+    def _find_cycle(self, stuck: Set[Hashable]) -> List[Hashable]:
+        """A cycle among `stuck`, the tasks Kahn's algorithm never freed."""
+        # Every stuck task has a stuck predecessor, so walking predecessors
+        # must come back to a task already seen.
+        seen: Dict[Hashable, int] = {}
+        path: List[Hashable] = []
+        node = next(iter(stuck))
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(p for p in self.predecessors[node] if p in stuck)
+        cycle = path[seen[node] :] + [node]
+        return cycle[::-1]
+
+
+class GraphCache:
+    """
+    LRU of loaded graphs, keyed by goal id. Callers hold `lock(goal_id)`
+    around `get` and any change, so a load never races a write.
+    """
+
+    def __init__(self, max_goals: int = GRAPH_CACHE_GOALS) -> None:
+        self.max_goals = max_goals
+        self._graphs: "OrderedDict[int, TaskGraph]" = OrderedDict()
+        self._locks = [asyncio.Lock() for _ in range(_LOCK_STRIPES)]
+
+    def lock(self, goal_id: int) -> asyncio.Lock:
+        return self._locks[goal_id % _LOCK_STRIPES]
+
+    async def get(self, db: AsyncSession, goal_id: int) -> Optional[TaskGraph]:
+        """The goal's graph, loaded if needed; None if the goal doesn't exist."""
+        graph = self._graphs.get(goal_id)
+        if graph is not None:
+            self._graphs.move_to_end(goal_id)
+            return graph
+
+        durations = dict(
+            (
+                await db.execute(
+                    select(Task.id, Task.duration_minutes).where(Task.goal_id == goal_id)
+                )
+            ).all()
+        )
+        if not durations and await db.get(Goal, goal_id) is None:
+            return None
+        edges = (
+            await db.execute(
+                select(TaskDependency.depends_on_id, TaskDependency.task_id).where(
+                    TaskDependency.goal_id == goal_id
+                )
+            )
+        ).all()
+        graph = TaskGraph.build(durations, edges)
+
+        if self.max_goals > 0:
+            self._graphs[goal_id] = graph
+            while len(self._graphs) > self.max_goals:
+                self._graphs.popitem(last=False)
+        return graph
+
+    def discard(self, goal_id: int) -> None:
+        self._graphs.pop(goal_id, None)
+
+
+# The app-wide cache.
+graph_cache = GraphCache()
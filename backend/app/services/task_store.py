@@ -0,0 +1,260 @@
+"""
+In-memory task store for the demo / edge tier.
+
+Tasks are kept as slotted records rather than pydantic models, with
+secondary indexes on `recommended_day`, `status` and `milestone` so the
+hot reads (today's tasks, the plan summary) never scan the whole store.
+All access goes through one lock, so the store is safe to share between
+the event loop and threadpool workers.
+
+`version` goes up on every change, for the ETags on the listing routes.
+"""
+import threading
+from datetime import date, timedelta
+from itertools import count
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from app.schemas.planning import Task
+from app.services.scheduler import DEFAULT_TASK_MINUTES, ripple_forward
+
+
+class TaskRecord:
+    __slots__ = (
+        "seq",
+        "id",
+        "title",
+        "milestone",
+        "duration_minutes",
+        "recommended_day",
+        "status",
+    )
+
+    def __init__(self, seq: int, task: Task) -> None:
+        self.seq = seq
+        self.id = task.id
+        self.title = task.title
+        self.milestone = task.milestone
+        self.duration_minutes = task.duration_minutes
+        self.recommended_day = task.recommended_day
+        self.status = task.status
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "milestone": self.milestone,
+            "duration_minutes": self.duration_minutes,
+            "recommended_day": self.recommended_day,
+            "status": self.status,
+        }
+
+    def to_task(self) -> Task:
+        # Records only ever hold validated values, so skip re-validation.
+        return Task.model_construct(
+            id=self.id,
+            title=self.title,
+            milestone=self.milestone,
+            duration_minutes=self.duration_minutes,
+            recommended_day=self.recommended_day,
+            status=self.status,
+        )
+
+
+class TaskStore:
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._seq = count()
+        self._records: Dict[str, TaskRecord] = {}
+        # Index buckets are dicts used as insertion-ordered sets of task ids.
+        self._by_day: Dict[Optional[date], Dict[str, None]] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_milestone: Dict[Optional[str], Dict[str, None]] = {}
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _index_add(index: dict, key: Hashable, task_id: str) -> None:
+        index.setdefault(key, {})[task_id] = None
+
+    @staticmethod
+    def _index_remove(index: dict, key: Hashable, task_id: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(task_id, None)
+            if not bucket:
+                del index[key]
+
+    def _unindex(self, record: TaskRecord) -> None:
+        self._index_remove(self._by_day, record.recommended_day, record.id)
+        self._index_remove(self._by_status, record.status, record.id)
+        self._index_remove(self._by_milestone, record.milestone, record.id)
+
+    def _index(self, record: TaskRecord) -> None:
+        self._index_add(self._by_day, record.recommended_day, record.id)
+        self._index_add(self._by_status, record.status, record.id)
+        self._index_add(self._by_milestone, record.milestone, record.id)
+
+    def put(self, task: Task) -> None:
+        """Insert or replace a task."""
+        with self._lock:
+            old = self._records.get(task.id)
+            if old is not None:
+                self._unindex(old)
+            record = TaskRecord(next(self._seq), task)
+            self._records[record.id] = record
+            self._index(record)
+            self._version += 1
+
+    def put_many(self, tasks: Iterable[Task]) -> None:
+        with self._lock:
+            for task in tasks:
+                self.put(task)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+            self._by_day.clear()
+            self._by_status.clear()
+            self._by_milestone.clear()
+            self._version += 1
+
+    def get(self, task_id: str | int) -> Optional[Task]:
+        record = self._records.get(str(task_id))
+        return record.to_task() if record is not None else None
+
+    # Reads return Task models, or plain dicts with `as_dict=True` for
+    # callers that serialize straight to JSON.
+
+    def all(self, as_dict: bool = False) -> List[Union[Task, Dict[str, Any]]]:
+        with self._lock:
+            if as_dict:
+                return [r.to_dict() for r in self._records.values()]
+            return [r.to_task() for r in self._records.values()]
+
+    def _collect(
+        self, buckets: Iterable[Optional[Dict[str, None]]], as_dict: bool
+    ) -> List[Union[Task, Dict[str, Any]]]:
+        records = [
+            self._records[task_id]
+            for bucket in buckets
+            if bucket
+            for task_id in bucket
+        ]
+        records.sort(key=lambda r: r.seq)
+        if as_dict:
+            return [r.to_dict() for r in records]
+        return [r.to_task() for r in records]
+
+    def for_days(
+        self, *days: Optional[date], as_dict: bool = False
+    ) -> List[Union[Task, Dict[str, Any]]]:
+        """Tasks recommended for any of `days` (None = undated), in insertion order."""
+        with self._lock:
+            return self._collect((self._by_day.get(day) for day in days), as_dict)
+
+    def with_status(
+        self, status: str, as_dict: bool = False
+    ) -> List[Union[Task, Dict[str, Any]]]:
+        with self._lock:
+            return self._collect([self._by_status.get(status)], as_dict)
+
+    def _set_status(self, record: TaskRecord, status: str) -> None:
+        if record.status != status:
+            self._index_remove(self._by_status, record.status, record.id)
+            record.status = status
+            self._index_add(self._by_status, status, record.id)
+            self._version += 1
+
+    def update_status(self, task_id: str | int, status: str) -> Optional[Task]:
+        """Change a task's status in place; returns the updated task, or None."""
+        with self._lock:
+            record = self._records.get(str(task_id))
+            if record is None:
+                return None
+            self._set_status(record, status)
+            return record.to_task()
+
+    def update_statuses(
+        self, updates: Iterable[tuple[str | int, str]]
+    ) -> List[Optional[str]]:
+        """
+        Apply `(task_id, status)` pairs in order under one lock.
+
+        Returns each task's status just before its update (None if unknown).
+        """
+        previous: List[Optional[str]] = []
+        with self._lock:
+            for task_id, status in updates:
+                record = self._records.get(str(task_id))
+                previous.append(record.status if record is not None else None)
+                if record is not None:
+                    self._set_status(record, status)
+        return previous
+
+    def status_counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {status: len(ids) for status, ids in self._by_status.items()}
+
+    def milestones(self) -> List[str]:
+        """Distinct milestone titles, in order of first appearance."""
+        with self._lock:
+            return [m for m in self._by_milestone if m is not None]
+
+    def _move(self, record: TaskRecord, day: Optional[date]) -> None:
+        self._index_remove(self._by_day, record.recommended_day, record.id)
+        record.recommended_day = day
+        self._index_add(self._by_day, day, record.id)
+
+    def replan_missed(
+        self, task_id: str | int, minutes_per_day: int, today: Optional[date] = None
+    ) -> List[Tuple[str, Optional[date], date]]:
+        """
+        Move a missed task to the first day after both its old day and
+        `today` that has room, pushing later pending tasks forward as
+        needed (see `ripple_forward`). Every task that isn't completed
+        takes up time, including missed tasks moved there earlier.
+
+        Returns `(task_id, old_day, new_day)` for each task that moved.
+        Undated tasks have nothing to move.
+        """
+        today = today or date.today()
+        with self._lock:
+            record = self._records.get(str(task_id))
+            if record is None or record.recommended_day is None:
+                return []
+            rank = {m: i for i, m in enumerate(self._by_milestone)}
+
+            def minutes(r: TaskRecord) -> int:
+                if r.duration_minutes is None:
+                    return DEFAULT_TASK_MINUTES
+                return r.duration_minutes
+
+            def day_items(day: date) -> List[Tuple[str, int, int]]:
+                records = [
+                    self._records[i]
+                    for i in self._by_day.get(day, ())
+                    if self._records[i].status != "completed"
+                ]
+                records.sort(key=lambda r: r.seq)
+                return [(r.id, minutes(r), rank[r.milestone]) for r in records]
+
+            start = max(record.recommended_day, today) + timedelta(days=1)
+            moves = []
+            for moved_id, day in ripple_forward(
+                [(record.id, minutes(record), rank[record.milestone])],
+                start,
+                day_items,
+                minutes_per_day,
+            ):
+                moved = self._records[moved_id]
+                moves.append((moved_id, moved.recommended_day, day))
+                self._move(moved, day)
+            if moves:
+                self._version += 1
+            return moves
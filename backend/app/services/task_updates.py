@@ -0,0 +1,80 @@
+"""
+Bulk task status updates against the `tasks` table.
+
+A batch is applied in one transaction and a fixed number of statements,
+however many items it has:
+
+1. read the current (goal_id, status) of every task in the batch, locking
+   the rows so concurrent batches can't double-count a transition;
+2. one executemany UPDATE for the tasks whose final status differs;
+3. one executemany UPDATE of the goal progress counters.
+"""
+from typing import Iterable
+
+from app.models.agent import Task
+from app.services import progress
+from app.services.events import event_bus
+from app.services.versions import versions
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Ids per SELECT ... WHERE id IN (...), well under every driver's bind limit.
+STATUS_LOOKUP_CHUNK = 1000
+
+
+async def apply_status_updates(
+    db: AsyncSession, updates: Iterable[tuple[int, str]]
+) -> dict[int, str]:
+    """
+    Apply `(task_id, status)` pairs in order and commit; later pairs win.
+
+    Returns the status each existing task had before the batch. Ids that
+    are missing from the result don't exist in the database.
+    """
+    final: dict[int, str] = {}
+    for task_id, status in updates:
+        final[task_id] = status
+    if not final:
+        return {}
+
+    # Lock rows in id order, so two batches sharing tasks can't deadlock.
+    ids = sorted(final)
+    current: dict[int, tuple[int, str]] = {}
+    for start in range(0, len(ids), STATUS_LOOKUP_CHUNK):
+        chunk = ids[start : start + STATUS_LOOKUP_CHUNK]
+        rows = await db.execute(
+            select(Task.id, Task.goal_id, Task.status)
+            .where(Task.id.in_(chunk))
+            .order_by(Task.id)
+            .with_for_update()
+        )
+        for task_id, goal_id, status in rows:
+            current[task_id] = (goal_id, status)
+
+    changed = [
+        (task_id, goal_id, old, final[task_id])
+        for task_id, (goal_id, old) in current.items()
+        if final[task_id] != old
+    ]
+    if changed:
+        tasks = Task.__table__
+        await db.execute(
+            update(tasks)
+            .where(tasks.c.id == bindparam("b_id"))
+            .values(status=bindparam("b_status")),
+            [{"b_id": task_id, "b_status": new} for task_id, _, _, new in changed],
+        )
+        await progress.record_status_changes(
+            db, [(goal_id, old, new) for _, goal_id, old, new in changed]
+        )
+    await db.commit()
+
+    versions.goal_changed(goal_id for _, goal_id, _, _ in changed)
+    by_goal: dict[int, list] = {}
+    for task_id, goal_id, old, new in changed:
+        by_goal.setdefault(goal_id, []).append(
+            {"task_id": task_id, "status": new, "previous_status": old}
+        )
+    for goal_id, items in by_goal.items():
+        event_bus.publish_items("tasks.status", "changes", items, goal_id=goal_id)
+    return {task_id: status for task_id, (_, status) in current.items()}
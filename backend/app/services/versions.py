@@ -0,0 +1,76 @@
+"""
+Version counters behind the ETags on the polled read endpoints.
+
+Every write bumps the version of what it touched: one counter per goal,
+plus one for the goal collection as a whole. A read turns the versions
+it depends on, together with its query parameters, into a strong ETag.
+`If-None-Match` can then be answered with 304 from memory alone.
+
+Counters live in process memory and start again from zero on restart.
+Every ETag therefore also includes BOOT_EPOCH, so an ETag issued before
+a restart can never match one issued after it. Every process has its own
+counters, so this is only correct when one process serves all reads and
+writes (the README's `uvicorn app.main:app`). With several workers, a
+worker that didn't see a write would keep answering 304 with stale data.
+Conditional GETs are therefore off by default; set TASKPILOT_ETAGS=true
+to turn them on for single-process deployments.
+
+Ordering rules that keep a 304 from ever serving stale data:
+
+- a writer bumps *after* its transaction commits;
+- a reader takes the version *before* it loads data.
+
+Under those rules a race can only produce an ETag older than its body.
+That costs one extra 200 later, never a wrong 304.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Any, Hashable, Iterable, Optional
+
+TASKPILOT_ETAGS = os.getenv("TASKPILOT_ETAGS", "false") == "true"
+
+BOOT_EPOCH = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+
+GOALS = "goals"
+
+
+class VersionTracker:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._versions: dict[Hashable, int] = {}
+
+    def version(self, scope: Hashable) -> int:
+        return self._versions.get(scope, 0)
+
+    def bump(self, *scopes: Hashable) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def goal_changed(self, goal_ids: Iterable[int]) -> None:
+        """Record writes to `goal_ids` (their rows or their tasks)."""
+        scopes = [("goal", goal_id) for goal_id in set(goal_ids)]
+        if scopes:
+            self.bump(GOALS, *scopes)
+
+    def goal_version(self, goal_id: int | None) -> int:
+        """Version of one goal, or of the whole collection when `goal_id` is None."""
+        return self.version(GOALS if goal_id is None else ("goal", goal_id))
+
+
+def make_etag(*parts: Any) -> Optional[str]:
+    """
+    Strong ETag for the representation identified by `parts` (versions and
+    query params), or None when ETags are disabled.
+    """
+    if not TASKPILOT_ETAGS:
+        return None
+    raw = "|".join(map(str, (BOOT_EPOCH, *parts)))
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
+
+
+# The app-wide tracker.
+versions = VersionTracker()
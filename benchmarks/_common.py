@@ -0,0 +1,59 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run from the repository root (`python benchmarks/<name>.py`) and
+import the backend the same way Alembic's env.py does: by putting `backend/`
+on sys.path so `app` is importable. The repository root goes on the path
+too, for the `cli` package.
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+BACKEND_DIR = ROOT_DIR / "backend"
+sys.path.append(str(BACKEND_DIR))
+sys.path.append(str(ROOT_DIR))
+
+DEFAULT_DB_URL = "sqlite+aiosqlite:///bench.sqlite3"
+
+
+async def make_async_engine(url: str):
+    """Create an async engine and a fresh schema on it."""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app import models  # noqa: F401  # registers the ORM models on Base
+    from app.database import Base
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    return engine
+
+
+async def rate(fn: Callable[[], Awaitable[None]], *, min_seconds: float = 1.0) -> float:
+    """Await `fn` repeatedly for at least `min_seconds`; return calls per second."""
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_seconds:
+        await fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """p50/p95/p99 of `samples` (seconds), reported in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
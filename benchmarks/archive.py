@@ -0,0 +1,164 @@
+"""
+/status latency against total history, with and without archival.
+
+    python benchmarks/archive.py [--url sqlite+aiosqlite:///archive.sqlite3]
+                                 [--history 0,10000,50000] [--live 200]
+                                 [--tasks-per-goal 5] [--requests 5]
+
+For each --history size, the database is re-seeded with --live in-progress
+goals plus --history goals that were completed 90 days ago, each with
+--tasks-per-goal tasks. The script times GET /api/v1/status (every goal)
+and GET /api/v1/status?limit=100 in-process, reporting the median of
+--requests calls. It then runs the archiver (`ArchiveWorker.run_once`)
+and times both again. Before archiving, the unpaginated read grows with
+the history; after archiving, it only depends on --live. The archiver's
+own run time and one `restore_goal` are reported too.
+
+It also checks that search finds the restored goal. The goal was archived
+before the in-process search index was first built, so the index has to
+pick it up on restore rather than when it catches up on new ids.
+
+The database at --url is dropped and re-seeded; like asgi_suite.py, any
+URL other than SQLite also needs --reset-db.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///archive.sqlite3")
+    parser.add_argument("--reset-db", action="store_true")
+    parser.add_argument("--history", default="0,10000,50000")
+    parser.add_argument("--live", type=int, default=200)
+    parser.add_argument("--tasks-per-goal", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5)
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+if not ARGS.url.startswith("sqlite") and not ARGS.reset_db:
+    sys.exit("Refusing to drop and re-seed a non-SQLite database without --reset-db")
+
+# database.py reads DATABASE_URL at import time, so set it before the app loads.
+os.environ["DATABASE_URL"] = ARGS.url
+# The benchmark runs the archiver itself.
+os.environ["ARCHIVE_INTERVAL"] = "0"
+
+import httpx  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.database import AsyncSessionLocal, Base, async_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.agent import Goal, Task  # noqa: E402
+from app.services.archive import ArchiveWorker, restore_goal  # noqa: E402
+from app.services.search import search_index  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+SEED_CHUNK = 5000
+
+
+async def seed(history: int, live: int, tasks_per_goal: int) -> None:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    now = datetime.utcnow()
+    old = now - timedelta(days=90)
+    goals = [
+        {
+            "id": i + 1,
+            "goal": f"Goal {i}",
+            "status": "completed" if i < history else "in_progress",
+            "created_at": (old if i < history else now) + timedelta(seconds=i),
+            "updated_at": old if i < history else now,
+            "completed_tasks": tasks_per_goal if i < history else 0,
+            "pending_tasks": 0 if i < history else tasks_per_goal,
+        }
+        for i in range(history + live)
+    ]
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(goals), SEED_CHUNK):
+            chunk = goals[start : start + SEED_CHUNK]
+            await db.execute(insert(Goal), chunk)
+            await db.execute(
+                insert(Task),
+                [
+                    {
+                        "goal_id": g["id"],
+                        "title": f"Task {j}",
+                        "status": "completed" if g["status"] == "completed" else "pending",
+                    }
+                    for g in chunk
+                    for j in range(tasks_per_goal)
+                ],
+            )
+        await db.commit()
+
+
+async def median_ms(client, params: dict) -> float:
+    times = []
+    for _ in range(ARGS.requests):
+        t0 = time.perf_counter()
+        resp = await client.get("/api/v1/status", params=params)
+        times.append(time.perf_counter() - t0)
+        resp.raise_for_status()
+    return statistics.median(times) * 1000
+
+
+async def search_ids(client, query: str) -> set:
+    resp = await client.get("/api/v1/search", params={"q": query, "limit": 100})
+    resp.raise_for_status()
+    return {(hit["kind"], hit["id"]) for hit in resp.json()["results"]}
+
+
+async def main() -> None:
+    print(
+        f"{'history':>8} {'all ms':>9} {'limit ms':>9} {'archive s':>10} "
+        f"{'all ms':>9} {'limit ms':>9} {'restore ms':>11}"
+    )
+    print(f"{'':>8} {'before archiving':>19} {'':>10} {'after archiving':>19}")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://archive"
+    ) as client:
+        for history in (int(h) for h in ARGS.history.split(",")):
+            await seed(history, ARGS.live, ARGS.tasks_per_goal)
+            # Ids start over with every re-seed, so the index must too.
+            search_index.__init__()
+            before_all = await median_ms(client, {})
+            before_page = await median_ms(client, {"limit": 100})
+
+            t0 = time.perf_counter()
+            moved = await ArchiveWorker(after_days=30).run_once()
+            archive_s = time.perf_counter() - t0
+            assert moved == history, (moved, history)
+
+            after_all = await median_ms(client, {})
+            after_page = await median_ms(client, {"limit": 100})
+
+            restore_ms = float("nan")
+            if history:
+                # Goal 1 ("Goal 0") is archived; build the index without it.
+                assert not await search_ids(client, "Goal 0")
+                t0 = time.perf_counter()
+                async with AsyncSessionLocal() as db:
+                    assert await restore_goal(db, 1)
+                restore_ms = (time.perf_counter() - t0) * 1000
+                found = await search_ids(client, "Goal 0")
+                assert ("goal", 1) in found, found
+            print(
+                f"{history:>8} {before_all:>9.1f} {before_page:>9.1f} {archive_s:>10.2f} "
+                f"{after_all:>9.1f} {after_page:>9.1f} {restore_ms:>11.1f}"
+            )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Throughput of PATCH /api/v1/tasks/update-status/batch at batch sizes 1, 100 and 10k.
+
+    python benchmarks/batch_status.py [--url sqlite+aiosqlite:///bench.sqlite3]
+                                      [--goals 1000] [--tasks-per-goal 10]
+                                      [--seconds 3]
+
+Seeds --goals x --tasks-per-goal tasks, then sends batches in-process
+(httpx ASGITransport) for about --seconds per size. Each batch flips its
+tasks between pending and completed, so every item really is an update.
+At the end it checks that the goal progress counters have not drifted.
+"""
+import argparse
+import asyncio
+import time
+
+from _common import DEFAULT_DB_URL, make_async_engine, percentiles
+from fast_responses import seed
+
+import httpx
+from app.database import get_async_db
+from app.main import app
+from app.services import progress
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+BATCH_SIZES = (1, 100, 10_000)
+
+
+async def run_benchmark(url: str, goals: int, tasks_per_goal: int, seconds: float) -> None:
+    engine = await make_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    await seed(session_factory, goals, tasks_per_goal)
+    total_tasks = goals * tasks_per_goal
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    transport = httpx.ASGITransport(app=app)
+    print(f"{'batch':>6} {'batches':>8} {'p50 ms':>9} {'p99 ms':>9} {'items/s':>10}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for size in BATCH_SIZES:
+            size = min(size, total_tasks)
+            samples = []
+            offset = 0
+            flip = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds or len(samples) < 3:
+                if offset + size > total_tasks:
+                    offset = 0
+                    flip ^= 1
+                status = "completed" if flip == 0 else "pending"
+                body = {
+                    "updates": [
+                        {"task_id": task_id, "status": status}
+                        for task_id in range(offset + 1, offset + size + 1)
+                    ]
+                }
+                offset += size
+                t0 = time.perf_counter()
+                resp = await client.patch("/api/v1/tasks/update-status/batch", json=body)
+                samples.append(time.perf_counter() - t0)
+                resp.raise_for_status()
+            p = percentiles(samples)
+            items_per_s = size * len(samples) / sum(samples)
+            print(
+                f"{size:>6} {len(samples):>8} {p['p50_ms']:>9.2f} "
+                f"{p['p99_ms']:>9.2f} {items_per_s:>10.0f}"
+            )
+
+    async with session_factory() as db:
+        drifted = await progress.find_drift(db)
+    print("progress counters drifted:", len(drifted))
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--goals", type=int, default=1000)
+    parser.add_argument("--tasks-per-goal", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+    asyncio.run(
+        run_benchmark(args.url, args.goals, args.tasks_per_goal, args.seconds)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Throughput of `taskpilot plan --from-file` by concurrency level.
+
+    python benchmarks/cli_bulk_plan.py [--goals 200] [--latency-ms 50]
+                                       [--fail-every 10]
+
+Points the bulk planner (cli/bulk.py) at a stub /api/v1/plan on a
+background thread. The stub waits --latency-ms per request, standing in
+for the backend's planning and DB work. Every --fail-every-th request
+gets a 503 or a 429 with Retry-After: 0, so the retry path is exercised.
+Every goal must end up planned, at every concurrency level.
+"""
+import argparse
+import asyncio
+import itertools
+import threading
+import time
+
+import _common  # noqa: F401  # puts the repo root on sys.path
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from cli.bulk import BulkSummary, plan_goals
+
+CONCURRENCY_LEVELS = (1, 4, 8, 16, 32)
+
+
+def build_app(latency: float, fail_every: int) -> Starlette:
+    counter = itertools.count(1)
+    goal_ids = itertools.count(1)
+
+    async def plan(request: Request) -> JSONResponse:
+        body = await request.json()
+        await asyncio.sleep(latency)
+        n = next(counter)
+        if fail_every and n % fail_every == 0:
+            if n % (2 * fail_every) == 0:
+                return JSONResponse({"detail": "slow down"}, 429, {"Retry-After": "0"})
+            return JSONResponse({"detail": "unavailable"}, 503)
+        return JSONResponse({"goal_id": next(goal_ids), "goal": body["goal"], "milestones": []})
+
+    return Starlette(routes=[Route("/api/v1/plan", plan, methods=["POST"])])
+
+
+class StubBackend:
+    def __init__(self, app: Starlette) -> None:
+        config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubBackend":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--fail-every", type=int, default=10)
+    args = parser.parse_args()
+
+    goals = [f"Goal {i}" for i in range(args.goals)]
+    app = build_app(args.latency_ms / 1000, args.fail_every)
+    print(f"{'concurrency':>11} {'goals/s':>8} {'retried':>8} {'failed':>7}")
+    with StubBackend(app) as backend:
+        for concurrency in CONCURRENCY_LEVELS:
+            summary = BulkSummary()
+            results = list(
+                plan_goals(
+                    f"{backend.url}/api/v1/plan",
+                    goals,
+                    concurrency=concurrency,
+                    retries=3,
+                    summary=summary,
+                )
+            )
+            assert len(results) == len(goals)
+            print(
+                f"{concurrency:>11} {summary.goals_per_second:>8.1f} "
+                f"{summary.retried:>8} {summary.failed:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+CLI request cost: one-off requests vs the shared session and ETag cache.
+
+    python benchmarks/cli_client.py [--url sqlite+aiosqlite:///bench.sqlite3]
+                                    [--goals 200]
+
+Starts the backend on a background thread (lifespan off, bound to --url).
+It creates --goals plans, then fetches /status?goal_id=N for every goal
+in three ways, the way a script looping over the CLI would:
+
+- `requests.get` per call, which opens a new connection every time;
+- the CLI's shared keep-alive session;
+- the CLI's cached_get with a warm cache, so every call is a 304.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# ETags are opt-in (app/services/versions.py); turn them on before the app loads.
+os.environ.setdefault("TASKPILOT_ETAGS", "true")
+
+from _common import DEFAULT_DB_URL, make_async_engine  # noqa: E402
+
+import requests  # noqa: E402
+import uvicorn  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+import app.database as database  # noqa: E402
+from app.main import app  # noqa: E402
+from cli.client import ResponseCache, cached_get, get_session  # noqa: E402
+
+
+class Backend:
+    def __init__(self) -> None:
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=0, log_level="warning", lifespan="off"
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "Backend":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def timed(label: str, calls: int, fn) -> None:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / calls * 1000:>8.2f} ms/call {calls / elapsed:>8.0f} calls/s")
+
+
+def run_benchmark(url: str, goals: int) -> None:
+    async def create_schema() -> None:
+        await (await make_async_engine(url)).dispose()
+
+    asyncio.run(create_schema())
+    database.AsyncSessionLocal.configure(bind=create_async_engine(url))
+
+    cache_dir = Path(tempfile.mkdtemp(prefix="taskpilot-cache-"))
+    cache = ResponseCache(cache_dir, max_entries=goals * 2)
+    try:
+        with Backend() as backend:
+            status_url = f"{backend.url}/api/v1/status"
+            session = get_session()
+            for i in range(goals):
+                session.post(f"{backend.url}/api/v1/plan", json={"goal": f"Goal {i}"})
+            goal_ids = [g["id"] for g in session.get(status_url).json()["goals"]]
+
+            def one_off(i):
+                requests.get(status_url, params={"goal_id": goal_ids[i]}, timeout=30)
+
+            def shared(i):
+                session.get(status_url, params={"goal_id": goal_ids[i]}, timeout=30)
+
+            def revalidated(i):
+                response = cached_get(status_url, {"goal_id": goal_ids[i]}, cache=cache)
+                assert response.from_cache
+
+            timed("requests.get per call", len(goal_ids), one_off)
+            timed("shared session", len(goal_ids), shared)
+            for i in range(len(goal_ids)):  # warm the cache
+                cached_get(status_url, {"goal_id": goal_ids[i]}, cache=cache)
+            timed("session + ETag cache (304)", len(goal_ids), revalidated)
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--goals", type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.url, args.goals)
+
+
+if __name__ == "__main__":
+    main()
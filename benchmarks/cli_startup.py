@@ -0,0 +1,98 @@
+"""
+CLI cold-start budget check.
+
+    python benchmarks/cli_startup.py [--budget-ms MS] [--runs 9]
+
+Runs `taskpilot --help`, `taskpilot status --help` and `taskpilot health`
+in fresh interpreters under `python -X importtime`. After one untimed
+warm-up run per command (cold disk cache, .pyc writes), it reports the
+median time spent importing modules (interpreter startup excluded) and
+the median wall time over --runs runs. It exits non-zero if any median
+is over that command's budget, or if a light command loads a module it
+must not (requests, rich). `health` is expected to fail when no backend
+is running; only its startup is measured.
+
+The help commands get 100 ms. `health` also loads http.client, which
+alone costs 20-40 ms on a quiet machine, so it gets 150 ms; a tighter
+budget made the check fail on noise. --budget-ms overrides every
+command's budget.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from _common import ROOT_DIR
+
+# label -> (arguments, import budget in ms)
+COMMANDS = {
+    "--help": (["--help"], 100),
+    "status --help": (["status", "--help"], 100),
+    "health": (["health"], 150),
+}
+FORBIDDEN = ("requests", "rich")
+
+LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(args: list[str]) -> tuple[float, float, set[str]]:
+    """(import ms, wall ms, modules loaded) for one cold run."""
+    env = dict(os.environ, TASKPILOT_CACHE_DIR="")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "cli.taskpilot_cli", *args],
+        cwd=ROOT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    wall = (time.perf_counter() - start) * 1000
+    total_us = 0
+    modules = set()
+    for match in LINE.finditer(proc.stderr):
+        cumulative, indent, name = match.groups()
+        modules.add(name)
+        # Top-level imports only (their cumulative time includes children);
+        # `site` and its children are interpreter startup, not the CLI.
+        if indent == " " and name != "site":
+            total_us += int(cumulative)
+    return total_us / 1000, wall, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--runs", type=int, default=9)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'command':<16} {'imports ms':>10} {'wall ms':>8}  result")
+    for label, (argv, budget_ms) in COMMANDS.items():
+        if args.budget_ms is not None:
+            budget_ms = args.budget_ms
+        import_profile(argv)
+        runs = [import_profile(argv) for _ in range(args.runs)]
+        imports_ms = statistics.median(r[0] for r in runs)
+        wall_ms = statistics.median(r[1] for r in runs)
+        loaded = set().union(*(r[2] for r in runs))
+        leaked = sorted(
+            m for m in loaded if m.split(".")[0] in FORBIDDEN
+        )
+        problems = []
+        if imports_ms > budget_ms:
+            problems.append(f"over budget ({budget_ms:.0f} ms)")
+        if leaked:
+            problems.append("loaded " + ", ".join(sorted({m.split('.')[0] for m in leaked})))
+        failed |= bool(problems)
+        result = "FAIL: " + "; ".join(problems) if problems else "PASS"
+        print(f"{label:<16} {imports_ms:>10.1f} {wall_ms:>8.1f}  {result}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
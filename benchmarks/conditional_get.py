@@ -0,0 +1,81 @@
+"""
+Polling cost of GET /api/v1/status and /api/v1/tasks/: full 200 vs 304.
+
+    python benchmarks/conditional_get.py [--url sqlite+aiosqlite:///bench.sqlite3]
+                                         [--goals 1000] [--tasks-per-goal 10]
+                                         [--requests 30]
+
+Seeds the database (and the in-memory task store) and then polls each
+endpoint in-process. It polls once without a validator and once with
+If-None-Match set to the ETag it got back. The second run should be
+answered from the version counters without a query.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+# ETags are opt-in (app/services/versions.py); turn them on before the app loads.
+os.environ.setdefault("TASKPILOT_ETAGS", "true")
+
+from _common import DEFAULT_DB_URL, make_async_engine, percentiles  # noqa: E402
+from fast_responses import seed  # noqa: E402
+
+import httpx  # noqa: E402
+from app.database import get_async_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.routes.tasks import TASK_STORE  # noqa: E402
+from app.schemas.planning import Task  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker  # noqa: E402
+
+
+async def run_benchmark(url: str, goals: int, tasks_per_goal: int, requests: int) -> None:
+    engine = await make_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    await seed(session_factory, goals, tasks_per_goal)
+    TASK_STORE.clear()
+    TASK_STORE.put_many(
+        Task(id=str(i), title=f"Task {i}", status="pending")
+        for i in range(goals * tasks_per_goal)
+    )
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    transport = httpx.ASGITransport(app=app)
+    print(f"{'endpoint':<16} {'request':<14} {'status':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ("/api/v1/status", "/api/v1/tasks/"):
+            etag = (await client.get(path)).headers["etag"]
+            for label, headers in (("unconditional", {}), ("If-None-Match", {"If-None-Match": etag})):
+                samples = []
+                for _ in range(requests):
+                    t0 = time.perf_counter()
+                    resp = await client.get(path, headers=headers)
+                    samples.append(time.perf_counter() - t0)
+                p = percentiles(samples)
+                print(
+                    f"{path:<16} {label:<14} {resp.status_code:>6} "
+                    f"{p['p50_ms']:>8.2f} {p['p99_ms']:>8.2f}"
+                )
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--goals", type=int, default=1000)
+    parser.add_argument("--tasks-per-goal", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(
+        run_benchmark(args.url, args.goals, args.tasks_per_goal, args.requests)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Fan-out cost of the in-process change feed.
+
+    python benchmarks/event_bus.py [--events 10000]
+
+For each subscriber count, one consumer task per subscriber drains its
+queue while --events events are published. The script reports the
+publish cost per event and the end-to-end delivery rate. It also checks
+that every subscriber received every event, in order.
+"""
+import argparse
+import asyncio
+import time
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.services.events import EventBus
+
+SUBSCRIBER_COUNTS = (1, 10, 100, 1000)
+
+
+async def run_benchmark(events: int) -> None:
+    print(f"{'subs':>5} {'publish us/event':>17} {'deliveries/s':>13} {'in order':>9}")
+    for subs in SUBSCRIBER_COUNTS:
+        bus = EventBus(history=events, subscriber_buffer=events)
+        received = [[] for _ in range(subs)]
+
+        async def consume(sub, out):
+            async for event in sub.events(heartbeat=5):
+                out.append(event.seq)
+                if len(out) == events:
+                    return
+
+        consumers = [
+            asyncio.create_task(consume(bus.subscribe(), out)) for out in received
+        ]
+        publish_time = 0.0
+        start = time.perf_counter()
+        for i in range(events):
+            t0 = time.perf_counter()
+            bus.publish("tasks.status", {"goal_id": i % 100, "changes": []})
+            publish_time += time.perf_counter() - t0
+            if i % 100 == 0:
+                await asyncio.sleep(0)  # let consumers run, as a server would
+        await asyncio.gather(*consumers)
+        elapsed = time.perf_counter() - start
+
+        in_order = all(out == list(range(1, events + 1)) for out in received)
+        print(
+            f"{subs:>5} {publish_time / events * 1e6:>17.2f} "
+            f"{subs * events / elapsed:>13.0f} {str(in_order):>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.events))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Agent execution throughput vs worker count, and submit latency under load.
+
+    python benchmarks/executions.py [--url sqlite+aiosqlite:///bench.sqlite3]
+                                    [--jobs 400] [--agent-ms 50]
+
+Each job runs a stand-in agent that awaits for --agent-ms (an I/O-bound
+agent such as a Kestra call). Throughput should scale with the number of
+workers while submit latency (what a request to /agent/execute pays)
+stays flat.
+"""
+import argparse
+import asyncio
+import time
+
+from _common import DEFAULT_DB_URL, make_async_engine, percentiles
+
+from app.services.executions import ExecutionEngine, QueueFull
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+WORKER_COUNTS = (1, 2, 4, 8, 16, 32)
+
+
+async def run_benchmark(url: str, jobs: int, agent_ms: float) -> None:
+    engine = await make_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def agent(job):
+        await asyncio.sleep(agent_ms / 1000)
+        return {"ok": True}
+
+    print(f"{'workers':>7} {'jobs/s':>8} {'submit p50 ms':>14} {'submit p99 ms':>14}")
+    for workers in WORKER_COUNTS:
+        executions = ExecutionEngine(
+            agent, workers=workers, queue_size=jobs, session_factory=session_factory
+        )
+        await executions.start()
+
+        submit_times = []
+        start = time.perf_counter()
+        for i in range(jobs):
+            t0 = time.perf_counter()
+            await executions.submit(f"job {i}")
+            submit_times.append(time.perf_counter() - t0)
+        await executions.drain()
+        elapsed = time.perf_counter() - start
+        await executions.stop()
+
+        p = percentiles(submit_times)
+        print(
+            f"{workers:>7} {jobs / elapsed:>8.1f} {p['p50_ms']:>14.2f} {p['p99_ms']:>14.2f}"
+        )
+
+    # Backpressure: a queue of 10 with no free worker rejects the 11th submit.
+    executions = ExecutionEngine(
+        agent, workers=0, queue_size=10, session_factory=session_factory
+    )
+    await executions.start()
+    accepted = 0
+    try:
+        for i in range(11):
+            await executions.submit(f"job {i}")
+            accepted += 1
+    except QueueFull:
+        pass
+    print(f"queue_size=10: accepted {accepted}, then QueueFull (HTTP 429)")
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--agent-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.url, args.jobs, args.agent_ms))
+
+
+if __name__ == "__main__":
+    main()
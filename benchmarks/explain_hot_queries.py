@@ -0,0 +1,131 @@
+"""
+Check that the /status and summary queries are served by indexes, not seq scans.
+
+    python benchmarks/explain_hot_queries.py --url postgresql+psycopg://... [--tasks 1000000]
+
+Recreates the schema on the given (scratch!) Postgres database, seeds it
+with `--tasks` tasks spread over goals of six tasks each, runs EXPLAIN on
+the statements the API issues and exits non-zero if any of them falls
+back to a sequential scan of goals or tasks.
+"""
+import argparse
+import json
+import sys
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.database import Base
+from app.models.agent import Goal, Task
+from sqlalchemy import create_engine, func, select, text, tuple_
+
+INDEX_NODES = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+HOT_TABLES = {"goals", "tasks"}
+
+SEED_GOALS = """
+INSERT INTO goals (goal, status, created_at, updated_at)
+SELECT 'Goal ' || g,
+       (ARRAY['in_progress', 'completed', 'abandoned'])[1 + g % 3]::goal_status,
+       now() - g * interval '1 second',
+       now()
+FROM generate_series(1, :goals) AS g
+"""
+
+SEED_TASKS = """
+INSERT INTO tasks (goal_id, title, status)
+SELECT 1 + t % :goals,
+       'Task ' || t,
+       (ARRAY['pending', 'in_progress', 'completed', 'missed'])[1 + t % 4]::task_status
+FROM generate_series(1, :tasks) AS t
+"""
+
+
+def seed(engine, task_count: int) -> int:
+    goal_count = max(task_count // 6, 1)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(SEED_GOALS), {"goals": goal_count})
+        conn.execute(text(SEED_TASKS), {"goals": goal_count, "tasks": task_count})
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE goals"))
+        conn.execute(text("VACUUM ANALYZE tasks"))
+    return goal_count
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(conn, stmt) -> list[dict]:
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    row = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar_one()
+    doc = row if isinstance(row, list) else json.loads(row)
+    return list(plan_nodes(doc[0]["Plan"]))
+
+
+def hot_queries(conn, goal_count: int) -> dict:
+    page = (
+        select(Goal)
+        .order_by(Goal.created_at.desc(), Goal.id.desc())
+        .limit(51)
+    )
+    middle = conn.execute(
+        select(Goal.created_at, Goal.id)
+        .order_by(Goal.created_at.desc(), Goal.id.desc())
+        .offset(goal_count // 2)
+        .limit(1)
+    ).one()
+    page_ids = list(range(1, 51))
+
+    return {
+        "status: first page": page,
+        "status: keyset page": page.where(
+            tuple_(Goal.created_at, Goal.id) < tuple(middle)
+        ),
+        "status: single goal": select(Goal).where(Goal.id == goal_count // 2),
+        "status: tasks of page": select(Task)
+        .where(Task.goal_id.in_(page_ids))
+        .order_by(Task.goal_id, Task.id),
+        "summary: counts by status": select(Task.status, func.count())
+        .where(Task.goal_id == goal_count // 2)
+        .group_by(Task.status),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", required=True, help="Scratch Postgres database URL")
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    goal_count = seed(engine, args.tasks)
+    print(f"Seeded {goal_count} goals / {args.tasks} tasks")
+
+    failures = 0
+    with engine.connect() as conn:
+        for name, stmt in hot_queries(conn, goal_count).items():
+            nodes = explain(conn, stmt)
+            seq_scans = [
+                n["Relation Name"]
+                for n in nodes
+                if n["Node Type"] == "Seq Scan" and n.get("Relation Name") in HOT_TABLES
+            ]
+            indexes = sorted({n["Index Name"] for n in nodes if n["Node Type"] in INDEX_NODES})
+
+            ok = not seq_scans and bool(indexes)
+            failures += not ok
+            detail = f"seq scan on {', '.join(seq_scans)}" if seq_scans else ", ".join(indexes)
+            print(f"{'PASS' if ok else 'FAIL'}  {name:<28} {detail or 'no index used'}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
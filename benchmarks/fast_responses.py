@@ -0,0 +1,104 @@
+"""
+GET /api/v1/status latency with and without TASKPILOT_FAST_RESPONSES.
+
+    python benchmarks/fast_responses.py [--url sqlite+aiosqlite:///bench.sqlite3]
+                                        [--goals 1000] [--tasks-per-goal 10]
+                                        [--requests 30]
+
+Seeds --goals goals with --tasks-per-goal tasks each, then calls the app
+in-process (httpx ASGITransport, no network) with the flag off and on.
+Both modes must return identical JSON; the difference is the cost of
+FastAPI's response_model re-validation, jsonable_encoder and json.dumps.
+"""
+import argparse
+import asyncio
+import time
+
+from _common import DEFAULT_DB_URL, make_async_engine, percentiles
+
+import httpx
+from app import responses
+from app.database import get_async_db
+from app.main import app
+from app.models.agent import Goal, Task
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+
+async def seed(session_factory, goals: int, tasks_per_goal: int) -> None:
+    async with session_factory() as db:
+        goal_ids = (
+            await db.scalars(
+                insert(Goal).returning(Goal.id),
+                [
+                    {
+                        "goal": f"Goal {i}",
+                        "status": "in_progress",
+                        "pending_tasks": tasks_per_goal,
+                    }
+                    for i in range(goals)
+                ],
+            )
+        ).all()
+        await db.execute(
+            insert(Task),
+            [
+                {"goal_id": goal_id, "title": f"Task {j}", "status": "pending"}
+                for goal_id in goal_ids
+                for j in range(tasks_per_goal)
+            ],
+        )
+        await db.commit()
+
+
+async def run_benchmark(url: str, goals: int, tasks_per_goal: int, requests: int) -> None:
+    engine = await make_async_engine(url)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    await seed(session_factory, goals, tasks_per_goal)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    transport = httpx.ASGITransport(app=app)
+    bodies = {}
+    print(f"/api/v1/status with {goals * tasks_per_goal} tasks over {goals} goals")
+    print(f"{'mode':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'bytes':>9}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for fast in (False, True):
+            responses.FAST_RESPONSES = fast
+            await client.get("/api/v1/status")  # warm up
+            samples = []
+            for _ in range(requests):
+                t0 = time.perf_counter()
+                resp = await client.get("/api/v1/status")
+                samples.append(time.perf_counter() - t0)
+                resp.raise_for_status()
+            bodies[fast] = resp.json()
+            p = percentiles(samples)
+            mode = "fast" if fast else "default"
+            print(
+                f"{mode:>8} {p['p50_ms']:>8.1f} {p['p95_ms']:>8.1f} "
+                f"{p['p99_ms']:>8.1f} {len(resp.content):>9}"
+            )
+
+    print("identical JSON:", bodies[False] == bodies[True])
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--goals", type=int, default=1000)
+    parser.add_argument("--tasks-per-goal", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(
+        run_benchmark(args.url, args.goals, args.tasks_per_goal, args.requests)
+    )
+
+
+if __name__ == "__main__":
+    main()
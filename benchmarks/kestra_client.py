@@ -0,0 +1,192 @@
+"""
+Exercise the shared Kestra client against the local stub Kestra server.
+
+    python benchmarks/kestra_client.py [--calls 200]
+
+Compares trigger latency and connections opened for a client-per-request
+(the old automation route) against the pooled client, then checks the
+retry, circuit-breaker and trigger-coalescing behaviour. Exits non-zero if
+a check fails.
+"""
+import argparse
+import asyncio
+import socket
+import sys
+import time
+
+import httpx
+from _common import percentiles
+from kestra_stub import StubKestra
+
+from app.services.kestra import (
+    CircuitBreaker,
+    ExecutionDeduper,
+    KestraClient,
+    KestraError,
+    KestraUnavailable,
+)
+
+INPUTS = {"goal": "Daily review", "source": "backend", "reason": "daily-review"}
+FLOW_PATH = "/api/v1/main/executions/main/taskpilot_ai_agent"
+
+failures = 0
+
+
+def check(name: str, ok: bool, detail: str = "") -> None:
+    global failures
+    failures += not ok
+    print(f"{'PASS' if ok else 'FAIL'}  {name}{'  (' + detail + ')' if detail else ''}")
+
+
+def make_client(url: str, **kwargs) -> KestraClient:
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("backoff_max", 0.05)
+    return KestraClient(url, tenant="main", username="u", password="p", **kwargs)
+
+
+async def latency(stub: StubKestra, calls: int) -> None:
+    stub.state.peers.clear()
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=20) as client:
+            resp = await client.post(
+                stub.url + FLOW_PATH,
+                auth=("u", "p"),
+                files={k: (None, v) for k, v in INPUTS.items()},
+            )
+            resp.json()
+        samples.append(time.perf_counter() - start)
+    per_request = percentiles(samples)
+    per_request_peers = len(stub.state.peers)
+
+    stub.state.peers.clear()
+    client = make_client(stub.url)
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await client.trigger_execution("main", "taskpilot_ai_agent", INPUTS)
+        samples.append(time.perf_counter() - start)
+    await client.close()
+    pooled = percentiles(samples)
+
+    print(f"{'client':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'connections':>12}")
+    for name, p, peers in (
+        ("per-request", per_request, per_request_peers),
+        ("pooled", pooled, len(stub.state.peers)),
+    ):
+        print(
+            f"{name:>12} {p['p50_ms']:>8.2f} {p['p95_ms']:>8.2f} {p['p99_ms']:>8.2f} "
+            f"{peers:>12}"
+        )
+    check("pooled client reuses one connection", len(stub.state.peers) == 1)
+
+
+async def retries(stub: StubKestra) -> None:
+    client = make_client(stub.url, retries=3)
+    execution = await client.trigger_execution("main", "taskpilot_ai_agent", INPUTS)
+
+    stub.state.requests = 0
+    stub.state.fail_next = 2
+    resp = await client.request("GET", f"/api/v1/main/executions/{execution['id']}")
+    check(
+        "GET retried through two 503s",
+        resp.status_code == 200 and stub.state.requests == 3,
+        f"{stub.state.requests} requests",
+    )
+
+    stub.state.requests = 0
+    stub.state.fail_next = 1
+    try:
+        await client.trigger_execution("main", "taskpilot_ai_agent", INPUTS)
+        raised = False
+    except KestraError:
+        raised = True
+    check(
+        "POST not retried after a 503",
+        raised and stub.state.requests == 1,
+        f"{stub.state.requests} requests",
+    )
+    stub.state.fail_next = 0
+    await client.close()
+
+
+async def coalescing(stub: StubKestra, callers: int = 50) -> None:
+    client = make_client(stub.url)
+    deduper = ExecutionDeduper(client, window=0.5)
+
+    stub.state.requests = 0
+    stub.state.delay = 0.1
+    results = await asyncio.gather(
+        *(deduper.trigger("main", "taskpilot_ai_agent", INPUTS) for _ in range(callers))
+    )
+    stub.state.delay = 0.0
+    ids = {execution["id"] for execution, _ in results}
+    check(
+        f"{callers} concurrent triggers share one execution",
+        stub.state.requests == 1 and len(ids) == 1,
+        f"{stub.state.requests} upstream calls",
+    )
+
+    execution, reused = await deduper.trigger("main", "taskpilot_ai_agent", INPUTS)
+    check(
+        "repeat trigger inside the window is reused",
+        reused and execution["id"] in ids and stub.state.requests == 1,
+    )
+
+    await asyncio.sleep(0.6)
+    execution, reused = await deduper.trigger("main", "taskpilot_ai_agent", INPUTS)
+    check(
+        "trigger after the window starts a new execution",
+        not reused and execution["id"] not in ids,
+    )
+    await client.close()
+
+
+async def breaker() -> None:
+    # A port nobody listens on: every attempt is a connect failure.
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+    client = make_client(
+        dead_url, retries=1, breaker=CircuitBreaker(failure_threshold=4, reset_timeout=60)
+    )
+    for _ in range(2):
+        try:
+            await client.trigger_execution("main", "taskpilot_ai_agent", INPUTS)
+        except KestraUnavailable:
+            break
+        except KestraError:
+            pass
+    check("breaker opens after repeated failures", client.breaker.state == "open")
+
+    start = time.perf_counter()
+    try:
+        await client.trigger_execution("main", "taskpilot_ai_agent", INPUTS)
+        fast_failed = False
+    except KestraUnavailable:
+        fast_failed = True
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    check("open breaker fails fast", fast_failed and elapsed_ms < 5, f"{elapsed_ms:.3f} ms")
+    await client.close()
+
+
+async def run(calls: int) -> None:
+    with StubKestra() as stub:
+        await latency(stub, calls)
+        await retries(stub)
+        await coalescing(stub)
+    await breaker()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
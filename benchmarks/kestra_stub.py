@@ -0,0 +1,112 @@
+"""
+A tiny stand-in for the Kestra executions API.
+
+    python benchmarks/kestra_stub.py [--port 8081]
+
+then run the backend with KESTRA_BASE_URL=http://127.0.0.1:8081 and any
+KESTRA_USERNAME/KESTRA_PASSWORD. Also used in-process by
+benchmarks/kestra_client.py, which scripts failures through `StubState`.
+"""
+import argparse
+import asyncio
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+@dataclass
+class StubState:
+    fail_next: int = 0  # answer this many requests with `fail_status`
+    fail_status: int = 503
+    delay: float = 0.0  # seconds to sleep before answering
+    requests: int = 0
+    peers: set = field(default_factory=set)  # distinct client (host, port)s
+    executions: dict = field(default_factory=dict)
+
+
+def build_app(state: StubState) -> Starlette:
+    async def answer(request: Request, ok: dict) -> JSONResponse:
+        state.requests += 1
+        if request.client is not None:
+            state.peers.add((request.client.host, request.client.port))
+        if state.delay:
+            await asyncio.sleep(state.delay)
+        if state.fail_next > 0:
+            state.fail_next -= 1
+            return JSONResponse({"message": "stub failure"}, status_code=state.fail_status)
+        return JSONResponse(ok)
+
+    async def create_execution(request: Request) -> JSONResponse:
+        # Inputs arrive as multipart; the stub doesn't need them parsed.
+        await request.body()
+        execution = {
+            "id": uuid.uuid4().hex[:22],
+            "namespace": request.path_params["namespace"],
+            "flowId": request.path_params["flow_id"],
+            "state": {"current": "CREATED"},
+        }
+        state.executions[execution["id"]] = execution
+        return await answer(request, execution)
+
+    async def get_execution(request: Request) -> JSONResponse:
+        execution = state.executions.get(request.path_params["execution_id"])
+        if execution is None:
+            return JSONResponse({"message": "not found"}, status_code=404)
+        return await answer(request, execution)
+
+    return Starlette(
+        routes=[
+            Route(
+                "/api/v1/{tenant}/executions/{namespace}/{flow_id}",
+                create_execution,
+                methods=["POST"],
+            ),
+            Route(
+                "/api/v1/{tenant}/executions/{execution_id}",
+                get_execution,
+                methods=["GET"],
+            ),
+        ]
+    )
+
+
+class StubKestra:
+    """Runs the stub on a background thread: `with StubKestra() as stub: ...`."""
+
+    def __init__(self, port: int = 0) -> None:
+        self.state = StubState()
+        config = uvicorn.Config(
+            build_app(self.state), host="127.0.0.1", port=port, log_level="warning"
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        sock = self.server.servers[0].sockets[0]
+        host, port = sock.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubKestra":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+    uvicorn.run(build_app(StubState()), host="127.0.0.1", port=args.port)
@@ -0,0 +1,75 @@
+"""
+Per-request cost of MetricsMiddleware, and of rendering /metrics.
+
+    python benchmarks/metrics_overhead.py [--requests 200000] [--routes 50]
+
+Calls a bare ASGI app directly, with and without the middleware, so the
+difference is the middleware alone. Routing, validation and sockets
+are not measured. --routes distinct route templates are spread over the
+requests to fill the registry the way a real app would. The script then
+times one render of the full registry.
+"""
+import argparse
+import asyncio
+import time
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.metrics import MetricsMiddleware, registry
+
+
+class FakeRoute:
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+
+async def endpoint(scope, receive, send) -> None:
+    scope["route"] = scope["_bench_route"]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message) -> None:
+    return None
+
+
+async def time_app(app, requests: int, routes: list) -> float:
+    """Mean seconds per request."""
+    start = time.perf_counter()
+    for i in range(requests):
+        scope = {"type": "http", "method": "GET", "_bench_route": routes[i % len(routes)]}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+async def run_benchmark(requests: int, route_count: int) -> None:
+    routes = [FakeRoute(f"/api/v1/bench/{i}/{{item_id}}") for i in range(route_count)]
+    bare = await time_app(endpoint, requests, routes)
+    wrapped = await time_app(MetricsMiddleware(endpoint), requests, routes)
+    print(f"bare app            {bare * 1e6:8.2f} us/request")
+    print(f"with middleware     {wrapped * 1e6:8.2f} us/request")
+    print(f"middleware overhead {(wrapped - bare) * 1e6:8.2f} us/request")
+
+    start = time.perf_counter()
+    body = registry.render()
+    elapsed = time.perf_counter() - start
+    print(
+        f"render /metrics     {elapsed * 1e3:8.2f} ms "
+        f"({len(body.splitlines())} lines, {len(body) / 1024:.0f} KiB)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200_000)
+    parser.add_argument("--routes", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.requests, args.routes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Plans/sec for persisting a plan: the old per-row ORM path vs bulk INSERT ... RETURNING.
+
+    python benchmarks/plan_insert.py [--url postgresql+psycopg://...] [--seconds 2]
+
+Defaults to a throwaway SQLite file (needs aiosqlite); point --url at
+Postgres for numbers that include real network round trips.
+"""
+import argparse
+import asyncio
+
+from _common import DEFAULT_DB_URL, make_async_engine, rate
+
+from app.api.v1.routes.agent import persist_plan
+from app.api.v1.schemas.agent import MilestoneSchema, TaskSchema
+from app.models.agent import Goal, Task
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TASK_COUNTS = (6, 100, 1000)
+
+
+def build_milestones(task_count: int) -> list[MilestoneSchema]:
+    per_milestone = max(task_count // 3, 1)
+    milestones = []
+    for m in range(0, task_count, per_milestone):
+        milestones.append(
+            MilestoneSchema(
+                title=f"Milestone {m // per_milestone + 1}",
+                tasks=[
+                    TaskSchema(title=f"Task {i}")
+                    for i in range(m, min(m + per_milestone, task_count))
+                ],
+            )
+        )
+    return milestones
+
+
+async def persist_plan_legacy(
+    db: AsyncSession, goal_text: str, milestones: list[MilestoneSchema]
+) -> int:
+    """The pre-bulk implementation of POST /api/v1/plan, kept for comparison."""
+    db_goal = Goal(goal=goal_text, status="in_progress")
+    db.add(db_goal)
+    await db.commit()
+    await db.refresh(db_goal)
+
+    for m in milestones:
+        for t in m.tasks:
+            db.add(Task(goal_id=db_goal.id, title=t.title, status=t.status))
+    await db.commit()
+
+    await db.refresh(db_goal, ["tasks"])
+    db_tasks = sorted(db_goal.tasks, key=lambda t: t.id)
+    task_idx = 0
+    for m in milestones:
+        for t in m.tasks:
+            if task_idx < len(db_tasks):
+                t.id = db_tasks[task_idx].id
+                task_idx += 1
+    return db_goal.id
+
+
+async def run_benchmark(url: str, seconds: float) -> None:
+    engine = await make_async_engine(url)
+    SessionFactory = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+
+    print(f"{'tasks':>6} {'legacy plans/s':>16} {'bulk plans/s':>14} {'speedup':>8}")
+    for task_count in TASK_COUNTS:
+        results = {}
+        for name, persist in (("legacy", persist_plan_legacy), ("bulk", persist_plan)):
+
+            async def run(persist=persist):
+                async with SessionFactory() as db:
+                    await persist(db, "Benchmark goal", build_milestones(task_count))
+
+            results[name] = await rate(run, min_seconds=seconds)
+
+        print(
+            f"{task_count:>6} {results['legacy']:>16.1f} {results['bulk']:>14.1f} "
+            f"{results['bulk'] / results['legacy']:>7.2f}x"
+        )
+
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default=DEFAULT_DB_URL)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.url, args.seconds))
+
+
+if __name__ == "__main__":
+    main()
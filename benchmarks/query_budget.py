@@ -0,0 +1,171 @@
+"""
+Query budgets for the database-backed endpoints.
+
+    python benchmarks/query_budget.py [--url sqlite+aiosqlite:///query_budget.sqlite3]
+                                      [--goals 200] [--tasks-per-goal 20]
+
+Calls each endpoint in-process under `assert_max_queries`, first against a
+tiny dataset (2 goals, 2 tasks each) and then against --goals goals of
+--tasks-per-goal tasks. An endpoint fails when it runs more queries than
+its budget. It also fails when its query count grows with the data, which
+is how an N+1 loop shows up. Exits non-zero on any failure; CI runs it
+on every pull request (.github/workflows/query-budget.yml).
+
+The database at --url is dropped and re-seeded; like asgi_suite.py, any
+URL other than SQLite also needs --reset-db.
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="sqlite+aiosqlite:///query_budget.sqlite3")
+    parser.add_argument("--reset-db", action="store_true")
+    parser.add_argument("--goals", type=int, default=200)
+    parser.add_argument("--tasks-per-goal", type=int, default=20)
+    return parser.parse_args()
+
+
+ARGS = parse_args()
+if not ARGS.url.startswith("sqlite") and not ARGS.reset_db:
+    sys.exit("Refusing to drop and re-seed a non-SQLite database without --reset-db")
+
+# database.py reads DATABASE_URL at import time, so set it before the app loads.
+os.environ["DATABASE_URL"] = ARGS.url
+
+import httpx  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.database import (  # noqa: E402
+    AsyncSessionLocal,
+    Base,
+    assert_max_queries,
+    async_engine,
+)
+from app.main import app  # noqa: E402
+from app.models.agent import Goal, Task  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+
+IS_SQLITE = ARGS.url.startswith("sqlite")
+
+# name -> (budget, callable(client, goal_id, task_ids) sending one request)
+ENDPOINTS = {
+    "GET /api/v1/status?limit=100": (
+        2,
+        lambda c, goal_id, task_ids: c.get("/api/v1/status", params={"limit": 100}),
+    ),
+    "GET /api/v1/status?goal_id": (
+        2,
+        lambda c, goal_id, task_ids: c.get(
+            "/api/v1/status", params={"goal_id": goal_id}
+        ),
+    ),
+    "GET /api/v1/status?include_archived": (
+        4,
+        lambda c, goal_id, task_ids: c.get(
+            "/api/v1/status", params={"limit": 100, "include_archived": True}
+        ),
+    ),
+    "GET /api/v1/goals/{id}/summary": (
+        2,
+        lambda c, goal_id, task_ids: c.get(f"/api/v1/goals/{goal_id}/summary"),
+    ),
+    "POST /api/v1/plan": (
+        # SQLite can't batch INSERT ... RETURNING in parameter order, so
+        # it inserts the (six) plan tasks one row at a time.
+        8 if IS_SQLITE else 2,
+        lambda c, goal_id, task_ids: c.post(
+            "/api/v1/plan", json={"goal": f"Budget goal {goal_id}"}
+        ),
+    ),
+    "PATCH /api/v1/tasks/update-status/batch": (
+        4,
+        lambda c, goal_id, task_ids: c.patch(
+            "/api/v1/tasks/update-status/batch",
+            json={"updates": [{"task_id": t, "status": "completed"} for t in task_ids]},
+        ),
+    ),
+}
+
+
+async def seed(goals: int, tasks_per_goal: int) -> tuple[int, list[int]]:
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        goal_ids = (
+            await db.scalars(
+                insert(Goal).returning(Goal.id),
+                [
+                    {
+                        "goal": f"Goal {i}",
+                        "status": "in_progress",
+                        "pending_tasks": tasks_per_goal,
+                    }
+                    for i in range(goals)
+                ],
+            )
+        ).all()
+        await db.execute(
+            insert(Task),
+            [
+                {"goal_id": goal_id, "title": f"Task {j}", "status": "pending"}
+                for goal_id in goal_ids
+                for j in range(tasks_per_goal)
+            ],
+        )
+        await db.commit()
+        task_ids = (await db.scalars(select(Task.id).limit(1000))).all()
+    return goal_ids[0], list(task_ids)
+
+
+async def measure(client, goals: int, tasks_per_goal: int) -> dict:
+    """name -> (query count, error or None) for every endpoint."""
+    goal_id, task_ids = await seed(goals, tasks_per_goal)
+    counts = {}
+    for name, (budget, send) in ENDPOINTS.items():
+        error = None
+        try:
+            with assert_max_queries(budget) as stats:
+                resp = await send(client, goal_id, task_ids)
+            resp.raise_for_status()
+        except (AssertionError, httpx.HTTPStatusError) as e:
+            error = str(e)
+        counts[name] = (stats.count, error)
+    return counts
+
+
+async def main() -> int:
+    failures = 0
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://budget"
+    ) as client:
+        small = await measure(client, 2, 2)
+        large = await measure(client, ARGS.goals, ARGS.tasks_per_goal)
+
+    print(f"{'endpoint':<42} {'budget':>6} {'small':>6} {'large':>6}")
+    for name, (budget, _) in ENDPOINTS.items():
+        (small_count, small_error), (large_count, large_error) = small[name], large[name]
+        flag = ""
+        if small_error or large_error:
+            over = max(small_count, large_count) > budget
+            flag = "  OVER BUDGET" if over else "  ERROR"
+        elif large_count > small_count:
+            flag = "  GROWS WITH DATA"
+        failures += bool(flag)
+        print(f"{name:<42} {budget:>6} {small_count:>6} {large_count:>6}{flag}")
+        for error in {small_error, large_error} - {None}:
+            print(f"    {error}")
+
+    await async_engine.dispose()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,154 @@
+"""
+Incremental vs full replanning after a task is missed.
+
+    python benchmarks/replan.py [--tasks 1000,10000,50000] [--minutes-per-day 240]
+                                [--slack 0,0.1] [--misses 50]
+
+Fills a TaskStore with a plan from `schedule_tasks`: random durations
+(5-120 minutes) over 20 milestones. Each --slack fraction of the daily
+budget is held back when the plan is built; slack 0 is a tightly packed
+plan. It then marks --misses random tasks missed, one at a time:
+
+- incremental: `TaskStore.replan_missed`, which ripples the missed task
+  forward only as far as it has to;
+- full: re-run `schedule_tasks` over every pending task from the same
+  start day, then diff the result against the current plan.
+
+The script reports the mean time per miss and the mean number of tasks
+each approach moves. A full replan is sized by the plan, while an
+incremental one is sized by the change. In a plan without slack, the
+change is everything after the miss.
+
+After the misses it also counts the days booked over the daily budget
+by tasks that aren't completed, missed ones included (a day holding a
+single task doesn't count). Misses that pile onto the same day show up
+there, and the script exits non-zero if any day is over.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.schemas.planning import Task
+from app.services.scheduler import schedule_tasks
+from app.services.task_store import TaskStore
+
+MILESTONES = 20
+START = date(2030, 1, 1)
+
+
+def build_store(n: int, minutes_per_day: int, rng: random.Random) -> TaskStore:
+    durations = [rng.randint(5, 120) for _ in range(n)]
+    milestones = sorted(rng.randrange(MILESTONES) for _ in range(n))
+    schedule = schedule_tasks(durations, milestones, minutes_per_day, start=START)
+    store = TaskStore()
+    store.put_many(
+        Task(
+            id=str(i),
+            title=f"Task {i}",
+            milestone=f"Milestone {milestones[i]:02d}",
+            duration_minutes=durations[i],
+            recommended_day=schedule.days[i],
+        )
+        for i in range(n)
+    )
+    return store
+
+
+def full_replan(store: TaskStore, task_id: str, minutes_per_day: int, today: date):
+    """Reschedule every pending task from the missed task's next day; return moves."""
+    missed = store.get(task_id)
+    start = max(missed.recommended_day, today) + timedelta(days=1)
+    tasks = [
+        t
+        for t in store.all()
+        if t.id == task_id
+        or (t.status != "completed" and t.recommended_day >= start)
+    ]
+    rank = {m: i for i, m in enumerate(store.milestones())}
+    schedule = schedule_tasks(
+        [t.duration_minutes for t in tasks],
+        [rank[t.milestone] for t in tasks],
+        minutes_per_day,
+        start=start,
+    )
+    return [
+        (t.id, t.recommended_day, day)
+        for t, day in zip(tasks, schedule.days)
+        if t.recommended_day != day
+    ]
+
+
+def over_budget_days(store: TaskStore, minutes_per_day: int) -> int:
+    """Days whose unfinished tasks add up to more than `minutes_per_day`."""
+    load: dict = {}
+    count: dict = {}
+    for t in store.all():
+        if t.status != "completed" and t.recommended_day is not None:
+            load[t.recommended_day] = load.get(t.recommended_day, 0) + t.duration_minutes
+            count[t.recommended_day] = count.get(t.recommended_day, 0) + 1
+    return sum(
+        minutes > minutes_per_day and count[day] > 1 for day, minutes in load.items()
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", default="1000,10000,50000")
+    parser.add_argument("--minutes-per-day", type=int, default=240)
+    parser.add_argument("--slack", default="0,0.1")
+    parser.add_argument("--misses", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    budget = args.minutes_per_day
+
+    print(
+        f"{'tasks':>7} {'slack':>6} {'incr ms':>9} {'incr moved':>11} "
+        f"{'full ms':>9} {'full moved':>11} {'speedup':>8} {'over':>5}"
+    )
+    failed = False
+    cases = [
+        (int(n), float(slack))
+        for n in args.tasks.split(",")
+        for slack in args.slack.split(",")
+    ]
+    for n, slack in cases:
+        rng = random.Random(args.seed)
+        store = build_store(n, round(budget * (1 - slack)), rng)
+        # Misses happen on or near "today", at the front of the plan.
+        picks = rng.sample(range(min(n, 200)), min(args.misses, n))
+
+        incr_times, incr_moved, full_times, full_moved = [], [], [], []
+        for i in picks:
+            task_id = str(i)
+            today = store.get(task_id).recommended_day
+            t0 = time.perf_counter()
+            moves = full_replan(store, task_id, budget, today)
+            full_times.append(time.perf_counter() - t0)
+            full_moved.append(len(moves))
+
+            store.update_status(task_id, "missed")
+            t0 = time.perf_counter()
+            moves = store.replan_missed(task_id, budget, today)
+            incr_times.append(time.perf_counter() - t0)
+            incr_moved.append(len(moves))
+
+        incr_ms = statistics.mean(incr_times) * 1000
+        full_ms = statistics.mean(full_times) * 1000
+        over = over_budget_days(store, budget)
+        failed |= over > 0
+        print(
+            f"{n:>7} {slack:>6.0%} {incr_ms:>9.3f} {statistics.mean(incr_moved):>11.1f} "
+            f"{full_ms:>9.2f} {statistics.mean(full_moved):>11.1f} "
+            f"{full_ms / incr_ms:>7.0f}x {over:>5}"
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Scaling of the plan scheduler over task count and horizon length.
+
+    python benchmarks/scheduler.py [--tasks 1000,10000,100000]
+                                   [--horizons 7,90,365,3650] [--repeat 5]
+
+For each task count and horizon, random durations (5-120 minutes) are
+spread over 20 milestones. The daily budget is sized so the work fills
+the horizon in days. The script reports the best scheduling time of
+--repeat runs and the days used, next to the ceil(total / budget) lower
+bound. It also checks the schedule: no day is over budget except for a
+single oversized task, and no milestone starts before the previous one's
+last day.
+"""
+import argparse
+import math
+import random
+import time
+from datetime import date, timedelta
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.services.scheduler import schedule_tasks
+
+MILESTONES = 20
+
+
+def check(schedule, milestones) -> bool:
+    budget = schedule.minutes_per_day
+    oversized_days = {schedule.days[i] for i in schedule.oversized}
+    for day, booked in enumerate(schedule.daily_minutes):
+        if booked > budget and schedule.start + timedelta(days=day) not in oversized_days:
+            return False
+    last_day = {}
+    for day, milestone in zip(schedule.days, milestones):
+        last_day[milestone] = max(day, last_day.get(milestone, day))
+    for day, milestone in zip(schedule.days, milestones):
+        if milestone > 0 and day < last_day[milestone - 1]:
+            return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", default="1000,10000,100000")
+    parser.add_argument("--horizons", default="7,90,365,3650")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    print(
+        f"{'tasks':>7} {'horizon':>7} {'min/day':>8} {'ms':>8} "
+        f"{'days':>6} {'bound':>6} {'valid':>6}"
+    )
+    for n in (int(t) for t in args.tasks.split(",")):
+        durations = [rng.randint(5, 120) for _ in range(n)]
+        milestones = sorted(rng.randrange(MILESTONES) for _ in range(n))
+        total = sum(durations)
+        for horizon in (int(h) for h in args.horizons.split(",")):
+            budget = max(math.ceil(total / horizon), 120)
+            best = float("inf")
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                schedule = schedule_tasks(
+                    durations, milestones, budget, start=date(2030, 1, 1)
+                )
+                best = min(best, time.perf_counter() - t0)
+            bound = math.ceil(total / budget)
+            valid = check(schedule, milestones)
+            print(
+                f"{n:>7} {horizon:>7} {budget:>8} {best * 1000:>8.2f} "
+                f"{len(schedule.daily_minutes):>6} {bound:>6} {str(valid):>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
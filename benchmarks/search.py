@@ -0,0 +1,106 @@
+"""
+Query latency of the in-process search index on a large task table.
+
+    python benchmarks/search.py [--tasks 1000000] [--vocabulary 5000]
+                                [--queries 200]
+
+Indexes --tasks synthetic task titles of 3-10 words, drawn from a
+Zipf-distributed vocabulary so that a few words are everywhere and most
+are rare, like real titles. It then times `SearchIndex.ranked`, which
+covers tokenizing, intersecting, scoring and sorting, for several query
+shapes. An untimed first pass builds the bitmaps of frequent terms, and
+its one-off cost is reported separately. For each shape it reports the p50/p99 latency and the mean
+number of candidates ranked, which SEARCH_MAX_CANDIDATES caps.
+
+Loading the page of hits from the database (one primary-key IN query)
+and the Postgres path (GIN index, see app/services/search.py) are not
+measured here.
+"""
+import argparse
+import itertools
+import random
+import statistics
+import time
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.services.search import SearchIndex
+
+
+def make_words(count: int, rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(letters, k=rng.randint(4, 9))) + "x")
+    return sorted(words)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--vocabulary", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    words = make_words(args.vocabulary, rng)
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(len(words)))
+    )
+    index = SearchIndex()
+
+    t0 = time.perf_counter()
+    for task_id in range(1, args.tasks + 1):
+        title = rng.choices(words, cum_weights=cum_weights, k=rng.randint(3, 10))
+        index.tasks.add(task_id, " ".join(title))
+    build = time.perf_counter() - t0
+    postings = index.tasks.postings
+    size = sum(p.buffer_info()[1] * p.itemsize for p in postings.values())
+    print(
+        f"indexed {args.tasks} titles in {build:.1f} s: {len(postings)} terms, "
+        f"{size / 2**20:.0f} MiB of postings"
+    )
+
+    common, middle, rare = words[:10], words[50:500], words[1000:]
+    shapes = {
+        "common word": lambda: [rng.choice(common)],
+        "mid word": lambda: [rng.choice(middle)],
+        "rare word": lambda: [rng.choice(rare)],
+        "common + mid": lambda: [rng.choice(common), rng.choice(middle)],
+        "two mid": lambda: rng.sample(middle, 2),
+        "three words": lambda: [rng.choice(common), *rng.sample(middle, 2)],
+        "no match": lambda: ["zzzz" + rng.choice(middle)],
+    }
+
+    queries = {
+        name: [" ".join(make()) for _ in range(args.queries)]
+        for name, make in shapes.items()
+    }
+    # Frequent terms build their membership bitmap on first use.
+    t0 = time.perf_counter()
+    for batch in queries.values():
+        for query in batch:
+            index.ranked(query)
+    bitmaps = index.tasks._bitmaps
+    print(
+        f"first pass {time.perf_counter() - t0:.1f} s, building {len(bitmaps)} "
+        f"bitmaps ({sum(len(b) for _, b in bitmaps.values()) / 2**20:.0f} MiB)"
+    )
+
+    print(f"{'query':<14} {'p50 ms':>8} {'p99 ms':>8} {'ranked':>8}")
+    for name, batch in queries.items():
+        times, ranked = [], []
+        for query in batch:
+            t0 = time.perf_counter()
+            hits = index.ranked(query)
+            times.append(time.perf_counter() - t0)
+            ranked.append(len(hits))
+        times.sort()
+        p50 = times[len(times) // 2] * 1000
+        p99 = times[min(len(times) - 1, int(len(times) * 0.99))] * 1000
+        print(f"{name:<14} {p50:>8.2f} {p99:>8.2f} {statistics.mean(ranked):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
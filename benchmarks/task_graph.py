@@ -0,0 +1,124 @@
+"""
+Incremental vs full recomputation of the task dependency graph.
+
+    python benchmarks/task_graph.py [--tasks 1000,10000,50000] [--degree 2]
+                                    [--window 200] [--changes 2000]
+
+Builds a random DAG per --tasks size. Each task depends on about
+--degree earlier tasks, drawn from the previous --window tasks, which
+gives long chains of work like a real plan. Durations are random
+(5-120 minutes). The script then applies --changes random changes in
+equal shares:
+
+- add an edge between two random tasks; some are rejected as cycles;
+- remove a random existing edge;
+- set a random task's duration.
+
+It reports the mean time per change and the mean heads/tails recomputed
+next to the graph size, and compares them with `TaskGraph.build`, the
+from-scratch cost every change would pay otherwise. At the end it
+rebuilds the graph from its final edges and checks that the order and
+every task's timing match the incremental result.
+"""
+import argparse
+import random
+import statistics
+import time
+
+import _common  # noqa: F401  # puts backend/ on sys.path
+
+from app.services.task_graph import CycleError, TaskGraph
+
+
+def random_dag(n: int, degree: int, window: int, rng: random.Random):
+    durations = {i: rng.randint(5, 120) for i in range(n)}
+    edges = set()
+    for i in range(1, n):
+        for _ in range(rng.randint(0, 2 * degree)):
+            edges.add((rng.randrange(max(0, i - window), i), i))
+    return durations, sorted(edges)
+
+
+def check(graph: TaskGraph) -> bool:
+    position = {node: i for i, node in enumerate(graph.order())}
+    if any(
+        position[before] >= position[after]
+        for before, succ in graph.successors.items()
+        for after in succ
+    ):
+        return False
+    edges = [(b, a) for b, succ in graph.successors.items() for a in succ]
+    fresh = TaskGraph.build(dict(graph.duration), edges)
+    return fresh.makespan == graph.makespan and all(
+        fresh.timing(node) == graph.timing(node) for node in graph.duration
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", default="1000,10000,50000")
+    parser.add_argument("--degree", type=int, default=2)
+    parser.add_argument("--window", type=int, default=200)
+    parser.add_argument("--changes", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(
+        f"{'tasks':>7} {'edges':>7} {'build ms':>9} {'change':>7} "
+        f"{'mean us':>9} {'touched':>8} {'speedup':>8} {'valid':>6}"
+    )
+    for n in (int(t) for t in args.tasks.split(",")):
+        rng = random.Random(args.seed)
+        durations, edges = random_dag(n, args.degree, args.window, rng)
+        t0 = time.perf_counter()
+        graph = TaskGraph.build(durations, edges)
+        build = time.perf_counter() - t0
+        edge_list = list(edges)
+
+        times = {"add": [], "remove": [], "duration": []}
+        touched = {kind: [] for kind in times}
+        cycles = 0
+        for i in range(args.changes):
+            kind = ("add", "remove", "duration")[i % 3]
+            before_touched = graph.touched
+            t0 = time.perf_counter()
+            if kind == "add":
+                before, after = rng.randrange(n), rng.randrange(n)
+                try:
+                    if graph.add_edge(before, after):
+                        edge_list.append((before, after))
+                except CycleError:
+                    cycles += 1
+            elif kind == "remove":
+                index = rng.randrange(len(edge_list))
+                edge_list[index], edge_list[-1] = edge_list[-1], edge_list[index]
+                graph.remove_edge(*edge_list.pop())
+            else:
+                graph.set_duration(rng.randrange(n), rng.randint(5, 120))
+            times[kind].append(time.perf_counter() - t0)
+            touched[kind].append(graph.touched - before_touched)
+
+        valid = check(graph)
+        for kind in times:
+            mean = statistics.mean(times[kind])
+            print(
+                f"{n:>7} {graph.edge_count:>7} {build * 1000:>9.1f} {kind:>7} "
+                f"{mean * 1e6:>9.1f} {statistics.mean(touched[kind]):>8.1f} "
+                f"{build / mean:>7.0f}x {str(valid):>6}"
+            )
+
+        t0 = time.perf_counter()
+        path = graph.critical_path()
+        critical = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        graph.order()
+        order = time.perf_counter() - t0
+        print(
+            f"{'':>7} {cycles} cycle(s) rejected; critical path {len(path)} tasks "
+            f"in {critical * 1000:.1f} ms, order in {order * 1000:.1f} ms, "
+            f"makespan {graph.makespan} min"
+        )
+
+
+if __name__ == "__main__":
+    main()
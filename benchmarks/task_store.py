@@ -0,0 +1,140 @@
+"""
+Memory and latency of the in-memory TaskStore vs the old dict of pydantic Tasks.
+
+    python benchmarks/task_store.py [--sizes 100000 1000000] [--no-legacy]
+
+Tasks are spread over a year of recommended days, 10 milestones and the
+three statuses; "today" is one of those days, so about 1/365 of tasks
+match it. Memory is everything the store keeps alive after loading.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Iterator
+
+from _common import percentiles
+
+from app.schemas.planning import Task
+from app.services.task_store import TaskStore
+
+STATUSES = ("pending", "completed", "missed")
+SAMPLES = 200
+
+
+def make_tasks(n: int) -> Iterator[Task]:
+    today = date.today()
+    for i in range(n):
+        yield Task(
+            id=str(i),
+            title=f"Task {i}",
+            milestone=f"Milestone {i % 10}",
+            duration_minutes=30,
+            recommended_day=today + timedelta(days=i % 365),
+            status=STATUSES[i % 3],
+        )
+
+
+class LegacyStore:
+    """The previous FAKE_TASKS_DB access patterns, for comparison."""
+
+    def __init__(self) -> None:
+        self.db: dict[str, Task] = {}
+
+    def put_many(self, tasks) -> None:
+        for t in tasks:
+            self.db[t.id] = t
+
+    def today(self, today):
+        return [
+            t
+            for t in self.db.values()
+            if t.recommended_day is None or t.recommended_day == today
+        ]
+
+    def summary(self):
+        counts = {"completed": 0, "missed": 0, "pending": 0}
+        for t in self.db.values():
+            counts[t.status] += 1
+        return counts
+
+    def update_status(self, task_id, status):
+        self.db[task_id] = self.db[task_id].model_copy(update={"status": status})
+
+
+class IndexedStore:
+    def __init__(self) -> None:
+        self.store = TaskStore()
+
+    def put_many(self, tasks) -> None:
+        self.store.put_many(tasks)
+
+    def today(self, today):
+        return self.store.for_days(today, None)
+
+    def summary(self):
+        return self.store.status_counts()
+
+    def update_status(self, task_id, status):
+        self.store.update_status(task_id, status)
+
+
+def timed(fn, samples: int) -> dict[str, float]:
+    durations = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    return percentiles(durations)
+
+
+def measure(store_cls, size: int) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    store = store_cls()
+    store.put_many(make_tasks(size))
+    gc.collect()
+    memory_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+
+    today = date.today()
+    rng = random.Random(0)
+    ids = [str(rng.randrange(size)) for _ in range(SAMPLES)]
+    samples = SAMPLES if size <= 100_000 else SAMPLES // 10
+
+    return {
+        "memory_mb": memory_mb,
+        "today_p50_ms": timed(lambda: store.today(today), samples)["p50_ms"],
+        "summary_p50_ms": timed(store.summary, samples)["p50_ms"],
+        "update_p50_ms": timed(
+            lambda: store.update_status(ids[rng.randrange(SAMPLES)], "completed"),
+            SAMPLES,
+        )["p50_ms"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--no-legacy", action="store_true")
+    args = parser.parse_args()
+
+    stores = [("indexed", IndexedStore)]
+    if not args.no_legacy:
+        stores.insert(0, ("legacy", LegacyStore))
+
+    header = f"{'tasks':>8} {'store':>8} {'memory MB':>10} {'today ms':>9} "
+    print(header + f"{'summary ms':>11} {'update ms':>10}")
+    for size in args.sizes:
+        for name, store_cls in stores:
+            r = measure(store_cls, size)
+            print(
+                f"{size:>8} {name:>8} {r['memory_mb']:>10.1f} {r['today_p50_ms']:>9.3f} "
+                f"{r['summary_p50_ms']:>11.4f} {r['update_p50_ms']:>10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
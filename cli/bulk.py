@@ -0,0 +1,95 @@
+"""
+Bulk planning for `taskpilot plan --from-file`.
+
+Goals are submitted concurrently from a thread pool that shares one
+pooled session (cli/client.py), so every request reuses a warm
+connection. Results are yielded as each goal finishes, not in input
+order.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, TextIO
+
+import requests
+
+from .client import get_session, post_with_retry
+
+
+def read_goals(stream: TextIO) -> List[str]:
+    """One goal per line; blank lines and `#` comments are skipped."""
+    goals = []
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            goals.append(line)
+    return goals
+
+
+def _submit(url: str, index: int, goal: str, retries: int) -> Dict[str, Any]:
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"index": index, "goal": goal}
+    try:
+        response, attempts = post_with_retry(url, {"goal": goal}, retries=retries)
+    except requests.exceptions.RequestException as e:
+        result.update(ok=False, error=str(e), attempts=retries + 1)
+    else:
+        result["attempts"] = attempts
+        result["status_code"] = response.status_code
+        if response.status_code == 200:
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            if isinstance(body, dict):
+                result.update(ok=True, goal_id=body.get("goal_id"))
+            else:
+                result.update(
+                    ok=False, error=f"Invalid JSON response: {response.text[:500]}"
+                )
+        else:
+            result.update(ok=False, error=response.text[:500])
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+@dataclass
+class BulkSummary:
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def goals_per_second(self) -> float:
+        return self.submitted / self.elapsed if self.elapsed else 0.0
+
+
+def plan_goals(
+    url: str,
+    goals: Iterable[str],
+    *,
+    concurrency: int,
+    retries: int,
+    summary: BulkSummary,
+) -> Iterator[Dict[str, Any]]:
+    """Submit `goals` with at most `concurrency` in flight; yield results as they finish."""
+    get_session(pool_size=concurrency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(_submit, url, index, goal, retries)
+            for index, goal in enumerate(goals, start=1)
+        ]
+        summary.submitted = len(futures)
+        for future in as_completed(futures):
+            result = future.result()
+            if result["ok"]:
+                summary.succeeded += 1
+            else:
+                summary.failed += 1
+            if result["attempts"] > 1:
+                summary.retried += 1
+            summary.elapsed = time.perf_counter() - start
+            yield result
@@ -0,0 +1,200 @@
+"""
+HTTP plumbing shared by the CLI commands.
+
+- One `requests.Session` per process, so repeated calls reuse keep-alive
+  connections instead of opening a new TCP connection every time.
+- A small on-disk cache of GET responses keyed by URL. When a cached
+  entry has an ETag, the request is sent with If-None-Match. A 304 is
+  then answered from disk and only a few headers cross the wire.
+
+The cache lives in $TASKPILOT_CACHE_DIR (default:
+$XDG_CACHE_HOME/taskpilot, or ~/.cache/taskpilot). It holds at most
+CACHE_MAX_ENTRIES files, and the least recently used are removed first.
+Set TASKPILOT_CACHE_DIR to an empty string to disable it.
+"""
+import hashlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_MAX_ENTRIES = 256
+POOL_SIZE = 16
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10.0
+
+_session: Optional[requests.Session] = None
+_pool_size = 0
+
+
+def _mount_pool(session: requests.Session, pool_size: int) -> None:
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+
+def get_session(pool_size: int = POOL_SIZE) -> requests.Session:
+    """
+    The shared session. Bulk commands pass their concurrency as
+    `pool_size`, so every worker keeps its own connection alive. An
+    oversubscribed pool would open and then discard a connection per
+    request.
+    """
+    global _session, _pool_size
+    if _session is None:
+        session = requests.Session()
+        _mount_pool(session, pool_size)
+        _pool_size = pool_size
+        session.headers.update(
+            {
+                "Accept": "application/json",
+                "Accept-Encoding": "gzip, deflate",
+                "User-Agent": "taskpilot-cli",
+            }
+        )
+        _session = session
+    elif pool_size > _pool_size:
+        _mount_pool(_session, pool_size)
+        _pool_size = pool_size
+    return _session
+
+
+def _default_cache_dir() -> Optional[Path]:
+    configured = os.environ.get("TASKPILOT_CACHE_DIR")
+    if configured is not None:
+        return Path(configured) if configured else None
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "taskpilot"
+
+
+@dataclass
+class CachedResponse:
+    status_code: int
+    text: str
+    etag: Optional[str] = None
+    from_cache: bool = False
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class ResponseCache:
+    def __init__(
+        self, directory: Optional[Path], max_entries: int = CACHE_MAX_ENTRIES
+    ) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, url: str) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / (hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        path = self._path(url)
+        if path is None:
+            return None
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        if entry.get("url") != url:
+            return None
+        path.touch()  # mtime doubles as "last used" for eviction
+        return entry
+
+    def store(self, url: str, etag: str, text: str) -> None:
+        path = self._path(url)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"url": url, "etag": etag, "body": text}))
+            tmp.replace(path)
+            self._evict()
+        except OSError:
+            pass  # a cache that can't be written is just a cache miss
+
+    def _evict(self) -> None:
+        entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - self.max_entries)]:
+            stale.unlink(missing_ok=True)
+
+
+response_cache = ResponseCache(_default_cache_dir())
+
+
+def cached_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 30,
+    cache: Optional[ResponseCache] = None,
+) -> CachedResponse:
+    """
+    GET `url` through the shared session, revalidating any cached copy.
+
+    Returns the fresh body on 200, the cached one (`from_cache=True`) on
+    304, and the error as-is for any other status. Raises
+    requests.RequestException if the backend can't be reached.
+    """
+    cache = cache or response_cache
+    full_url = requests.Request("GET", url, params=params).prepare().url
+    entry = cache.load(full_url)
+
+    headers = {}
+    if entry is not None:
+        headers["If-None-Match"] = entry["etag"]
+
+    response = get_session().get(full_url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and entry is not None:
+        return CachedResponse(200, entry["body"], entry["etag"], from_cache=True)
+
+    etag = response.headers.get("ETag")
+    if response.status_code == 200 and etag:
+        cache.store(full_url, etag, response.text)
+    return CachedResponse(response.status_code, response.text, etag)
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return min(float(value), BACKOFF_MAX) if value else None
+    except ValueError:
+        return None  # an HTTP date; fall back to our own backoff
+
+
+def post_with_retry(
+    url: str, payload: Any, *, retries: int = 3, timeout: float = 30
+) -> tuple[requests.Response, int]:
+    """
+    POST `payload` as JSON through the shared session, retrying on
+    429/5xx and connection failures with full-jitter exponential backoff
+    (or the server's Retry-After). Returns `(response, attempts)`; the
+    last error is re-raised once retries run out.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = get_session().post(url, json=payload, timeout=timeout)
+        except requests.exceptions.ConnectionError:
+            if attempt > retries:
+                raise
+            delay = None
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt > retries:
+                return response, attempt
+            delay = _retry_after(response)
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+        time.sleep(delay)
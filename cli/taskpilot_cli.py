@@ -1,22 +1,28 @@
+import sys
+import time
 from typing import Any, Dict, List, Optional
 
-import requests
 import typer
 
 from .config import get_full_url
-import json
 
-app = typer.Typer(help="TaskPilot CLI – plan and track your goals with AI agents.")
+# Startup cost matters: the CLI runs thousands of times a day from scripts.
+# Only typer and the stdlib pieces it already loads are imported up front;
+# `requests` (through .client) and `json` are imported inside the commands
+# that use them, so `--help` and `health` never pay for them.
+# benchmarks/cli_startup.py enforces an import-time budget.
 
-
-
-app = typer.Typer(help="TaskPilot CLI")
+app = typer.Typer(
+    help="TaskPilot CLI – plan and track your goals with AI agents.",
+    # Plain click help: rich-formatted help costs ~100 ms of imports per run.
+    rich_markup_mode=None,
+)
 
 
 @app.command()
 def plan(
-    goal: str = typer.Argument(
-        ...,
+    goal: Optional[str] = typer.Argument(
+        None,
         help="Your main goal, e.g. 'Launch my shoe brand in 3 months'",
     ),
     json_output: bool = typer.Option(
@@ -24,16 +30,42 @@ def plan(
         "--json",
         help="Print raw JSON response instead of pretty text (for automation).",
     ),
+    from_file: Optional[str] = typer.Option(
+        None,
+        "--from-file",
+        help="Plan every goal in this file (one per line; '-' reads stdin). "
+        "Prints one NDJSON result line per goal.",
+    ),
+    concurrency: int = typer.Option(
+        8, "--concurrency", min=1, max=64, help="Goals in flight at once with --from-file."
+    ),
+    retries: int = typer.Option(
+        3, "--retries", min=0, help="Retries per goal on 429/5xx or connection errors."
+    ),
 ) -> None:
     """
     Send a goal to the TaskPilot backend and get a plan (milestones + tasks).
     """
 
+    if from_file is not None:
+        if goal is not None:
+            raise typer.BadParameter("Pass either GOAL or --from-file, not both.")
+        _plan_many(from_file, concurrency, retries)
+        return
+    if goal is None:
+        raise typer.BadParameter("Missing GOAL (or use --from-file).")
+
+    import json
+
+    import requests
+
+    from .client import get_session
+
     url = get_full_url("plan")
     payload = {"goal": goal}
 
     try:
-        response = requests.post(url, json=payload, timeout=30)
+        response = get_session().post(url, json=payload, timeout=30)
     except requests.exceptions.RequestException as e:
         typer.secho(f"❌ Failed to contact backend: {e}", err=True, fg=typer.colors.RED)
         raise typer.Exit(code=1) from e
@@ -73,6 +105,43 @@ def plan(
             typer.echo(f"    - [{status:<8}] {title}")
 
 
+def _plan_many(path: str, concurrency: int, retries: int) -> None:
+    import json
+
+    from .bulk import BulkSummary, plan_goals, read_goals
+
+    try:
+        if path == "-":
+            goals = read_goals(sys.stdin)
+        else:
+            with open(path, encoding="utf-8") as f:
+                goals = read_goals(f)
+    except OSError as e:
+        typer.secho(f"❌ Could not read goals: {e}", err=True, fg=typer.colors.RED)
+        raise typer.Exit(code=1) from e
+
+    summary = BulkSummary()
+    for result in plan_goals(
+        get_full_url("plan"),
+        goals,
+        concurrency=concurrency,
+        retries=retries,
+        summary=summary,
+    ):
+        typer.echo(json.dumps(result, ensure_ascii=False))
+
+    # Summary goes to stderr so stdout stays pure NDJSON.
+    typer.secho(
+        f"Planned {summary.succeeded}/{summary.submitted} goals in "
+        f"{summary.elapsed:.2f}s ({summary.goals_per_second:.1f} goals/s, "
+        f"{summary.retried} retried, {summary.failed} failed)",
+        err=True,
+        fg=typer.colors.RED if summary.failed else typer.colors.GREEN,
+    )
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def status(
     goal_id: int = typer.Option(
@@ -85,18 +154,60 @@ def status(
         "--json",
         help="Print raw JSON response instead of pretty text (for automation).",
     ),
+    watch: bool = typer.Option(
+        False,
+        "--watch",
+        help="Keep refreshing until Ctrl-C; only changes are redrawn.",
+    ),
+    interval: float = typer.Option(
+        2.0,
+        "--interval",
+        min=0.1,
+        help="Seconds between refreshes in --watch mode.",
+    ),
 ) -> None:
     """
     Fetch current goals and tasks from the TaskPilot backend.
     """
 
-    url = get_full_url("status")
+    import json
+
     params: dict = {}
     if goal_id is not None:
         params["goal_id"] = goal_id
 
+    if watch:
+        _watch_status(params, json_output, interval)
+        return
+
+    data = _fetch_status(params).json()
+
+    # Automation mode: raw JSON
+    if json_output:
+        typer.echo(json.dumps(data, indent=2))
+        return
+
+    # 🧑🏽‍💻 Human-readable pretty output
+    lines = _status_lines(data)
+    if not lines:
+        typer.secho("ℹ️ No goals found yet.", fg=typer.colors.YELLOW)
+        return
+
+    for line in lines:
+        if line.startswith("🎯"):
+            typer.secho(line, bold=True)
+        else:
+            typer.echo(line)
+
+
+def _fetch_status(params: dict):
+    """GET /status, revalidating the on-disk copy; exits on failure."""
+    import requests
+
+    from .client import cached_get
+
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = cached_get(get_full_url("status"), params=params, timeout=30)
     except requests.exceptions.RequestException as e:
         typer.secho(f"❌ Failed to contact backend: {e}", err=True, fg=typer.colors.RED)
         raise typer.Exit(code=1) from e
@@ -109,27 +220,72 @@ def status(
         )
         raise typer.Exit(code=1)
 
-    data = response.json()
+    return response
 
-    # Automation mode: raw JSON
-    if json_output:
-        typer.echo(json.dumps(data, indent=2))
-        return
 
-    # 🧑🏽‍💻 Human-readable pretty output
-    goals = data.get("goals", [])
-    if not goals:
-        typer.secho("ℹ️ No goals found yet.", fg=typer.colors.YELLOW)
-        return
+def _status_lines(data: dict) -> List[str]:
+    lines: List[str] = []
+    for goal in data.get("goals", []):
+        lines.append(f"🎯 Goal: {goal['goal']}")
+        lines.append(f"    ID: {goal['id']}")
+        lines.append(f"    Status: {goal['status']}")
+        for task in goal.get("tasks", []):
+            lines.append(f"    - [{task['status']:<8}] {task['title']}")
+        lines.append("")
+    return lines
+
+
+def _watch_status(params: dict, json_output: bool, interval: float) -> None:
+    """
+    Poll /status with If-None-Match. Nothing is drawn while the backend
+    answers 304. On a real change, a terminal gets only the lines that
+    differ rewritten in place. Pipes get one full snapshot per change, or
+    one JSON document per line with --json.
+    """
+    import json
 
-    for goal in goals:
-        typer.secho(f"🎯 Goal: {goal['goal']}", bold=True)
-        typer.echo(f"    ID: {goal['id']}")
-        typer.echo(f"    Status: {goal['status']}")
-        tasks = goal.get("tasks", [])
-        for task in tasks:
-            typer.echo(f"    - [{task['status']:<8}] {task['title']}")
-        typer.echo()
+    tty = sys.stdout.isatty() and not json_output
+    previous: List[str] = []
+    previous_data = None
+    last_etag = None
+    if tty:
+        sys.stdout.write("\x1b[2J")  # clear the screen once
+
+    try:
+        while True:
+            response = _fetch_status(params)
+            # Same ETag as last time: unchanged, don't even parse the body.
+            if response.etag is None or response.etag != last_etag:
+                last_etag = response.etag
+                data = response.json()
+                if json_output:
+                    if data != previous_data:
+                        typer.echo(json.dumps(data, separators=(",", ":")))
+                    previous_data = data
+                else:
+                    lines = _status_lines(data) or ["ℹ️ No goals found yet."]
+                    if tty:
+                        _redraw(previous, lines)
+                    elif lines != previous:
+                        typer.echo("\n".join(lines))
+                    previous = lines
+                sys.stdout.flush()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        if tty:
+            typer.echo()
+
+
+def _redraw(previous: List[str], lines: List[str]) -> None:
+    out = []
+    for row, line in enumerate(lines, start=1):
+        if row > len(previous) or previous[row - 1] != line:
+            # Move to the row, write the line, clear what's left of the old one.
+            out.append(f"\x1b[{row};1H{line}\x1b[K")
+    if len(lines) < len(previous):
+        out.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+    out.append(f"\x1b[{len(lines) + 1};1H")
+    sys.stdout.write("".join(out))
 
 
 @app.command()
@@ -137,11 +293,26 @@ def health() -> None:
     """
     Quick health check: verify that the TaskPilot backend is reachable.
     """
-    url = get_full_url("health")
+    # http.client rather than requests: one GET doesn't need a session, and
+    # this command is meant to stay nearly as cheap to start as `--help`.
+    import http.client
+    from urllib.parse import urlsplit
+
+    url = urlsplit(get_full_url("health"))
+    connection_cls = (
+        http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+    )
 
     try:
-        response = requests.get(url, timeout=10)
-    except requests.exceptions.RequestException as e:
+        conn = connection_cls(url.netloc, timeout=10)
+        try:
+            conn.request("GET", url.path or "/")
+            response = conn.getresponse()
+            status_code = response.status
+            text = response.read().decode(errors="replace")
+        finally:
+            conn.close()
+    except (OSError, http.client.HTTPException) as e:
         typer.secho(
             f"❌ Backend health check failed: {e}",
             err=True,
@@ -149,9 +320,9 @@ def health() -> None:
         )
         raise typer.Exit(code=1) from e
 
-    if response.status_code != 200:
+    if status_code != 200:
         typer.secho(
-            f"❌ Backend unhealthy: {response.status_code} -> {response.text}",
+            f"❌ Backend unhealthy: {status_code} -> {text}",
             err=True,
             fg=typer.colors.RED,
         )